@@ -10,9 +10,8 @@ import globalVars
 import threading
 import winsound
 from gui.settingsDialogs import SettingsPanel
-from .bible_viewer import BibleTab, BibleFrame, SearchInBibleDialog, ReferenceDialog, CrossReferencesDialog, ReadingPlanPanel, HelpDialog, SearchOnPageDialog
-from .settings import Settings
-from .update_manager import UpdateManager
+from . import perf
+from .settings import Settings, PLAN_SYNC_DOWNLOADED, PLAN_SYNC_UP_TO_DATE, PLAN_SYNC_FAILED, PLAN_SYNC_NOT_FOUND
 
 addonHandler.initTranslation()
 plugin_dir = os.path.dirname(__file__)
@@ -45,6 +44,10 @@ class BibleSettingsPanel(SettingsPanel):
     def save_settings_logic(self):
         self.settings.set_setting("gemini_api_key", self.api_key_field.GetValue())
         self.settings.set_setting("auto_check_updates", self.auto_check.IsChecked())
+        self.settings.set_setting("performance_log", self.performance_log_check.IsChecked())
+        perf.set_enabled(self.performance_log_check.IsChecked())
+        self.settings.set_setting("keep_window_warm", self.keep_warm_check.IsChecked())
+        self.settings.set_setting("cache_idle_minutes", self.cache_idle_spin.GetValue())
         self.settings.save_settings()
 
     def extract_language(self, translation_name):
@@ -113,8 +116,22 @@ class BibleSettingsPanel(SettingsPanel):
         auto_check_val = self.settings.get_setting("auto_check_updates", True)
         self.auto_check.SetValue(auto_check_val)
         updates_sizer.Add(self.auto_check, 0, wx.ALL, 5)
+        self.performance_log_check = wx.CheckBox(self, label=_("Record performance timings for troubleshooting"))
+        self.performance_log_check.SetValue(self.settings.get_setting("performance_log", False))
+        updates_sizer.Add(self.performance_log_check, 0, wx.ALL, 5)
         sizer.Add(updates_sizer, 0, wx.EXPAND | wx.ALL, 5)
 
+        window_group = wx.StaticBox(self, label=_("Bible Window and Memory"))
+        window_sizer = wx.StaticBoxSizer(window_group, wx.VERTICAL)
+        self.keep_warm_check = wx.CheckBox(self, label=_("Keep the Bible window ready in the background after closing it"))
+        self.keep_warm_check.SetValue(self.settings.get_setting("keep_window_warm", False))
+        window_sizer.Add(self.keep_warm_check, 0, wx.ALL, 5)
+        cache_idle_label = wx.StaticText(self, label=_("Free loaded translations after this many idle minutes:"))
+        self.cache_idle_spin = wx.SpinCtrl(self, min=1, max=240, initial=self.settings.get_cache_idle_minutes())
+        window_sizer.Add(cache_idle_label, 0, wx.ALL, 5)
+        window_sizer.Add(self.cache_idle_spin, 0, wx.ALL, 5)
+        sizer.Add(window_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
         settingsSizer.Add(sizer, 1, wx.EXPAND)
 
         self.translations_list.Bind(wx.EVT_CHECKLISTBOX, self.on_translation_checked)
@@ -388,26 +405,44 @@ class BibleSettingsPanel(SettingsPanel):
             )
             
             def download_bulk_task():
-                success_downloaded = []
-                for i, name in enumerate(to_download):
-                    msg = _("Downloading: {name} ({current}/{total})").format(name=name, current=i+1, total=total_down)
-                    wx.CallAfter(pd_p_down.Update, i, msg)
-                    
-                    if self.settings.download_reading_plan(name):
-                        success_downloaded.append(name)
+                cancel_event = threading.Event()
+                finished = []
+
+                def on_plan_synced(name, status):
+                    finished.append(name)
+                    msg = _("Downloading: {name} ({current}/{total})").format(name=name, current=len(finished), total=total_down)
+                    wx.CallAfter(pd_p_down.Update, len(finished) - 1, msg)
+                    if status in (PLAN_SYNC_DOWNLOADED, PLAN_SYNC_UP_TO_DATE):
                         self.selected_plans[name] = False
-                    
                     if pd_p_down.WasCancelled():
-                        break
-                
+                        cancel_event.set()
+
+                results = self.settings.sync_reading_plans(
+                    to_download, progress_callback=on_plan_synced, cancel_event=cancel_event
+                )
+                success_downloaded = [name for name in to_download if results.get(name) == PLAN_SYNC_DOWNLOADED]
+                up_to_date = [name for name in to_download if results.get(name) == PLAN_SYNC_UP_TO_DATE]
+                failed = [
+                    name for name in to_download
+                    if results.get(name) in (PLAN_SYNC_FAILED, PLAN_SYNC_NOT_FOUND)
+                ]
+
                 def finalize_plans():
                     if pd_p_down:
                         pd_p_down.Destroy()
                     self.refresh_plans_list()
                     wx.GetApp().Yield()
                     self.plans_list.SetFocus()
-                    msg = self._build_plan_result_message(downloaded=success_downloaded, deleted=to_delete)
-                    wx.MessageBox(msg, _("Success"), wx.OK | wx.ICON_INFORMATION, parent=self)
+                    msg = self._build_plan_result_message(
+                        downloaded=success_downloaded,
+                        deleted=to_delete,
+                        up_to_date=up_to_date,
+                        failed=failed
+                    )
+                    if failed:
+                        wx.MessageBox(msg, _("Warning"), wx.OK | wx.ICON_WARNING, parent=self)
+                    else:
+                        wx.MessageBox(msg, _("Success"), wx.OK | wx.ICON_INFORMATION, parent=self)
                     wx.CallAfter(self.plans_list.SetFocus)
                 
                 wx.CallAfter(finalize_plans)
@@ -421,7 +456,7 @@ class BibleSettingsPanel(SettingsPanel):
             wx.MessageBox(msg, _("Success"), wx.OK | wx.ICON_INFORMATION, parent=self)
             wx.CallAfter(self.plans_list.SetFocus)
 
-    def _build_plan_result_message(self, downloaded=None, deleted=None):
+    def _build_plan_result_message(self, downloaded=None, deleted=None, up_to_date=None, failed=None):
         lines = []
 
         if deleted:
@@ -436,6 +471,20 @@ class BibleSettingsPanel(SettingsPanel):
             for name in downloaded:
                 lines.append(f"  - {name}")
 
+        if up_to_date:
+            if lines:
+                lines.append("")
+            lines.append(_("Plans already up to date: {count}").format(count=len(up_to_date)))
+            for name in up_to_date:
+                lines.append(f"  - {name}")
+
+        if failed:
+            if lines:
+                lines.append("")
+            lines.append(_("Plans that failed to download: {count}").format(count=len(failed)))
+            for name in failed:
+                lines.append(f"  - {name}")
+
         if not lines:
             return _("No changes were made.")
 
@@ -636,24 +685,59 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
     def __init__(self):
         super(GlobalPlugin, self).__init__()
-        self.update_manager = UpdateManager(self)
+        self._update_manager = None
         self.pending_update = None
         self._bible_frame = None
         self.cache_timer = wx.Timer()
         self.cache_timer.Bind(wx.EVT_TIMER, self.on_clear_cache_timer)
 
-        BibleSettingsPanel.setSettings(Settings())
         gui.settingsDialogs.NVDASettingsDialog.categoryClasses.append(BibleSettingsPanel)
-        
-        if Settings().get_setting("auto_check_updates", True) and not globalVars.appArgs.secure:
+
+        # Settings, the viewer and the network modules are loaded on first use so
+        # NVDA startup only pays for this module.
+        if not globalVars.appArgs.secure:
             threading.Thread(target=self.check_for_updates_wrapper).start()
 
+    @property
+    def update_manager(self):
+        if self._update_manager is None:
+            from .update_manager import UpdateManager
+            self._update_manager = UpdateManager(self)
+        return self._update_manager
+
     def check_for_updates_wrapper(self):
+        if not Settings().get_setting("auto_check_updates", True):
+            return
+
         def update_callback(version, download_url, release_notes):
             self.pending_update = (version, download_url, release_notes)
         self.update_manager.check_for_updates(is_start=True, callback=update_callback)
 
+    def terminate(self):
+        if self.cache_timer.IsRunning():
+            self.cache_timer.Stop()
+        if self._bible_frame:
+            try:
+                self._bible_frame.Destroy()
+            except RuntimeError:
+                pass
+            self._bible_frame = None
+        Settings().get_ai_search_cache().close()
+        if BibleSettingsPanel in gui.settingsDialogs.NVDASettingsDialog.categoryClasses:
+            gui.settingsDialogs.NVDASettingsDialog.categoryClasses.remove(BibleSettingsPanel)
+        super(GlobalPlugin, self).terminate()
+
+    def start_cache_timer(self):
+        self.cache_timer.Start(Settings().get_cache_idle_minutes() * 60000, oneShot=True)
+
     def on_clear_cache_timer(self, event):
+        # A hidden window keeps its controls; only the translation data is let go.
+        if self._bible_frame:
+            try:
+                if not self._bible_frame.IsShown():
+                    self._bible_frame.release_cached_data()
+            except RuntimeError:
+                self._bible_frame = None
         Settings().clear_bible_cache()
         if self.cache_timer.IsRunning():
             self.cache_timer.Stop()
@@ -674,6 +758,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                     self._bible_frame.Raise()
                     return
                 else:
+                    self._bible_frame.restore_from_background()
                     self._bible_frame.Show()
                     self._bible_frame.Raise()
                     return
@@ -681,13 +766,18 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 self._bible_frame = None
 
         threading.Thread(target=play_sound, args=("startup.wav",)).start()
+        from .bible_viewer import BibleFrame
         self._bible_frame = BibleFrame(None, title=_("Bible"), settings=Settings())
         self._bible_frame.Bind(wx.EVT_CLOSE, self.on_bible_frame_close)
         self._bible_frame.Show()
         self._bible_frame.Raise()
 
     def on_bible_frame_close(self, event):
-        self.cache_timer.Start(600000, oneShot=True)
+        self.start_cache_timer()
+        if self._bible_frame and event.CanVeto() and Settings().get_setting("keep_window_warm", False):
+            event.Veto()
+            self._bible_frame.hide_to_background()
+            return
         self._bible_frame = None 
         event.Skip()
 
@@ -729,4 +819,19 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         gesture="kb:NVDA+x"
     )
     def script_openBibleWindow(self, gesture):
-        self.startBibleApplication()
\ No newline at end of file
+        self.startBibleApplication()
+
+    @scriptHandler.script(
+        description=_("Save Bible performance timings to a log file")
+    )
+    def script_savePerformanceLog(self, gesture):
+        if not perf.enabled:
+            ui.message(_("Performance timings are not being recorded. Turn them on in the Bible settings."))
+            return
+        try:
+            path = Settings().dump_performance_log()
+        except Exception as e:
+            print(f"Error saving performance log: {e}")
+            ui.message(_("Could not save performance timings."))
+            return
+        ui.message(_("Performance timings saved to {path}").format(path=path))
\ No newline at end of file
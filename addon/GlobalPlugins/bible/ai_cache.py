@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+# Themes change slowly, so answers stay useful for a month.
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+MAX_ENTRIES = 200
+
+
+def normalize_query(text):
+    return " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
+
+
+def make_cache_key(query, translation, book_indexes):
+    raw = "\n".join([
+        normalize_query(query),
+        translation or "",
+        ",".join(str(index) for index in sorted(book_indexes)),
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class AiSearchCache:
+    def __init__(self, path, ttl=DEFAULT_TTL_SECONDS, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = None
+        # last_used is bumped in memory on every hit and written out with the
+        # next change or on close, so a cached answer costs no file write.
+        self.dirty = False
+
+    def load(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {})
+        except Exception as e:
+            print("[AI CACHE LOAD ERROR]", e)
+            self.entries = {}
+        if self.prune():
+            self.save()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            print("[AI CACHE SAVE ERROR]", e)
+
+    def is_expired(self, entry, now):
+        return now - entry.get("created", 0) > self.ttl
+
+    def prune(self):
+        now = time.time()
+        changed = False
+        for key in [key for key, entry in self.entries.items() if self.is_expired(entry, now)]:
+            del self.entries[key]
+            changed = True
+        if len(self.entries) > self.max_entries:
+            by_use = sorted(self.entries, key=lambda key: self.entries[key].get("last_used", 0))
+            for key in by_use[:len(self.entries) - self.max_entries]:
+                del self.entries[key]
+            changed = True
+        return changed
+
+    def get(self, query, translation, book_indexes):
+        self.load()
+        key = make_cache_key(query, translation, book_indexes)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        now = time.time()
+        if self.is_expired(entry, now):
+            del self.entries[key]
+            self.dirty = True
+            return None
+        entry["last_used"] = now
+        self.dirty = True
+        return entry
+
+    def put(self, query, translation, book_indexes, references, translation_label=""):
+        self.load()
+        now = time.time()
+        key = make_cache_key(query, translation, book_indexes)
+        self.entries[key] = {
+            "query": query,
+            "translation": translation,
+            "translation_label": translation_label or translation,
+            "book_count": len(book_indexes),
+            "references": list(references),
+            "created": now,
+            "last_used": now,
+        }
+        self.prune()
+        self.save()
+
+    def get_history(self):
+        self.load()
+        items = sorted(
+            self.entries.items(), key=lambda item: item[1].get("created", 0), reverse=True
+        )
+        return items
+
+    def remove(self, key):
+        self.load()
+        if self.entries.pop(key, None) is not None:
+            self.save()
+
+    def clear(self):
+        self.entries = {}
+        self.save()
+
+    def close(self):
+        if self.entries is not None and self.dirty:
+            self.save()
@@ -0,0 +1,253 @@
+import http.client
+import json
+import random
+import re
+import socket
+import threading
+from urllib.parse import urlsplit
+
+from . import perf
+
+DEFAULT_HOST = "generativelanguage.googleapis.com"
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_TIMEOUT = 90
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF = 1.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# A server may close a kept-alive connection while it sits idle; the next
+# request on it fails at once with one of these.
+RECONNECT_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class AiRequestCancelled(Exception):
+    pass
+
+
+class AiRequestError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class CancelHandle:
+    def __init__(self):
+        self.event = threading.Event()
+        self.connection = None
+        self.lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def cancel(self):
+        self.event.set()
+        with self.lock:
+            connection = self.connection
+        # Shutting the socket down wakes a thread blocked on the response.
+        if connection is not None and connection.sock is not None:
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def attach(self, connection):
+        with self.lock:
+            self.connection = connection
+        if self.cancelled:
+            raise AiRequestCancelled()
+
+    def detach(self):
+        with self.lock:
+            self.connection = None
+
+    def wait(self, seconds):
+        return self.event.wait(seconds)
+
+
+class AiClient:
+    def __init__(
+        self, api_key, host=DEFAULT_HOST, model=DEFAULT_MODEL, timeout=DEFAULT_TIMEOUT,
+        max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF
+    ):
+        self.api_key = api_key
+        self.host = host or DEFAULT_HOST
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.connection = None
+        # One kept-alive connection is shared, so requests take turns on it.
+        self.lock = threading.Lock()
+
+        # A host may be given as a URL, e.g. "http://127.0.0.1:8080" for a local test server.
+        parts = urlsplit(self.host if "//" in self.host else "//" + self.host)
+        self.use_https = parts.scheme != "http"
+        self.hostname = parts.hostname
+        self.port = parts.port
+
+    def get_connection(self):
+        if self.connection is None:
+            connection_class = http.client.HTTPSConnection if self.use_https else http.client.HTTPConnection
+            self.connection = connection_class(self.hostname, self.port, timeout=self.timeout)
+        return self.connection
+
+    def close(self):
+        connection = self.connection
+        self.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def get_headers(self):
+        return {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.api_key or "",
+            "Connection": "keep-alive",
+        }
+
+    def get_path(self, method):
+        return f"/v1beta/models/{self.model}:{method}"
+
+    def get_retry_delay(self, attempt):
+        return self.backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+
+    def generate_content(self, prompt, cancel=None):
+        def read_body(response):
+            return json.loads(response.read().decode("utf-8"))
+
+        return self.post("generateContent", prompt, read_body, cancel)
+
+    def stream_generate_content(self, prompt, on_text, cancel=None):
+        # Server-sent events deliver the answer in pieces as it is generated.
+        state = {"started": False}
+        chunks = []
+
+        def read_body(response):
+            for data in iter_sse_data(response):
+                if cancel is not None and cancel.cancelled:
+                    raise AiRequestCancelled()
+                text = get_response_text(json.loads(data))
+                if text:
+                    state["started"] = True
+                    chunks.append(text)
+                    on_text(text)
+            return "".join(chunks)
+
+        return self.post("streamGenerateContent?alt=sse", prompt, read_body, cancel, state)
+
+    def post(self, method, prompt, read_body, cancel=None, state=None):
+        cancel = cancel or CancelHandle()
+        payload = json.dumps({"contents": [{"parts": [{"text": prompt}]}]})
+        last_error = None
+        attempt = 0
+        reconnected = False
+
+        while True:
+            if cancel.cancelled:
+                raise AiRequestCancelled()
+            with self.lock:
+                reused = False
+                try:
+                    with perf.timed("network.ai_search"):
+                        connection = self.get_connection()
+                        reused = connection.sock is not None
+                        cancel.attach(connection)
+                        connection.request("POST", self.get_path(method), payload, self.get_headers())
+                        response = connection.getresponse()
+                        if response.status == 200:
+                            result = read_body(response)
+                            if response.will_close:
+                                self.close()
+                            return result
+                        data = response.read()
+                    if response.will_close:
+                        self.close()
+                    last_error = AiRequestError(
+                        f"HTTP {response.status}: {data[:200].decode('utf-8', 'replace')}", response.status
+                    )
+                    if response.status not in RETRY_STATUSES:
+                        raise last_error
+                except (OSError, http.client.HTTPException) as e:
+                    self.close()
+                    if cancel.cancelled:
+                        raise AiRequestCancelled()
+                    # Part of a streamed answer was already handed out; a retry would repeat it.
+                    if state and state.get("started"):
+                        raise AiRequestError(str(e))
+                    # A dropped keep-alive connection is not a server failure:
+                    # try once more on a new one without waiting or using up a retry.
+                    if reused and not reconnected and isinstance(e, RECONNECT_ERRORS):
+                        reconnected = True
+                        continue
+                    last_error = AiRequestError(str(e))
+                except AiRequestCancelled:
+                    self.close()
+                    raise
+                finally:
+                    cancel.detach()
+
+            if attempt >= self.max_retries:
+                raise last_error
+            if cancel.wait(self.get_retry_delay(attempt)):
+                raise AiRequestCancelled()
+            attempt += 1
+
+
+def iter_sse_data(response):
+    data_lines = []
+    while True:
+        line = response.readline()
+        if not line:
+            break
+        line = line.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+        elif line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+    if data_lines:
+        yield "\n".join(data_lines)
+
+
+def get_response_text(response):
+    candidates = response.get("candidates") or [{}]
+    parts = candidates[0].get("content", {}).get("parts", [])
+    return "".join(part.get("text", "") for part in parts)
+
+
+REFERENCE_LINE = re.compile(r"^\s*`?(\d+)\.(\d+)\.(\d+)`?\s*$")
+
+
+class ReferenceLineParser:
+    def __init__(self):
+        self.buffer = ""
+        self.references = []
+        self.seen = set()
+
+    def feed(self, text):
+        self.buffer += text
+        lines = self.buffer.split("\n")
+        self.buffer = lines.pop()
+        return self.parse_lines(lines)
+
+    def finish(self):
+        lines = [self.buffer]
+        self.buffer = ""
+        return self.parse_lines(lines)
+
+    def parse_lines(self, lines):
+        new_references = []
+        for line in lines:
+            match = REFERENCE_LINE.match(line)
+            if not match:
+                continue
+            ref = ".".join(str(int(part)) for part in match.groups())
+            if ref in self.seen:
+                continue
+            self.seen.add(ref)
+            new_references.append(ref)
+        self.references.extend(new_references)
+        return new_references
@@ -1,21 +1,34 @@
 import datetime
 import globalVars
 import addonHandler
-import time
 import ui
 import wx
 import os
 import webbrowser
 import languageHandler
-import http.client
 import winsound
-import json
 import re
 import gui
 import threading
 from threading import Event
 from queueHandler import queueFunction, eventQueue
+from . import perf
+from .ai_client import CancelHandle, AiRequestCancelled, ReferenceLineParser
 from .settings import Settings
+from .core import references as reference_parser
+from .core.plans import get_reading_key, get_day_status, is_day_read, build_day_index
+from .core.search import (
+    search_verses, search_folded_verses, search_whole_words, search_query, order_results,
+    match_refs_by_index, match_refs_by_text, refine_results, find_in_text, find_in_items,
+    get_folded_buffer, get_folded_data
+)
+from .core.normalize import fold_text, get_translation_language
+from .core.concordance import build_concordance, get_book_refs
+from .core.query import QueryParseError, get_query_words
+from .core.text_store import (
+    get_text_store, get_line_starts, get_line_number, get_line_at,
+    find_verse_line, get_verse_position
+)
 
 user_config_dir = globalVars.appArgs.configPath
 TRANSLATIONS_PATH = os.path.join(user_config_dir, "bibleData/translations")
@@ -24,19 +37,27 @@ plugin_dir = os.path.dirname(__file__)
 BOOK_ABBREVIATIONS_FILE = os.path.join(plugin_dir, "book_abbreviations.json")
 base_dir = os.path.dirname(os.path.dirname(plugin_dir))
 DOC_DIR = os.path.join(base_dir, "doc")
+SUGGESTION_DELAY_MS = 300
+LAST_WORD_PATTERN = re.compile(r"(\w[\w'’ʼ]*)$")
 
 addonHandler.initTranslation()
 
 class BibleTab:
     def __init__(self, settings, initial_state=None):
         self.settings = settings
-        self.bible_data = {}
+        self._bible_data = {}
         self.book_mapping = {}
         self.translation_mapping = {}
         self.cross_referenc = {}
         self.is_loaded = False
+        self.loaded_translation_name = None
         self.loading_thread = None
+        self.loading_translation_name = None
+        self.apply_state_when_loaded = False
+        self.load_generation = 0
+        self.loading_lock = threading.Lock()
         self.loading_event = threading.Event()
+        self.loading_event.set()
 
         if initial_state:
             self.state = initial_state
@@ -50,6 +71,52 @@ class BibleTab:
                 "chapter": "",
             }
     
+    # While a translation loads in the background the text is empty and the
+    # GUI never waits for it: actions that need it check is_loading, and
+    # on_loaded refreshes the window once the text is there.
+    @property
+    def bible_data(self):
+        if not self.loading_event.is_set():
+            return {}
+        return self._bible_data
+
+    @bible_data.setter
+    def bible_data(self, value):
+        # Text set directly replaces the result of a load still running.
+        with self.loading_lock:
+            self.load_generation += 1
+            self._bible_data = value
+            self.loading_event.set()
+
+    @property
+    def is_loading(self):
+        return not self.loading_event.is_set()
+
+    def start_loading(self, translation, on_loaded):
+        with self.loading_lock:
+            self.load_generation += 1
+            generation = self.load_generation
+            self.loading_translation_name = translation
+            self.loading_event.clear()
+
+        def worker():
+            bible_data = {}
+            try:
+                bible_data = self.settings.get_translation_data(translation)
+            except Exception as e:
+                print("[TAB LOAD ERROR]", e)
+            with self.loading_lock:
+                if generation != self.load_generation:
+                    return
+                self._bible_data = bible_data
+                self.loaded_translation_name = translation
+                self.is_loaded = True
+                self.loading_event.set()
+            wx.CallAfter(on_loaded, self)
+
+        self.loading_thread = threading.Thread(target=worker, daemon=True)
+        self.loading_thread.start()
+
     def save_state(self):
         return self.state.copy()
 
@@ -57,6 +124,43 @@ class BibleTab:
         self.state = state.copy()
 
 
+class VirtualListCtrl(wx.ListCtrl):
+    def __init__(self, parent, get_item_text, column_label=""):
+        super().__init__(
+            parent,
+            style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_SINGLE_SEL | wx.LC_NO_HEADER
+        )
+        self.get_item_text = get_item_text
+        self.InsertColumn(0, column_label)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+
+    def OnGetItemText(self, item, column):
+        return self.get_item_text(item)
+
+    def set_item_count(self, count, selection=0):
+        self.SetItemCount(count)
+        self.Refresh()
+        if count:
+            self.select_item(min(max(selection, 0), count - 1))
+
+    def select_item(self, index):
+        current = self.GetFirstSelected()
+        if current == index:
+            return
+        if current != -1:
+            self.Select(current, False)
+        self.Select(index)
+        self.Focus(index)
+        self.EnsureVisible(index)
+
+    def get_selected_index(self):
+        return self.GetFirstSelected()
+
+    def on_size(self, event):
+        self.SetColumnWidth(0, max(self.GetClientSize().width, 100))
+        event.Skip()
+
+
 class BibleFrame(wx.Frame):
     def __init__(self, parent, title, settings):
         display_size = wx.DisplaySize()
@@ -175,7 +279,17 @@ class BibleFrame(wx.Frame):
             ui.message(f"{_('Bible')} - {title}")
         self.UpdateMenuBar()
 
+    def is_current_tab_loading(self):
+        # Actions that need the text are skipped while it loads in the
+        # background instead of waiting on the GUI thread.
+        if self.current_tab and self.current_tab.is_loading:
+            ui.message(_("The translation is still loading, please wait."))
+            return True
+        return False
+
     def show_reading_plan_panel(self):
+        if not self.reading_plan_panel and self.is_current_tab_loading():
+            return
         if not self.reading_plan_panel:
             self.create_reading_plan_panel()
             if not self.reading_plan_panel:
@@ -199,25 +313,9 @@ class BibleFrame(wx.Frame):
         plan_data = None
         available_plans = self.settings.get_available_plans()
 
-        if not available_plans:
-            ui.message(_("No reading plans available. Please download a plan in the settings."))
-            dlg = ReadingPlanManagerDialog(
-                self,
-                _("Reading Plan Manager"),
-                self.settings,
-                bible_frame=self
-            )
-            if dlg.ShowModal() == wx.ID_OK:
-                current_plan_name = self.settings.get_current_reading_plan()
-                plan_data = self.settings.get_reading_plan_data(current_plan_name)
-            dlg.Destroy()
-            
-            if not plan_data:
-                return
-        
-        if not plan_data and current_plan_name:
+        if current_plan_name:
             plan_data = self.settings.get_reading_plan_data(current_plan_name)
-        
+
         if not plan_data:
             for plan in available_plans:
                 data = self.settings.get_reading_plan_data(plan)
@@ -242,9 +340,28 @@ class BibleFrame(wx.Frame):
             self.current_tab.translation_mapping if self.current_tab else {},
             self.settings,
             current_plan_name,
-            parent_frame=self
+            bible_frame=self
         )
 
+    def refresh_reading_plan_panel(self):
+        panel = self.reading_plan_panel
+        available_plans = self.settings.get_available_plans()
+        if panel.plan_name not in available_plans:
+            panel.Destroy()
+            self.reading_plan_panel = None
+            return
+
+        if self.current_tab:
+            panel.translation_mapping = self.current_tab.translation_mapping
+        panel.apply_font_size(self.settings.get_setting("font_size"))
+
+        current_plan_name = self.settings.get_current_reading_plan()
+        if current_plan_name != panel.plan_name and current_plan_name in available_plans:
+            panel.on_plan_selected(current_plan_name)
+        elif self.settings.get_plan_file_key(panel.plan_name) != panel.plan_key:
+            # Only a changed plan file is loaded again; the panel keeps its day otherwise.
+            panel.on_plan_selected(panel.plan_name)
+
     @property
     def current_tab(self):
         if self.tabs and 0 <= self.current_tab_index < len(self.tabs):
@@ -281,7 +398,7 @@ class BibleFrame(wx.Frame):
         else:
             self.current_tab_index = 0
 
-        self.load_current_tab_data()
+        self.load_current_tab_data(use_snapshot=True)
 
 
 
@@ -294,6 +411,87 @@ class BibleFrame(wx.Frame):
         self.settings.set_setting("tabs_states", tabs_states)
         self.settings.set_setting("current_tab_index", self.current_tab_index)
         self.settings.save_settings()
+        self.save_chapter_snapshot()
+
+    def save_chapter_snapshot(self):
+        current_tab = self.current_tab
+        # A tab that is still loading shows the saved snapshot unchanged.
+        if not current_tab or current_tab.is_loading or not current_tab.bible_data:
+            return
+        translation = current_tab.loaded_translation_name
+        book_index = current_tab.state.get("book_index", 0)
+        chapter_index = current_tab.state.get("chapter_index", 0)
+        try:
+            text_store = self.get_text_store()
+            book_key = text_store.get_book_key(book_index)
+            if book_key is None:
+                return
+            chapters = text_store.get_chapters(book_key)
+            if not 0 <= chapter_index < len(chapters):
+                return
+            text = text_store.get_chapter_text(
+                book_index, chapters[chapter_index], self.show_verse_numbers
+            )
+            if not text:
+                return
+            self.settings.save_chapter_snapshot({
+                "translation": translation,
+                "version": self.settings.get_translation_version(translation),
+                "book_index": book_index,
+                "chapter_index": chapter_index,
+                "show_verse_numbers": self.show_verse_numbers,
+                "books": text_store.books,
+                "chapters": chapters,
+                "text": text,
+            })
+        except Exception as e:
+            print("[SNAPSHOT ERROR]", e)
+
+    def get_matching_snapshot(self, tab, original_translation):
+        if self.settings.is_translation_cached(original_translation):
+            return None
+        snapshot = self.settings.load_chapter_snapshot()
+        if not snapshot:
+            return None
+        if (
+            snapshot.get("translation") != original_translation
+            or snapshot.get("version") != self.settings.get_translation_version(original_translation)
+            or snapshot.get("book_index") != tab.state.get("book_index", 0)
+            or snapshot.get("chapter_index") != tab.state.get("chapter_index", 0)
+            or snapshot.get("show_verse_numbers") != self.show_verse_numbers
+        ):
+            return None
+        return snapshot
+
+    def apply_chapter_snapshot(self, snapshot):
+        state = self.current_tab.state
+        self.Freeze()
+        try:
+            self.set_combo_items(self.translation_combo, self.load_available_translations())
+            self.translation_combo.SetStringSelection(state.get("translation", ""))
+            self.set_combo_items(self.book_combo, snapshot["books"])
+            self.book_combo.SetSelection(snapshot["book_index"])
+            self.set_combo_items(self.chapter_combo, snapshot["chapters"])
+            self.chapter_combo.SetSelection(snapshot["chapter_index"])
+            self.text_display.SetValue(snapshot["text"])
+            self.set_cursor_to_verse_number(state.get("verse_number", 1))
+            self.update_tab_titles()
+        finally:
+            self.Thaw()
+
+    def on_tab_data_loaded(self, tab):
+        if not self or tab is not self.current_tab:
+            return
+        if tab.apply_state_when_loaded:
+            tab.apply_state_when_loaded = False
+            self.apply_tab_state(tab.state)
+        self.refresh_translation_options()
+
+    def set_combo_items(self, combo, items):
+        # Refilling a combo box is slow and noisy for screen readers, so the
+        # items are only replaced when they actually change.
+        if combo.GetItems() != items:
+            combo.Set(items)
 
     def create_new_tab(self, initial_state=None):
         current_translation = None
@@ -389,7 +587,7 @@ class BibleFrame(wx.Frame):
                 }
             )
 
-    def load_current_tab_data(self):
+    def load_current_tab_data(self, use_snapshot=False):
         if not self.tabs:
             return
 
@@ -408,10 +606,21 @@ class BibleFrame(wx.Frame):
 
         already_loaded_translation = getattr(current_tab, 'loaded_translation_name', None)
 
+        if current_tab.is_loading and current_tab.loading_translation_name == original_translation:
+            # on_tab_data_loaded shows the text when the load running now finishes.
+            current_tab.apply_state_when_loaded = True
+            return
+
         if (not current_tab.is_loaded or 
             not current_tab.bible_data or 
             already_loaded_translation != original_translation):
 
+            snapshot = self.get_matching_snapshot(current_tab, original_translation) if use_snapshot else None
+            if snapshot:
+                current_tab.start_loading(original_translation, self.on_tab_data_loaded)
+                self.apply_chapter_snapshot(snapshot)
+                return
+
             current_tab.bible_data = self.settings.get_translation_data(original_translation)
             current_tab.cross_referenc = self.settings.get_cross_references(original_translation)
             current_tab.is_loaded = True
@@ -426,7 +635,7 @@ class BibleFrame(wx.Frame):
             if self.translation_combo.GetCount() == 0:
                 available_translations = self.load_available_translations()
                 if available_translations:
-                    self.translation_combo.SetItems(available_translations)
+                    self.set_combo_items(self.translation_combo, available_translations)
 
             translation = state.get("translation", "")
             if translation and translation in self.translation_combo.GetItems():
@@ -436,12 +645,10 @@ class BibleFrame(wx.Frame):
                 translation = self.translation_combo.GetValue()
 
             if self.current_tab and self.current_tab.bible_data:
-                books = list(self.current_tab.bible_data.keys())
-                self.book_combo.Set(books)
-                if hasattr(self, 'refresh_translation_options'):
-                    self.refresh_translation_options()
+                self.set_combo_items(self.book_combo, self.get_text_store().books)
+                self.refresh_translation_options()
             else:
-                self.book_combo.Set([])
+                self.set_combo_items(self.book_combo, [])
 
             book_index = state.get("book_index", 0)
             if book_index < self.book_combo.GetCount():
@@ -451,16 +658,14 @@ class BibleFrame(wx.Frame):
                 book_index = 0
 
             if self.current_tab and self.current_tab.bible_data and self.book_combo.GetCount() > 0:
-                books_keys = list(self.current_tab.bible_data.keys())
-                if 0 <= book_index < len(books_keys):
-                    selected_book_key = books_keys[book_index]
-                    chapters = list(self.current_tab.bible_data[selected_book_key].keys())
-                    chapters.sort(key=int)
-                    self.chapter_combo.Set(chapters)
+                text_store = self.get_text_store()
+                selected_book_key = text_store.get_book_key(book_index)
+                if selected_book_key is not None:
+                    self.set_combo_items(self.chapter_combo, text_store.get_chapters(selected_book_key))
                 else:
-                    self.chapter_combo.Set([])
+                    self.set_combo_items(self.chapter_combo, [])
             else:
-                self.chapter_combo.Set([])
+                self.set_combo_items(self.chapter_combo, [])
 
             chapter_index = state.get("chapter_index", 0)
             if chapter_index < self.chapter_combo.GetCount():
@@ -637,8 +842,30 @@ class BibleFrame(wx.Frame):
 
     def handle_close_event(self, event):
         self.save_tabs_states()
+        self.settings.get_ai_search_cache().close()
         self.Destroy()
 
+    def hide_to_background(self):
+        self.save_tabs_states()
+        self.settings.get_ai_search_cache().close()
+        self.Hide()
+
+    def release_cached_data(self):
+        for tab in self.tabs:
+            if tab.is_loading:
+                continue
+            tab.bible_data = {}
+            tab.cross_referenc = {}
+            tab.is_loaded = False
+        if self.reading_plan_panel:
+            self.reading_plan_panel.bible_data = {}
+
+    def restore_from_background(self):
+        current_tab = self.current_tab
+        if current_tab and not current_tab.is_loaded and not current_tab.is_loading:
+            self.load_current_tab_data(use_snapshot=True)
+            self.refresh_cross_references()
+
     def refresh_translation_comboboxes(self):
         if not self.current_tab:
             return
@@ -666,7 +893,7 @@ class BibleFrame(wx.Frame):
                 self.load_bible_data_for_translation(original_translation)
                 books = self.load_books_from_translation(original_translation)
                 if books:
-                    self.book_combo.Set(books)
+                    self.set_combo_items(self.book_combo, books)
                     self.refresh_translation_options()
 
                     if self.current_tab and self.current_tab.state.get("book_index", 0) < len(books):
@@ -743,6 +970,8 @@ class BibleFrame(wx.Frame):
 
     def on_copy(self, event):
         import subprocess
+        if self.is_current_tab_loading():
+            return
         
         start, end = self.text_display.GetSelection()
         selected_text = ""
@@ -842,80 +1071,23 @@ class BibleFrame(wx.Frame):
         else:
             return []
 
+    def get_text_store(self):
+        return get_text_store(self.current_tab.bible_data)
+
     def is_valid_reference(self, ref):
         if not self.current_tab:
             return False
-        bible_data = self.current_tab.bible_data
-        parts = ref.split(".")
-        if len(parts) < 3:
-            return False
-
-        try:
-            book_idx = int(parts[0])
-            chapter = parts[1]
-            verse_part = parts[2]
-
-            books = list(bible_data.keys())
-            if book_idx < 0 or book_idx >= len(books):
-                return False
-
-            book_key = books[book_idx]
-            if chapter not in bible_data.get(book_key, {}):
-                return False
-
-            chapter_data = bible_data[book_key][chapter]
-
-            if "-" in verse_part:
-                verse_start, verse_end = map(int, verse_part.split("-"))
-                return str(verse_start) in chapter_data
-            else:
-                return verse_part in chapter_data
-
-        except:
-            return False
+        return self.get_text_store().is_valid_reference(ref)
 
     def get_formatted_verse_text(self, ref, include_verse_number=False):
         if not self.current_tab:
             return ""
-        bible_data = self.current_tab.bible_data
-        parts = ref.split(".")
-        if len(parts) < 3:
-            return ""
-
         try:
-            book_idx = int(parts[0])
-            chapter = parts[1]
-            verse_part = parts[2]
-
-            books = list(bible_data.keys())
-            if book_idx < 0 or book_idx >= len(books):
-                return ""
-
-            book_key = books[book_idx]
-            if chapter not in bible_data[book_key]:
-                return ""
-
-            chapter_data = bible_data[book_key][chapter]
-
-            is_range = "-" in verse_part
-
-            if is_range:
-                verse_start, verse_end = map(int, verse_part.split("-"))
-                verses = []
-                for verse_num in range(verse_start, verse_end + 1):
-                    verse_str = str(verse_num)
-                    if verse_str in chapter_data:
-                        verses.append(f"{verse_str}. {chapter_data[verse_str]}")
-                return "\n".join(verses)
-            else:
-                verse_str = verse_part
-                if verse_str in chapter_data:
-                    if include_verse_number:
-                        return f"{verse_str}. {chapter_data[verse_str]}"
-                    else:
-                        return chapter_data[verse_str]
-                return ""
-
+            # Ranges are always shown with verse numbers so the verses stay apart.
+            is_range = "-" in ref.rsplit(".", 1)[-1]
+            return self.get_text_store().get_verse_text(
+                ref, include_verse_number=include_verse_number or is_range
+            )
         except Exception as e:
             print(f"Error in get_formatted_verse_text: {e}")
             return ""
@@ -923,27 +1095,16 @@ class BibleFrame(wx.Frame):
     def get_full_chapter_text(self, book_idx, chapter):
         if not self.current_tab:
             return ""
-        bible_data = self.current_tab.bible_data
-        books = list(bible_data.keys())
-        if book_idx < 0 or book_idx >= len(books):
-            return ""
-        book_key = books[book_idx]
-        if chapter not in bible_data[book_key]:
-            return ""
-        chapter_data = bible_data[book_key][chapter]
-        verses = [f"{verse}. {text}" for verse, text in chapter_data.items()]
-        return "\n".join(verses)
+        return self.get_text_store().get_chapter_text(book_idx, chapter)
 
     def refresh_chapter_combobox(self):
-        if not self.current_tab:
+        if not self.current_tab or self.current_tab.is_loading:
             return
-        bible_data = self.current_tab.bible_data
         selected_book_index = self.book_combo.GetSelection()
         if selected_book_index != wx.NOT_FOUND:
-            selected_book_key = list(bible_data.keys())[selected_book_index]
-            chapters = list(bible_data[selected_book_key].keys())
-            chapters.sort(key=int)
-            self.chapter_combo.Set(chapters)
+            text_store = self.get_text_store()
+            selected_book_key = text_store.get_book_key(selected_book_index)
+            self.set_combo_items(self.chapter_combo, text_store.get_chapters(selected_book_key))
             if (
                 self.current_tab
                 and self.current_tab.state.get("chapter_index", 0)
@@ -969,29 +1130,25 @@ class BibleFrame(wx.Frame):
         state = _("shown") if self.show_verse_numbers else _("hidden")
         ui.message(_("Verse numbers {state}").format(state=state))
 
+    @perf.timed("chapter_render")
     def display_chapter_text(self):
-        if not self.current_tab:
+        # While the text loads, the restored snapshot stays on screen.
+        if not self.current_tab or self.current_tab.is_loading:
             return
-        bible_data = self.current_tab.bible_data
         selected_book_index = self.book_combo.GetSelection()
         selected_chapter_index = self.chapter_combo.GetSelection()
         if (
             selected_book_index != wx.NOT_FOUND
             and selected_chapter_index != wx.NOT_FOUND
         ):
-            selected_book_key = list(bible_data.keys())[selected_book_index]
-            chapters = sorted(bible_data[selected_book_key].keys(), key=int)
+            text_store = self.get_text_store()
+            selected_book_key = text_store.get_book_key(selected_book_index)
+            chapters = text_store.get_chapters(selected_book_key)
             selected_chapter = chapters[selected_chapter_index]
-            chapter_data = bible_data.get(selected_book_key, {}).get(
-                selected_chapter, {}
+            full_text = text_store.get_chapter_text(
+                selected_book_index, selected_chapter, self.show_verse_numbers
             )
-            if chapter_data:
-                if self.show_verse_numbers:
-                    verses = [f"{verse}. {text}" for verse, text in chapter_data.items()]
-                else:
-                    verses = [text for verse, text in chapter_data.items()]
-                    
-                full_text = "\n".join(verses)
+            if full_text:
                 self.text_display.SetValue(full_text)
                 
                 verse_number = (
@@ -1041,7 +1198,7 @@ class BibleFrame(wx.Frame):
                 if book_count >= 27:
                     translations.append(display_name)
 
-        self.translation_combo.Set(translations)
+        self.set_combo_items(self.translation_combo, translations)
 
         if current_translation in translations:
             self.translation_combo.SetValue(current_translation)
@@ -1052,7 +1209,7 @@ class BibleFrame(wx.Frame):
                 self.translation_combo.Clear()
 
     def load_books_from_translation(self, translation):
-        if not self.current_tab:
+        if not self.current_tab or self.current_tab.is_loading:
             return []
 
         database_data = getattr(self.current_tab, 'bible_data', None)
@@ -1098,6 +1255,8 @@ class BibleFrame(wx.Frame):
                 self.current_tab.cross_referenc = refs
 
     def navigate_to_verse_link(self, book_index, chapter, verse, open_in_main=True):
+        if self.is_current_tab_loading():
+            return
         if open_in_main:
             if self.current_tab:
                 self.current_tab.state.update(
@@ -1176,7 +1335,7 @@ class BibleFrame(wx.Frame):
             self.update_tab_titles()
 
     def navigate_to_previous_chapter(self):
-        if not self.current_tab:
+        if not self.current_tab or self.is_current_tab_loading():
             return
         selected_book_index = self.book_combo.GetSelection()
         selected_chapter_index = self.chapter_combo.GetSelection()
@@ -1221,7 +1380,7 @@ class BibleFrame(wx.Frame):
         ui.message(f"{current_book_name}, {current_chapter}")
 
     def navigate_to_next_chapter(self):
-        if not self.current_tab:
+        if not self.current_tab or self.is_current_tab_loading():
             return
         selected_book_index = self.book_combo.GetSelection()
         selected_chapter_index = self.chapter_combo.GetSelection()
@@ -1323,26 +1482,8 @@ class BibleFrame(wx.Frame):
 
     def get_current_verse(self):
         current_pos = self.text_display.GetInsertionPoint()
-        text_value = self.text_display.GetValue()
-
-        lines = text_value.split('\n')
-        adjusted_line_starts = []
-        char_count = 0
-    
-        for i, line in enumerate(lines):
-            line_length = len(line) + 1
-            if i == len(lines) - 1 and not text_value.endswith('\n'):
-                line_length = len(line)
-            adjusted_start = char_count
-            adjusted_line_starts.append(adjusted_start)
-            char_count += line_length
-
-        for i, adjusted_start in enumerate(adjusted_line_starts):
-            next_adjusted_start = adjusted_line_starts[i + 1] if i + 1 < len(adjusted_line_starts) else float('inf')
-            if current_pos >= adjusted_start and current_pos < next_adjusted_start:
-                return i + 1
-
-        return 1
+        line_starts = get_line_starts(self.text_display.GetValue())
+        return get_line_number(line_starts, current_pos)
 
     def set_cursor_to_verse_number(self, verse_number=None, verse_offset=0):
         if verse_number is None:
@@ -1351,29 +1492,9 @@ class BibleFrame(wx.Frame):
         verse_number += verse_offset
         verse_number = max(1, verse_number)
 
-        text_value = self.text_display.GetValue()
-        lines = text_value.split('\n')
-        char_count = 0
-        verse_count = 0
-
-        for i, line in enumerate(lines):
-            line_length = len(line) + 1
-            if i == len(lines) - 1 and not text_value.endswith('\n'):
-                line_length = len(line)
-            adjusted_start = char_count
-            if line.strip():
-                verse_count += 1
-                if verse_count == verse_number:
-                    self.text_display.SetInsertionPoint(adjusted_start)
-                    self.text_display.ShowPosition(adjusted_start)
-                    return
-
-            char_count += line_length
-
-        if lines:
-            last_line_start = adjusted_start if 'adjusted_start' in locals() else 0
-            self.text_display.SetInsertionPoint(last_line_start)
-            self.text_display.ShowPosition(last_line_start)
+        position = get_verse_position(self.text_display.GetValue(), verse_number)
+        self.text_display.SetInsertionPoint(position)
+        self.text_display.ShowPosition(position)
 
     def focus_and_speak_verse(self, verse_number=None, verse_offset=0):
         if verse_number is None:
@@ -1384,19 +1505,12 @@ class BibleFrame(wx.Frame):
 
         self.set_cursor_to_verse_number(verse_number)
 
-        text_value = self.text_display.GetValue()
-        lines = text_value.split('\n')
-        verse_count = 0
-        verse_line = None
-
-        for line in lines:
-            if line.strip():
-                verse_count += 1
-                if verse_count == verse_number:
-                    verse_line = line.strip()
-                    break
+        _line_index, _line_start, verse_line = find_verse_line(
+            self.text_display.GetValue(), verse_number
+        )
 
         if verse_line:
+            verse_line = verse_line.strip()
             if self.show_verse_numbers:
                 clean_text = re.sub(r'^\d+\.\s*', '', verse_line)
                 ui.message(f"{verse_number}. {clean_text}")
@@ -1438,7 +1552,7 @@ class BibleFrame(wx.Frame):
             webbrowser.open(help_file_path)
 
     def display_find_dialog(self):
-        if not self.current_tab:
+        if not self.current_tab or self.is_current_tab_loading():
             return
         self.find_dialog = SearchInBibleDialog(
             self,
@@ -1451,7 +1565,7 @@ class BibleFrame(wx.Frame):
         self.find_dialog.Show()
 
     def display_reference_dialog(self, open_in_new_tab=False):
-        if not self.current_tab:
+        if not self.current_tab or self.is_current_tab_loading():
             return
 
         current_translation = self.translation_combo.GetValue()
@@ -1489,40 +1603,16 @@ class BibleFrame(wx.Frame):
                 self.on_settings()
             return
 
+        if self.reading_plan_panel:
+            self.refresh_reading_plan_panel()
 
-        current_plan_name = self.settings.get_current_reading_plan()
-        plan_data = None
-
-        if current_plan_name:
-            plan_data = self.settings.get_reading_plan_data(current_plan_name)
-
-        if not plan_data:
-            for plan in available_plans:
-                data = self.settings.get_reading_plan_data(plan)
-                if data:
-                    current_plan_name = plan
-                    plan_data = data
-                    self.settings.set_current_reading_plan(current_plan_name)
-                    break
-
-        if not plan_data:
-            self.on_settings()
-            return
-
-        total_days = len(plan_data["days"])
-        current_day = self.settings.get_last_unread_day(current_plan_name, total_days)
-
-        self.reading_plan_panel = ReadingPlanPanel(
-            self.panel_container,
-            plan_data,
-            current_day,
-            self.current_tab.bible_data if self.current_tab else {},
-            self.settings.get_setting("font_size"),
-            self.current_tab.translation_mapping if self.current_tab else {},
-            self.settings,
-            current_plan_name,
-            bible_frame=self
-        )
+        if not self.reading_plan_panel:
+            if self.is_current_tab_loading():
+                return
+            self.create_reading_plan_panel()
+            if not self.reading_plan_panel:
+                self.on_settings()
+                return
 
         self.show_reading_plan_panel()
 
@@ -1738,6 +1828,17 @@ class SearchInBibleDialog(wx.Dialog):
         self.settings = parent.settings
         self.search_history = self.settings.get_setting("search_history")
         self.translation_mapping = translation_mapping
+        self.results = []
+        self.result_query = None
+        self.pending_ai_search = None
+        self.ai_references = []
+        self.ai_cancel = None
+        self.progress_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_progress_timer, self.progress_timer)
+        self.suggestion_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_suggestion_timer, self.suggestion_timer)
+        self.suggestion_word = ""
+        self.suggestions = []
         panel = wx.Panel(self)
         panel.SetBackgroundColour(wx.SystemSettings.GetColour(wx.SYS_COLOUR_WINDOW))
 
@@ -1750,10 +1851,18 @@ class SearchInBibleDialog(wx.Dialog):
         search_label = wx.StaticText(panel, label=_("Text for search:"))
         self.text_ctrl = wx.ComboBox(panel, style=wx.TE_PROCESS_ENTER | wx.CB_DROPDOWN)
         self.text_ctrl.Bind(wx.EVT_TEXT_ENTER, self.handle_find_button)
+        self.text_ctrl.Bind(wx.EVT_TEXT, self.on_search_text_changed)
         self.text_ctrl.Append(self.search_history)
         search_grid.Add(search_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
         search_grid.Add(self.text_ctrl, 1, wx.EXPAND | wx.ALL, 5)
 
+        suggestions_label = wx.StaticText(panel, label=_("Suggestions:"))
+        self.suggestions_list = wx.ListBox(panel, style=wx.LB_SINGLE)
+        self.suggestions_list.SetMinSize((-1, 80))
+        self.suggestions_list.Bind(wx.EVT_LISTBOX_DCLICK, self.accept_suggestion)
+        search_grid.Add(suggestions_label, 0, wx.ALIGN_TOP | wx.ALL, 5)
+        search_grid.Add(self.suggestions_list, 1, wx.EXPAND | wx.ALL, 5)
+
         category_label = wx.StaticText(panel, label=_("Category for search:"))
         self.category_combo = wx.ComboBox(
             panel, choices=[_("All books"), _("None")], style=wx.CB_READONLY
@@ -1794,11 +1903,36 @@ class SearchInBibleDialog(wx.Dialog):
         )
         options_grid.Add(self.case_sensitive_checkbox, 0, wx.ALL, 5)
 
+        self.ignore_accents_checkbox = wx.CheckBox(panel, label=_("Ignore accents"))
+        self.ignore_accents_checkbox.SetValue(self.settings.get_setting("ignore_accents", False))
+        self.ignore_accents_checkbox.Bind(wx.EVT_CHECKBOX, self.handle_search_option_change)
+        options_grid.Add(self.ignore_accents_checkbox, 0, wx.ALL, 5)
+
+        self.word_forms_checkbox = wx.CheckBox(panel, label=_("Match word forms"))
+        self.word_forms_checkbox.SetValue(self.settings.get_setting("word_forms", False))
+        self.word_forms_checkbox.Bind(wx.EVT_CHECKBOX, self.handle_search_option_change)
+        options_grid.Add(self.word_forms_checkbox, 0, wx.ALL, 5)
+
         self.regex_checkbox = wx.CheckBox(panel, label=_("Regular expressions"))
         self.regex_checkbox.SetValue(self.settings.get_setting("use_regex"))
         self.regex_checkbox.Bind(wx.EVT_CHECKBOX, self.handle_search_option_change)
         options_grid.Add(self.regex_checkbox, 0, wx.ALL, 5)
 
+        self.query_language_checkbox = wx.CheckBox(panel, label=_("Query language (AND, OR, NOT)"))
+        self.query_language_checkbox.SetValue(self.settings.get_setting("query_language", False))
+        self.query_language_checkbox.Bind(wx.EVT_CHECKBOX, self.handle_search_option_change)
+        options_grid.Add(self.query_language_checkbox, 0, wx.ALL, 5)
+
+        self.relevance_checkbox = wx.CheckBox(panel, label=_("Sort by relevance"))
+        self.relevance_checkbox.SetValue(self.settings.get_setting("sort_by_relevance", False))
+        self.relevance_checkbox.Bind(wx.EVT_CHECKBOX, self.handle_search_option_change)
+        options_grid.Add(self.relevance_checkbox, 0, wx.ALL, 5)
+
+        self.theme_search_checkbox = wx.CheckBox(panel, label=_("Theme search (offline)"))
+        self.theme_search_checkbox.SetValue(self.settings.get_setting("theme_search", False))
+        self.theme_search_checkbox.Bind(wx.EVT_CHECKBOX, self.handle_search_option_change)
+        options_grid.Add(self.theme_search_checkbox, 0, wx.ALL, 5)
+
         gemini_api_key = self.settings.get_setting("gemini_api_key")
         if gemini_api_key:
             self.ai_search_checkbox = wx.CheckBox(panel, label=_("AI Search"))
@@ -1810,24 +1944,40 @@ class SearchInBibleDialog(wx.Dialog):
 
         options_sizer.Add(options_grid, 0, wx.EXPAND | wx.ALL, 5)
 
+        buttons_sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.find_button = wx.Button(panel, label=_("Search"))
         self.find_button.Bind(wx.EVT_BUTTON, self.handle_find_button)
-        options_sizer.Add(self.find_button, 0, wx.ALL | wx.ALIGN_CENTER, 10)
+        buttons_sizer.Add(self.find_button, 0, wx.ALL, 5)
+        self.within_results_button = wx.Button(panel, label=_("Search within results"))
+        self.within_results_button.Bind(wx.EVT_BUTTON, lambda event: self.refine_search(exclude=False))
+        buttons_sizer.Add(self.within_results_button, 0, wx.ALL, 5)
+        self.exclude_results_button = wx.Button(panel, label=_("Exclude from results"))
+        self.exclude_results_button.Bind(wx.EVT_BUTTON, lambda event: self.refine_search(exclude=True))
+        buttons_sizer.Add(self.exclude_results_button, 0, wx.ALL, 5)
+        self.concordance_button = wx.Button(panel, label=_("Concordance"))
+        self.concordance_button.Bind(wx.EVT_BUTTON, self.on_concordance)
+        buttons_sizer.Add(self.concordance_button, 0, wx.ALL, 5)
+        if gemini_api_key:
+            self.ai_history_button = wx.Button(panel, label=_("AI search history"))
+            self.ai_history_button.Bind(wx.EVT_BUTTON, self.on_ai_history)
+            buttons_sizer.Add(self.ai_history_button, 0, wx.ALL, 5)
+        options_sizer.Add(buttons_sizer, 0, wx.ALL | wx.ALIGN_CENTER, 5)
 
         results_sizer = wx.BoxSizer(wx.VERTICAL)
 
-        results_label = wx.StaticText(panel, label=_("Search results"))
-        results_sizer.Add(results_label, 0, wx.ALL, 5)
-        self.results_ctrl = wx.TextCtrl(
-            panel, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_WORDWRAP | wx.TE_RICH2
+        self.results_label = wx.StaticText(panel, label=_("Search results"))
+        results_sizer.Add(self.results_label, 0, wx.ALL, 5)
+        self.results_list = VirtualListCtrl(
+            panel, self.get_result_text, _("Search results")
         )
-        self.results_ctrl.Bind(wx.EVT_KEY_DOWN, self.handle_results_key_press)
+        self.results_list.Bind(wx.EVT_KEY_DOWN, self.handle_results_key_press)
+        self.results_list.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_result_activated)
 
-        self.results_ctrl.Bind(wx.EVT_CONTEXT_MENU, self.on_search_result_context_menu)
+        self.results_list.Bind(wx.EVT_CONTEXT_MENU, self.on_search_result_context_menu)
 
-        self.results_ctrl.SetName(_("Search results content"))
+        self.results_list.SetName(_("Search results content"))
 
-        results_sizer.Add(self.results_ctrl, 1, wx.EXPAND | wx.ALL, 5)
+        results_sizer.Add(self.results_list, 1, wx.EXPAND | wx.ALL, 5)
 
         main_sizer.Add(search_section, 0, wx.EXPAND | wx.ALL, 5)
         main_sizer.Add(options_sizer, 0, wx.EXPAND | wx.ALL, 5)
@@ -1836,22 +1986,34 @@ class SearchInBibleDialog(wx.Dialog):
         panel.SetSizer(main_sizer)
 
         self.text_ctrl.MoveAfterInTabOrder(self.find_button)
-        self.category_combo.MoveAfterInTabOrder(self.text_ctrl)
+        self.suggestions_list.MoveAfterInTabOrder(self.text_ctrl)
+        self.category_combo.MoveAfterInTabOrder(self.suggestions_list)
         self.book_list.MoveAfterInTabOrder(self.category_combo)
 
         self.whole_word_checkbox.MoveAfterInTabOrder(self.book_list)
         self.case_sensitive_checkbox.MoveAfterInTabOrder(self.whole_word_checkbox)
-        self.regex_checkbox.MoveAfterInTabOrder(self.case_sensitive_checkbox)
+        self.ignore_accents_checkbox.MoveAfterInTabOrder(self.case_sensitive_checkbox)
+        self.word_forms_checkbox.MoveAfterInTabOrder(self.ignore_accents_checkbox)
+        self.regex_checkbox.MoveAfterInTabOrder(self.word_forms_checkbox)
+        self.query_language_checkbox.MoveAfterInTabOrder(self.regex_checkbox)
+        self.relevance_checkbox.MoveAfterInTabOrder(self.query_language_checkbox)
+        self.theme_search_checkbox.MoveAfterInTabOrder(self.relevance_checkbox)
 
         if gemini_api_key:
-            self.ai_search_checkbox.MoveAfterInTabOrder(self.regex_checkbox)
+            self.ai_search_checkbox.MoveAfterInTabOrder(self.theme_search_checkbox)
             self.find_button.MoveAfterInTabOrder(self.ai_search_checkbox)
         else:
-            self.find_button.MoveAfterInTabOrder(self.regex_checkbox)
-
-        self.results_ctrl.MoveAfterInTabOrder(self.find_button)
+            self.find_button.MoveAfterInTabOrder(self.theme_search_checkbox)
+        self.within_results_button.MoveAfterInTabOrder(self.find_button)
+        self.exclude_results_button.MoveAfterInTabOrder(self.within_results_button)
+        self.concordance_button.MoveAfterInTabOrder(self.exclude_results_button)
+        if gemini_api_key:
+            self.ai_history_button.MoveAfterInTabOrder(self.concordance_button)
+            self.results_list.MoveAfterInTabOrder(self.ai_history_button)
+        else:
+            self.results_list.MoveAfterInTabOrder(self.concordance_button)
 
-        self.text_ctrl.MoveAfterInTabOrder(self.results_ctrl)
+        self.text_ctrl.MoveAfterInTabOrder(self.results_list)
 
         self.Bind(wx.EVT_CLOSE, self.handle_dialog_close)
         self.text_ctrl.Bind(wx.EVT_SET_FOCUS, self.on_focus)
@@ -1865,10 +2027,32 @@ class SearchInBibleDialog(wx.Dialog):
         self.category_combo.SetValue(self.settings.get_setting("category_selection"))
         self.handle_category_selection(None)
         self.Bind(wx.EVT_CHAR_HOOK, self.on_key_down)
-        self.search_on_page_dialog = SearchOnPageDialog(self, self.results_ctrl)
+        self.search_on_page_dialog = SearchOnPageDialog(self, self.results_list)
+        self.prefetch_search_index()
+
+    def get_result_text(self, index):
+        book_name, chapter, verse_number = self.results[index]
+        verse_text = self.bible_data.get(book_name, {}).get(chapter, {}).get(verse_number, "")
+        return f"{book_name} {chapter}:{verse_number} - {verse_text}"
+
+    def show_results(self, results):
+        self.results = results
+        self.results_list.set_item_count(len(results))
+        if results:
+            self.results_label.SetLabel(
+                f"{_('Search results')} ({_('Number of verses found')}: {len(results)})"
+            )
+            ui.message(f"{_('Number of verses found')}: {len(results)}")
+            self.results_list.SetFocus()
+        else:
+            self.results_label.SetLabel(_("Search results"))
+            ui.message(_("No results found."))
+
+    def on_result_activated(self, event):
+        self.open_verse(open_mode="new_tab" if wx.GetKeyState(wx.WXK_CONTROL) else "current_tab")
 
     def on_search_result_context_menu(self, event):
-        book_index, chapter, verse_number = self.parse_verse_info_from_cursor()
+        book_index, chapter, verse_number = self.get_selected_verse_info()
         if book_index is not None:
             self.current_book_index = book_index
             self.current_chapter = chapter
@@ -1966,7 +2150,7 @@ class SearchInBibleDialog(wx.Dialog):
             )
 
     def open_verse(self, open_mode):
-        book_index, chapter, verse_number = self.parse_verse_info_from_cursor()
+        book_index, chapter, verse_number = self.get_selected_verse_info()
         if book_index is None:
             ui.message(_("The cursor is not on a verse."))
             return
@@ -1984,78 +2168,203 @@ class SearchInBibleDialog(wx.Dialog):
             self.parent.create_new_tab()
             self.parent.navigate_to_verse_link(book_index, chapter, verse_number, open_in_main=True)
 
-    def parse_verse_info_from_cursor(self):
-        current_pos = self.results_ctrl.GetInsertionPoint()
-        text_to_cursor = self.results_ctrl.GetRange(0, current_pos)
-        lines = text_to_cursor.split("\n")
-        current_line = lines[-1]
-        text_after_cursor = self.results_ctrl.GetRange(current_pos, self.results_ctrl.GetLastPosition())
-        full_line = current_line + text_after_cursor.split("\n")[0]
+    def get_selected_verse_info(self):
+        index = self.results_list.get_selected_index()
+        if index < 0 or index >= len(self.results):
+            return None, None, None
+        book_name, chapter, verse_number = self.results[index]
+        book_index = self.get_book_index_by_name(book_name)
+        if book_index is None:
+            return None, None, None
+        return book_index, chapter, verse_number
 
-        match = re.match(r"^([\w\' ]+ [^:]+):(\d+(?:-\d+)?) - .*", full_line)
-        if match:
-            book_chapter, verse_range = match.groups()
-            book, chapter = book_chapter.rsplit(" ", 1)
-            verse_number = verse_range.split("-")[0]
-            book_index = self.get_book_index_by_name(book)
-            return book_index, chapter, verse_number
-        return None, None, None
+    def add_ai_results(self, references, cancel):
+        if not self or cancel is not self.ai_cancel:
+            return
+        results = self.resolve_ai_references(references)
+        if not results:
+            return
+        is_first = not self.results
+        selection = max(self.results_list.get_selected_index(), 0)
+        self.results.extend(results)
+        self.results_list.set_item_count(len(self.results), selection)
+        self.results_label.SetLabel(
+            f"{_('Search results')} ({_('Number of verses found')}: {len(self.results)})"
+        )
+        if is_first:
+            self.results_list.SetFocus()
+            ui.message(self.get_result_text(0))
 
-    def handle_response(self, response):
-        if not self.IsShown():
+    def finish_ai_search(self, references, failed, cancel):
+        if not self or cancel is not self.ai_cancel:
             return
+        self.add_ai_results(references, cancel)
+        self.ai_cancel = None
+        self.search_performed = False
+        self.stop_progress_sound()
 
-        if hasattr(self, "response_handled") and self.response_handled:
+        if failed and not self.results:
+            ui.message(_("AI search failed. Check your internet connection and API key."))
+            return
+        if not self.results:
+            self.show_results([])
             return
 
-        self.response_handled = True
+        ui.message(f"{_('Number of verses found')}: {len(self.results)}")
+        if not failed and self.pending_ai_search:
+            search_text, translation, book_indexes = self.pending_ai_search
+            self.settings.get_ai_search_cache().put(
+                search_text, translation, book_indexes, self.ai_references,
+                self.parent.translation_combo.GetValue()
+            )
 
+    def get_translation_name(self):
+        current_translation = self.parent.translation_combo.GetValue()
+        return self.translation_mapping.get(current_translation, current_translation)
+
+    def prefetch_search_index(self):
+        if not (
+            self.settings.get_setting("theme_search", False)
+            or self.settings.get_setting("query_language", False)
+            or self.settings.get_setting("sort_by_relevance", False)
+            or self.settings.get_setting("word_forms", False)
+            or self.settings.get_setting("whole_word")
+            or self.settings.get_setting("ignore_accents", False)
+        ):
+            return
+        threading.Thread(
+            target=self.settings.get_search_index, args=(self.get_translation_name(),), daemon=True
+        ).start()
+
+    def with_search_index(self, on_ready, prepare=None):
+        # Loading or building the index can take seconds, so it is never done
+        # on the GUI thread: on_ready gets the index (None if there is none)
+        # from wx.CallAfter once a worker has it. prepare(index), e.g. folding
+        # the text for an accent-insensitive search, runs on the worker too.
+        translation = self.get_translation_name()
+        is_ready = self.settings.is_search_index_ready(translation)
+        if is_ready and prepare is None:
+            on_ready(self.settings.get_search_index(translation))
+            return
+        if not is_ready:
+            ui.message(_("Preparing the search index, please wait..."))
+
+        def worker():
+            index = self.settings.get_search_index(translation)
+            if prepare is not None:
+                try:
+                    prepare(index)
+                except Exception as e:
+                    print("[SEARCH PREPARE ERROR]", e)
+            wx.CallAfter(self.on_search_index_loaded, on_ready, index)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def on_search_index_loaded(self, on_ready, index):
+        # The dialog may have been closed while the index was loading.
+        if self:
+            on_ready(index)
+
+    def with_query_index(self, on_ready):
+        ignore_accents = self.settings.get_setting("ignore_accents", False)
+        word_forms = self.settings.get_setting("word_forms", False)
+        self.with_search_index(
+            lambda index: on_ready(None if index is None else index.get_view(ignore_accents, word_forms))
+        )
+
+    def check_search_text(self, search_text):
+        if not self.settings.get_setting("use_regex") or self.settings.get_setting("query_language", False):
+            return True
+        # Folding accents would change what the pattern means, e.g. [àá] or \xe0.
+        if self.settings.get_setting("ignore_accents", False):
+            ui.message(_("Ignoring accents is not supported with regular expressions."))
+            return False
         try:
-            result_text = response.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
+            re.compile(search_text)
+        except re.error:
+            ui.message(_("Invalid regular expression!"))
+            return False
+        return True
+
+    def prepare_folded_text(self, case_sensitive):
+        bible_data = self.bible_data
+        language = get_translation_language(self.get_translation_name())
+        return lambda index: get_folded_buffer(bible_data, language, case_sensitive, index)
 
-            if not result_text.strip():
-                wx.CallAfter(self.results_ctrl.SetValue, _("No results found."))
-                wx.CallAfter(self.results_ctrl.SetFocus)
-                self.search_performed = False
-                self.response_handled = False
+    def uses_word_index(self):
+        use_regex = self.settings.get_setting("use_regex")
+        return self.settings.get_setting("query_language", False) or (
+            (self.settings.get_setting("whole_word") or self.settings.get_setting("word_forms", False))
+            and not use_regex
+        )
+
+    def perform_theme_search(self, search_text, selected_books):
+        def search(index):
+            if index is None:
+                ui.message(_("The search index is not available for this translation."))
                 return
+            with perf.timed("theme_search"):
+                verse_ids = index.theme_search(search_text, selected_books)
+            self.show_results(index.get_refs(verse_ids))
 
-            references = [line.strip() for line in result_text.split("\n") if line.strip()]
-
-            if references:
-                formatted_results = []
-                for ref in references:
-                    parts = ref.split(".")
-                    if len(parts) == 3:
-                        book_index, chapter, verse = parts
-                        book_name = self.parent.book_combo.GetString(int(book_index))
-                        verse_text = self.parent.get_formatted_verse_text(
-                            f"{book_index}.{chapter}.{verse}",
-                            include_verse_number=False
-                        )
-                        formatted_results.append(f"{book_name} {chapter}:{verse} - {verse_text}")
+        self.with_query_index(search)
 
-                result_text = f"{_('Number of verses found')}: {len(references)}\n\n" + "\n".join(formatted_results)
-                wx.CallAfter(self.results_ctrl.SetValue, result_text)
-                wx.CallAfter(self.results_ctrl.SetFocus)
-            else:
-                wx.CallAfter(self.results_ctrl.SetValue, _("No results found."))
-                wx.CallAfter(self.results_ctrl.SetFocus)
+    def perform_query_search(self, search_text, selected_books, case_sensitive):
+        def search(index):
+            if index is None:
+                ui.message(_("The search index is not available for this translation."))
+                return
+            with perf.timed("query_search"):
+                try:
+                    found_verses = search_query(
+                        index, self.bible_data, selected_books, search_text, case_sensitive,
+                        self.settings.get_setting("ignore_accents", False),
+                        self.settings.get_setting("word_forms", False)
+                    )
+                except QueryParseError:
+                    ui.message(_("Invalid search query."))
+                    return
+            self.show_text_results(found_verses, search_text)
 
-        except Exception as e:
-            wx.CallAfter(self.results_ctrl.SetValue, f"Error processing AI response: {e}")
-            wx.CallAfter(self.results_ctrl.SetFocus)
+        self.with_search_index(search)
 
-        self.search_performed = False
-        self.response_handled = False
+    def show_text_results(self, results, search_text):
+        self.result_query = search_text
+        if self.settings.get_setting("sort_by_relevance", False) and len(results) > 1:
+            self.with_query_index(lambda index: self.show_results(self.order_results(index, results, True)))
+            return
+        self.show_results(results)
+
+    def order_results(self, index, results, by_relevance):
+        if index is None:
+            return results
+        with perf.timed("order_results"):
+            return order_results(index, results, self.result_query, by_relevance)
+
+    def resolve_ai_references(self, references):
+        results = []
+        for ref in references:
+            book_index, chapter, verse = ref.split(".")
+            if not book_index.isdigit() or int(book_index) >= len(self.books_list):
+                continue
+            results.append((self.books_list[int(book_index)], chapter, verse))
+        return results
 
     def perform_ai_search(self, search_text, selected_books):
         if hasattr(self, "search_performed") and self.search_performed:
             return
 
+        current_translation = self.parent.translation_combo.GetValue()
+        translation = self.get_translation_name()
+        book_indexes = list(self.book_list.GetSelections())
+        cached = self.settings.get_ai_search_cache().get(search_text, translation, book_indexes)
+        if cached:
+            self.show_results(self.resolve_ai_references(cached["references"]))
+            return
+
+        self.pending_ai_search = (search_text, translation, book_indexes)
         self.search_performed = True
         ui.message(_("Searching, please wait..."))
-        current_translation = self.parent.translation_combo.GetValue()
         books_list = ", ".join(selected_books)
 
         prompt = f"""
@@ -2077,72 +2386,152 @@ class SearchInBibleDialog(wx.Dialog):
         45.13.3
         """
 
+        self.results = []
+        self.results_list.set_item_count(0)
+        self.results_label.SetLabel(_("Search results"))
+        self.ai_references = []
+        self.ai_cancel = CancelHandle()
+        self.start_progress_sound()
         thread = threading.Thread(
-            target=self.generate_text_with_sound, args=(prompt, self.handle_response)
+            target=self.run_ai_request, args=(prompt, self.ai_cancel), daemon=True
         )
         thread.start()
 
-    def generate_text_with_sound(self, prompt, callback):
-        self.sound_event = threading.Event()
-
-        def sound_indicator():
-            while not self.sound_event.is_set() and self.IsShown():
-                wx.CallAfter(winsound.Beep, 400, 100)
-                time.sleep(1)
+    def run_ai_request(self, prompt, cancel):
+        # References are shown as soon as each line of the answer arrives.
+        parser = ReferenceLineParser()
 
-        sound_thread = threading.Thread(target=sound_indicator)
-        sound_thread.start()
+        def on_text(text):
+            references = parser.feed(text)
+            if references and not cancel.cancelled:
+                wx.CallAfter(self.add_ai_results, references, cancel)
 
+        failed = False
+        try:
+            self.settings.get_ai_client().stream_generate_content(prompt, on_text, cancel)
+        except AiRequestCancelled:
+            return
+        except Exception as e:
+            print(f"AI search error: {e}")
+            failed = True
+        references = parser.finish()
+        self.ai_references = parser.references
+        if not cancel.cancelled:
+            wx.CallAfter(self.finish_ai_search, references, failed, cancel)
+
+    def start_progress_sound(self):
         wx.CallAfter(winsound.Beep, 800, 200)
+        self.progress_timer.Start(1000)
 
-        try:
-            API_KEY = self.settings.get_setting("gemini_api_key")
-            conn = http.client.HTTPSConnection(
-                "generativelanguage.googleapis.com", timeout=90
-            )
-            headers = {"Content-Type": "application/json", "x-goog-api-key": API_KEY}
-            payload = json.dumps({"contents": [{"parts": [{"text": prompt}]}]})
-
-            conn.request(
-                "POST",
-                "/v1beta/models/gemini-2.5-flash:generateContent",
-                payload,
-                headers,
-            )
-            res = conn.getresponse()
-            data = res.read()
-            response = json.loads(data.decode("utf-8"))
-            wx.CallAfter(callback, response)
+    def stop_progress_sound(self):
+        if self.progress_timer.IsRunning():
+            self.progress_timer.Stop()
 
-        except Exception as e:
-            wx.CallAfter(callback, None)
+    def on_progress_timer(self, event):
+        winsound.Beep(400, 100)
 
-        finally:
-            self.sound_event.set()
-            sound_thread.join()
-            conn.close()
+    def cancel_ai_search(self):
+        if self.ai_cancel is not None:
+            self.ai_cancel.cancel()
+            self.ai_cancel = None
+        self.stop_progress_sound()
+        self.search_performed = False
+
+    def on_ai_history(self, event):
+        dialog = AiSearchHistoryDialog(self, self.settings.get_ai_search_cache())
+        if dialog.ShowModal() == wx.ID_OK and dialog.selected_entry:
+            entry = dialog.selected_entry
+            self.current_search_text = entry["query"]
+            self.text_ctrl.SetValue(entry["query"])
+            self.result_query = None
+            dialog.Destroy()
+            self.show_results(self.resolve_ai_references(entry["references"]))
+            return
+        dialog.Destroy()
 
     def apply_font_size(self, font_size):
         font = self.GetFont()
         font.SetPointSize(font_size)
         self.SetFont(font)
         self.text_ctrl.SetFont(font)
+        self.suggestions_list.SetFont(font)
         self.book_list.SetFont(font)
         self.whole_word_checkbox.SetFont(font)
         self.case_sensitive_checkbox.SetFont(font)
+        self.ignore_accents_checkbox.SetFont(font)
+        self.word_forms_checkbox.SetFont(font)
         self.regex_checkbox.SetFont(font)
+        self.query_language_checkbox.SetFont(font)
+        self.relevance_checkbox.SetFont(font)
+        self.theme_search_checkbox.SetFont(font)
 
         if hasattr(self, "ai_search_checkbox"):
             self.ai_search_checkbox.SetFont(font)
 
         self.find_button.SetFont(font)
-        self.results_ctrl.SetFont(font)
+        self.within_results_button.SetFont(font)
+        self.exclude_results_button.SetFont(font)
+        self.concordance_button.SetFont(font)
+        self.results_list.SetFont(font)
         self.category_combo.SetFont(font)
 
     def on_focus(self, event):
         self.text_ctrl.SetValue(self.current_search_text)
         event.Skip()
 
+    def on_search_text_changed(self, event):
+        # Suggestions wait until typing pauses, so each keystroke stays cheap.
+        self.suggestion_timer.Start(SUGGESTION_DELAY_MS, wx.TIMER_ONE_SHOT)
+        event.Skip()
+
+    def on_suggestion_timer(self, event):
+        self.update_suggestions()
+
+    def update_suggestions(self):
+        match = LAST_WORD_PATTERN.search(self.text_ctrl.GetValue())
+        self.suggestion_word = match.group(1) if match else ""
+        if len(self.suggestion_word) < 2:
+            self.suggestions_list.Clear()
+            return
+        translation = self.get_translation_name()
+        if not self.settings.is_search_index_ready(translation):
+            # No waiting while typing: the index loads in the background and
+            # the suggestions are filled in when it is ready.
+            def worker():
+                self.settings.get_search_index(translation)
+                wx.CallAfter(self.on_suggestion_index_loaded)
+
+            threading.Thread(target=worker, daemon=True).start()
+            return
+        index = self.settings.get_search_index(translation)
+        if index is None:
+            return
+        with perf.timed("suggestions"):
+            suggestions = index.suggest(self.suggestion_word)
+        self.suggestions_list.Set([
+            _("{word} ({count})").format(word=word, count=count) for word, count in suggestions
+        ])
+        self.suggestions = [word for word, count in suggestions]
+
+    def on_suggestion_index_loaded(self):
+        # A translation whose index could not be built gets no suggestions.
+        if self and self.settings.is_search_index_ready(self.get_translation_name()):
+            self.update_suggestions()
+
+    def accept_suggestion(self, event=None):
+        selection = self.suggestions_list.GetSelection()
+        if selection == wx.NOT_FOUND or selection >= len(self.suggestions):
+            return
+        text = self.text_ctrl.GetValue()
+        if self.suggestion_word and text.endswith(self.suggestion_word):
+            text = text[:-len(self.suggestion_word)]
+        self.current_search_text = text + self.suggestions[selection]
+        self.text_ctrl.SetValue(self.current_search_text)
+        self.suggestion_timer.Stop()
+        self.suggestions_list.Clear()
+        self.text_ctrl.SetFocus()
+        self.text_ctrl.SetInsertionPointEnd()
+
     def on_kill_focus(self, event):
         self.current_search_text = self.text_ctrl.GetValue()
         event.Skip()
@@ -2172,49 +2561,154 @@ class SearchInBibleDialog(wx.Dialog):
         case_sensitive = self.settings.get_setting("case_sensitive")
         use_regex = self.settings.get_setting("use_regex")
         ai_search = self.settings.get_setting("ai_search")
-    
-        if use_regex:
-            try:
-                re.compile(search_text)
-            except re.error:
-                ui.message(_("Invalid regular expression!"))
-                return
+        theme_search = self.settings.get_setting("theme_search", False)
+        query_language = self.settings.get_setting("query_language", False)
+        ignore_accents = self.settings.get_setting("ignore_accents", False)
+        word_forms = self.settings.get_setting("word_forms", False)
+
+        if not self.check_search_text(search_text):
+            return
 
+        self.result_query = None
         if ai_search:
             self.perform_ai_search(search_text, selected_books)
+        elif theme_search:
+            self.perform_theme_search(search_text, selected_books)
+        elif query_language:
+            self.perform_query_search(search_text, selected_books, case_sensitive)
         else:
-            found_verses = []
-            for book_name in selected_books:
-                chapters = self.bible_data[book_name]
-                for chapter_key, verses in chapters.items():
-                    for verse_num, verse in verses.items():
-                        verse_text = verse.lower() if not case_sensitive else verse
-                        search_text_check = (
-                            search_text.lower() if not case_sensitive else search_text
+            # Whole-word searches, including phrases and NEAR/n or PRE/n, use the word index.
+            # Word forms are whole words too. Text without any word, e.g. "!!!",
+            # has nothing to look up there and is scanned for as before.
+            use_word_index = (whole_word or word_forms) and not use_regex and get_query_words(search_text)
+
+            def search(index):
+                with perf.timed("search"):
+                    if use_word_index and index is not None:
+                        try:
+                            found_verses = search_whole_words(
+                                index, self.bible_data, selected_books, search_text, case_sensitive,
+                                ignore_accents, word_forms
+                            )
+                        except QueryParseError:
+                            ui.message(_("Invalid search query."))
+                            return
+                    elif ignore_accents:
+                        language = get_translation_language(self.get_translation_name())
+                        found_verses = search_folded_verses(
+                            self.bible_data, selected_books, search_text, language,
+                            whole_word=whole_word, case_sensitive=case_sensitive, index=index
                         )
-                        if use_regex:
-                            if re.search(search_text_check, verse_text):
-                                found_verses.append(
-                                    f"{book_name} {chapter_key}:{verse_num} - {verse}"
-                                )
-                        else:
-                            if (
-                                whole_word and search_text_check in verse_text.split()
-                            ) or (not whole_word and search_text_check in verse_text):
-                                found_verses.append(
-                                    f"{book_name} {chapter_key}:{verse_num} - {verse}"
-                                )
-
-            if found_verses:
-                result = (
-                    f"{_('Number of verses found')}: {len(found_verses)}\n\n"
-                    + "\n".join(found_verses)
-                    + "\n"
-                )
-                self.results_ctrl.SetValue(result)
-                self.results_ctrl.SetFocus()
+                    else:
+                        found_verses = search_verses(
+                            self.bible_data, selected_books, search_text,
+                            whole_word=whole_word, case_sensitive=case_sensitive, use_regex=use_regex
+                        )
+                self.show_text_results(found_verses, search_text)
+
+            if use_word_index:
+                self.with_search_index(search)
+            elif ignore_accents:
+                # The folded text comes with the index; folding it here would stall NVDA.
+                self.with_search_index(search, self.prepare_folded_text(case_sensitive))
             else:
+                search(None)
+
+    def refine_search(self, exclude=False):
+        # Only the verses in the current results are checked, not the whole Bible.
+        search_text = self.text_ctrl.GetValue().strip()
+        if not search_text:
+            ui.message(_("Please enter text to search."))
+            return
+        if not self.results:
+            ui.message(_("There are no results to refine."))
+            return
+        if self.ai_cancel is not None:
+            self.cancel_ai_search()
+
+        if not self.check_search_text(search_text):
+            return
+
+        def refine(index):
+            with perf.timed("refine_search"):
+                try:
+                    matching = self.get_matching_refs(index, search_text, self.results)
+                except QueryParseError:
+                    ui.message(_("Invalid search query."))
+                    return
+                if matching is None:
+                    return
+                results = refine_results(self.results, matching, exclude)
+
+            if not results:
                 ui.message(_("No results found."))
+                return
+            if not exclude and self.result_query:
+                self.result_query = f"{self.result_query} {search_text}"
+            self.show_results(results)
+
+        if self.uses_word_index():
+            self.with_search_index(refine)
+        elif self.settings.get_setting("ignore_accents", False):
+            self.with_search_index(refine, self.prepare_folded_text(self.settings.get_setting("case_sensitive")))
+        else:
+            refine(None)
+
+    def on_concordance(self, event):
+        search_text = self.text_ctrl.GetValue().strip()
+        if not search_text:
+            ui.message(_("Please enter text to search."))
+            return
+
+        def show_concordance(index):
+            if index is None:
+                ui.message(_("The search index is not available for this translation."))
+                return
+            with perf.timed("concordance"):
+                try:
+                    concordance = build_concordance(index, search_text)
+                except QueryParseError:
+                    ui.message(_("Invalid search query."))
+                    return
+            if not concordance["verses"]:
+                ui.message(_("No results found."))
+                return
+
+            dialog = ConcordanceDialog(self, search_text, concordance, index)
+            if dialog.ShowModal() == wx.ID_OK and dialog.selected_refs:
+                self.result_query = search_text
+                self.show_results(dialog.selected_refs)
+                self.results_list.select_item(dialog.selected_position)
+            dialog.Destroy()
+
+        self.with_query_index(show_concordance)
+
+    def get_matching_refs(self, index, search_text, refs):
+        whole_word = self.settings.get_setting("whole_word")
+        case_sensitive = self.settings.get_setting("case_sensitive")
+        use_regex = self.settings.get_setting("use_regex")
+        query_language = self.settings.get_setting("query_language", False)
+        ignore_accents = self.settings.get_setting("ignore_accents", False)
+        word_forms = self.settings.get_setting("word_forms", False)
+
+        if self.uses_word_index():
+            if index is not None and (query_language or get_query_words(search_text)):
+                return match_refs_by_index(
+                    index, self.bible_data, refs, search_text, case_sensitive,
+                    ignore_accents, word_forms, query_language
+                )
+            if query_language:
+                ui.message(_("The search index is not available for this translation."))
+                return None
+
+        if ignore_accents and not use_regex:
+            language = get_translation_language(self.get_translation_name())
+            folded_data = get_folded_data(self.bible_data, language, case_sensitive, index)
+            return match_refs_by_text(
+                folded_data, refs, fold_text(search_text, language, keep_case=case_sensitive),
+                whole_word=whole_word, case_sensitive=True
+            )
+        return match_refs_by_text(self.bible_data, refs, search_text, whole_word, case_sensitive, use_regex)
 
     def handle_category_selection(self, event):
         selected_category = self.category_combo.GetValue()
@@ -2248,16 +2742,62 @@ class SearchInBibleDialog(wx.Dialog):
         checkbox = event.GetEventObject()
         if checkbox == self.whole_word_checkbox:
             self.settings.set_setting("whole_word", checkbox.GetValue())
+            self.prefetch_search_index()
         elif checkbox == self.case_sensitive_checkbox:
             self.settings.set_setting("case_sensitive", checkbox.GetValue())
+        elif checkbox == self.ignore_accents_checkbox:
+            self.settings.set_setting("ignore_accents", checkbox.GetValue())
+        elif checkbox == self.word_forms_checkbox:
+            self.settings.set_setting("word_forms", checkbox.GetValue())
+            self.prefetch_search_index()
         elif checkbox == self.regex_checkbox:
             self.settings.set_setting("use_regex", checkbox.GetValue())
+            if checkbox.GetValue():
+                self.query_language_checkbox.SetValue(False)
+                self.settings.set_setting("query_language", False)
+        elif checkbox == self.query_language_checkbox:
+            self.settings.set_setting("query_language", checkbox.GetValue())
+            if checkbox.GetValue():
+                self.regex_checkbox.SetValue(False)
+                self.settings.set_setting("use_regex", False)
+            self.prefetch_search_index()
+        elif checkbox == self.relevance_checkbox:
+            self.settings.set_setting("sort_by_relevance", checkbox.GetValue())
+            self.prefetch_search_index()
+            self.reorder_results(checkbox.GetValue())
+        elif checkbox == self.theme_search_checkbox:
+            self.settings.set_setting("theme_search", checkbox.GetValue())
+            if checkbox.GetValue() and hasattr(self, "ai_search_checkbox"):
+                self.ai_search_checkbox.SetValue(False)
+                self.settings.set_setting("ai_search", False)
+            self.prefetch_search_index()
         elif (
             hasattr(self, "ai_search_checkbox") and checkbox == self.ai_search_checkbox
         ):
             self.settings.set_setting("ai_search", checkbox.GetValue())
+            if checkbox.GetValue():
+                self.theme_search_checkbox.SetValue(False)
+                self.settings.set_setting("theme_search", False)
+
+    def reorder_results(self, by_relevance):
+        # Only text search results have a canonical and a relevance order;
+        # theme and AI results keep the order they were found in.
+        if not self.result_query or len(self.results) < 2:
+            return
+
+        def reorder(index):
+            self.results = self.order_results(index, self.results, by_relevance)
+            self.results_list.set_item_count(len(self.results))
+            if by_relevance:
+                ui.message(_("Results sorted by relevance."))
+            else:
+                ui.message(_("Results sorted in Bible order."))
+
+        self.with_query_index(reorder)
 
     def handle_dialog_close(self, event):
+        self.suggestion_timer.Stop()
+        self.cancel_ai_search()
         self.Destroy()
 
     def on_key_down(self, event):
@@ -2269,6 +2809,14 @@ class SearchInBibleDialog(wx.Dialog):
             help_dialog.Destroy()
             return
 
+        if key_code in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER) and self.FindFocus() == self.results_list:
+            self.open_verse(open_mode="new_tab" if event.ControlDown() else "current_tab")
+            return
+
+        if key_code in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER) and self.FindFocus() == self.suggestions_list:
+            self.accept_suggestion()
+            return
+
         if key_code == wx.WXK_ESCAPE:
             self.Close()
         else:
@@ -2337,6 +2885,197 @@ class SearchInBibleDialog(wx.Dialog):
         self.category_combo.Set(categories)
 
 
+class AiSearchHistoryDialog(wx.Dialog):
+    def __init__(self, parent, cache):
+        super().__init__(
+            parent, title=_("AI search history"), size=(600, 400),
+            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER
+        )
+        self.Centre()
+        self.cache = cache
+        self.entries = []
+        self.selected_entry = None
+
+        panel = wx.Panel(self)
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.history_list = wx.ListBox(panel, style=wx.LB_SINGLE)
+        self.history_list.Bind(wx.EVT_LISTBOX_DCLICK, self.on_show)
+        main_sizer.Add(self.history_list, 1, wx.EXPAND | wx.ALL, 5)
+
+        buttons_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.show_button = wx.Button(panel, label=_("Show results"))
+        self.delete_button = wx.Button(panel, label=_("Delete"))
+        self.clear_button = wx.Button(panel, label=_("Clear history"))
+        close_button = wx.Button(panel, wx.ID_CANCEL, _("Close"))
+        self.show_button.Bind(wx.EVT_BUTTON, self.on_show)
+        self.delete_button.Bind(wx.EVT_BUTTON, self.on_delete)
+        self.clear_button.Bind(wx.EVT_BUTTON, self.on_clear)
+        for button in (self.show_button, self.delete_button, self.clear_button, close_button):
+            buttons_sizer.Add(button, 0, wx.ALL, 5)
+        main_sizer.Add(buttons_sizer, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+
+        panel.SetSizer(main_sizer)
+        self.Bind(wx.EVT_CHAR_HOOK, self.on_key_press)
+        self.refresh_history()
+        self.history_list.SetFocus()
+
+    def refresh_history(self, selection=0):
+        self.entries = self.cache.get_history()
+        items = []
+        for _key, entry in self.entries:
+            date = datetime.datetime.fromtimestamp(entry.get("created", 0)).strftime("%Y-%m-%d")
+            items.append(
+                f"{entry.get('query', '')} - {entry.get('translation_label', '')}, "
+                f"{_('Number of verses found')}: {len(entry.get('references', []))}, {date}"
+            )
+        if not items:
+            items = [_("No saved AI searches.")]
+        self.history_list.Set(items)
+        self.history_list.SetSelection(min(selection, len(items) - 1))
+        has_entries = bool(self.entries)
+        self.show_button.Enable(has_entries)
+        self.delete_button.Enable(has_entries)
+        self.clear_button.Enable(has_entries)
+
+    def get_selected(self):
+        index = self.history_list.GetSelection()
+        if self.entries and 0 <= index < len(self.entries):
+            return index, self.entries[index]
+        return None, None
+
+    def on_show(self, event):
+        _index, item = self.get_selected()
+        if item:
+            self.selected_entry = item[1]
+            self.EndModal(wx.ID_OK)
+
+    def on_delete(self, event):
+        index, item = self.get_selected()
+        if item:
+            self.cache.remove(item[0])
+            self.refresh_history(index)
+            ui.message(_("Deleted"))
+
+    def on_clear(self, event):
+        dlg = wx.MessageDialog(
+            self, _("Delete all saved AI searches?"), _("Confirm"), wx.YES_NO | wx.ICON_QUESTION
+        )
+        result = dlg.ShowModal()
+        dlg.Destroy()
+        if result == wx.ID_YES:
+            self.cache.clear()
+            self.refresh_history()
+
+    def on_key_press(self, event):
+        key_code = event.GetKeyCode()
+        if key_code in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER) and self.FindFocus() == self.history_list:
+            self.on_show(event)
+        elif key_code == wx.WXK_DELETE and self.FindFocus() == self.history_list:
+            self.on_delete(event)
+        elif key_code == wx.WXK_ESCAPE:
+            self.EndModal(wx.ID_CANCEL)
+        else:
+            event.Skip()
+
+
+class ConcordanceDialog(wx.Dialog):
+    def __init__(self, parent, search_text, concordance, index):
+        super().__init__(
+            parent, title=_("Concordance: {text}").format(text=search_text), size=(700, 500),
+            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER
+        )
+        self.Centre()
+        self.concordance = concordance
+        self.index = index
+        self.selected_refs = None
+        self.selected_position = 0
+
+        panel = wx.Panel(self)
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        summary_label = wx.StaticText(panel, label=_("Summary"))
+        self.summary_ctrl = wx.TextCtrl(panel, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_RICH2)
+        self.summary_ctrl.SetValue(self.get_summary(search_text))
+        main_sizer.Add(summary_label, 0, wx.ALL, 5)
+        main_sizer.Add(self.summary_ctrl, 1, wx.EXPAND | wx.ALL, 5)
+
+        books_label = wx.StaticText(panel, label=_("Occurrences by book"))
+        self.books_list = wx.ListBox(panel, style=wx.LB_SINGLE)
+        self.books_list.Set(
+            [self.format_count(_("All books"), concordance["verses"], concordance["occurrences"])]
+            + [
+                self.format_count(book_name, verses, occurrences)
+                for _book_index, book_name, verses, occurrences in concordance["books"]
+            ]
+        )
+        self.books_list.SetSelection(0)
+        self.books_list.Bind(wx.EVT_LISTBOX_DCLICK, self.on_show_hits)
+        main_sizer.Add(books_label, 0, wx.ALL, 5)
+        main_sizer.Add(self.books_list, 2, wx.EXPAND | wx.ALL, 5)
+
+        buttons_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        show_button = wx.Button(panel, label=_("Show hits"))
+        first_button = wx.Button(panel, label=_("First occurrence"))
+        last_button = wx.Button(panel, label=_("Last occurrence"))
+        close_button = wx.Button(panel, wx.ID_CANCEL, _("Close"))
+        show_button.Bind(wx.EVT_BUTTON, self.on_show_hits)
+        first_button.Bind(wx.EVT_BUTTON, lambda event: self.show_all_hits(0))
+        last_button.Bind(wx.EVT_BUTTON, lambda event: self.show_all_hits(concordance["verses"] - 1))
+        for button in (show_button, first_button, last_button, close_button):
+            buttons_sizer.Add(button, 0, wx.ALL, 5)
+        main_sizer.Add(buttons_sizer, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+
+        panel.SetSizer(main_sizer)
+        self.Bind(wx.EVT_CHAR_HOOK, self.on_key_press)
+        self.books_list.SetFocus()
+
+    def format_count(self, name, verses, occurrences):
+        return _("{name}: {occurrences} occurrences in {verses} verses").format(
+            name=name, occurrences=occurrences, verses=verses
+        )
+
+    def format_ref(self, ref):
+        book_name, chapter, verse_number = ref
+        return f"{book_name} {chapter}:{verse_number}"
+
+    def get_summary(self, search_text):
+        concordance = self.concordance
+        lines = [
+            self.format_count(search_text, concordance["verses"], concordance["occurrences"]),
+            _("Books: {count}").format(count=len(concordance["books"])),
+        ]
+        if concordance["old_testament"] is not None:
+            lines.append(self.format_count(_("Old Testament"), *concordance["old_testament"]))
+            lines.append(self.format_count(_("New Testament"), *concordance["new_testament"]))
+        lines.append(_("First occurrence: {ref}").format(ref=self.format_ref(concordance["first"])))
+        lines.append(_("Last occurrence: {ref}").format(ref=self.format_ref(concordance["last"])))
+        return "\n".join(lines)
+
+    def on_show_hits(self, event):
+        selection = self.books_list.GetSelection()
+        if selection <= 0:
+            self.show_all_hits(0)
+            return
+        book_index = self.concordance["books"][selection - 1][0]
+        self.selected_refs = get_book_refs(self.index, self.concordance, book_index)
+        self.EndModal(wx.ID_OK)
+
+    def show_all_hits(self, position):
+        self.selected_refs = get_book_refs(self.index, self.concordance)
+        self.selected_position = max(position, 0)
+        self.EndModal(wx.ID_OK)
+
+    def on_key_press(self, event):
+        key_code = event.GetKeyCode()
+        if key_code in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER) and self.FindFocus() == self.books_list:
+            self.on_show_hits(event)
+        elif key_code == wx.WXK_ESCAPE:
+            self.EndModal(wx.ID_CANCEL)
+        else:
+            event.Skip()
+
+
 class CrossReferencesDialog(wx.Dialog):
     def __init__(self, parent, title, current_ref, references, bible_frame, settings):
         display_size = wx.DisplaySize()
@@ -2398,17 +3137,11 @@ class CrossReferencesDialog(wx.Dialog):
             pass
         return ref
 
+    @perf.timed("cross_references_render")
     def load_cross_references(self):
         header = f"{_('Number of cross references found')}: {len(self.references)}\n\n"
 
-        sorted_refs = sorted(
-            self.references,
-            key=lambda ref: (
-                int(ref.split(".")[0]),
-                int(ref.split(".")[1]),
-                int(ref.split(".")[2].split("-")[0])
-            )
-        )
+        sorted_refs = sorted(self.references, key=reference_parser.reference_sort_key)
 
         references_text = []
         for ref in sorted_refs:
@@ -2709,59 +3442,35 @@ class ReferenceDialog(wx.Dialog):
         self.EndModal(wx.ID_CANCEL)
 
     def parse_verse_reference(self, verse_reference):
-        pattern = re.compile(r"^(\w+)\.?\s*(\d+)(?:[,:]\s*(\d+)(?:-(\d+))?)?$")
-        match = pattern.match(verse_reference)
-        if match:
-            book_abbr, chapter, verse_start, verse_end = match.groups()
-            book_abbr = book_abbr.lower()
-            if book_abbr not in self.book_abbreviations:
-                ui.message(_("No book matches the abbreviation {book_abbr}.").format(book_abbr=book_abbr))
-                return False
-
-            book_index = self.book_abbreviations[book_abbr]
-            books = list(self.bible_data.keys())
-            if book_index >= len(books):
-                ui.message(_("The book of {book_name} is not available in the current translation.").format(book_name=book_abbr))
-                return False
-
-            book_key = books[book_index]
-            available_chapters = list(self.bible_data[book_key].keys())
-            if chapter not in available_chapters:
-                ui.message(_("There is no chapter {chapter} in the book of {book}.").format(chapter=chapter, book=book_key))
-                return False
-
-            chapter_data = self.bible_data[book_key][chapter]
-            if verse_start:
-                verse_start_int = int(verse_start)
-                if str(verse_start_int) not in chapter_data:
-                    ui.message(_("There is no verse {verse} in {book} chapter {chapter}.").format(
-                        verse=verse_start_int, book=book_key, chapter=chapter))
-                    return False
-
-                if verse_end:
-                    verse_end_int = int(verse_end)
-                    if str(verse_end_int) not in chapter_data:
-                        ui.message(_("Verse {verse} not found in {book} {chapter}").format(
-                            verse=verse_end_int, book=book_key, chapter=chapter))
-                        return False
-    
-                    if verse_start_int > verse_end_int:
-                        ui.message(_("Invalid verse range: start verse cannot be greater than end verse"))
-                        return False
-                else:
-                    verse_end_int = verse_start_int
-            else:
-                verse_start_int = 1
-                verse_end_int = 1
-
-            self.book_index = book_index
-            self.chapter = int(chapter)
-            self.verse_start = verse_start_int
-            self.verse_end = verse_end_int
-            return True
+        try:
+            book_index, chapter, verse_start, verse_end = reference_parser.parse_reference(
+                verse_reference, self.book_abbreviations, self.bible_data
+            )
+        except reference_parser.ReferenceParseError as e:
+            ui.message(self.get_reference_error_message(e))
+            return False
 
-        ui.message(_("Invalid Bible reference format."))
-        return False
+        self.book_index = book_index
+        self.chapter = chapter
+        self.verse_start = verse_start
+        self.verse_end = verse_end
+        return True
+
+    def get_reference_error_message(self, error):
+        details = error.details
+        if error.code == reference_parser.UNKNOWN_BOOK:
+            return _("No book matches the abbreviation {book_abbr}.").format(**details)
+        if error.code == reference_parser.BOOK_NOT_AVAILABLE:
+            return _("The book of {book_name} is not available in the current translation.").format(book_name=details["book_abbr"])
+        if error.code == reference_parser.CHAPTER_NOT_FOUND:
+            return _("There is no chapter {chapter} in the book of {book}.").format(**details)
+        if error.code == reference_parser.VERSE_NOT_FOUND:
+            return _("There is no verse {verse} in {book} chapter {chapter}.").format(**details)
+        if error.code == reference_parser.END_VERSE_NOT_FOUND:
+            return _("Verse {verse} not found in {book} {chapter}").format(**details)
+        if error.code == reference_parser.INVALID_RANGE:
+            return _("Invalid verse range: start verse cannot be greater than end verse")
+        return _("Invalid Bible reference format.")
 
     def get_selected_verse_info(self):
         return self.result
@@ -2795,6 +3504,7 @@ class ReadingPlanPanel(wx.Panel):
         self.settings = settings
         self.plan_name = plan_name
         self.plan_data = plan_data
+        self.plan_key = settings.get_plan_file_key(plan_name)
         self.current_day = current_day
         self.bible_data = bible_data
         self.translation_mapping = translation_mapping
@@ -2811,7 +3521,10 @@ class ReadingPlanPanel(wx.Panel):
             if "translation" not in self.progress:
                 self.progress["translation"] = {}
             self.progress["translation"][self.plan_name] = self.current_translation
-            self.settings.set_reading_plan_progress(self.plan_name, self.progress)
+            self.settings.set_reading_plan_progress(self.plan_name, self.progress, save=False)
+
+        self.day_index = self.build_day_index()
+        self.updating_day_list = False
 
         self.input_buffer = []
         self.input_timer = wx.Timer(self)
@@ -2825,12 +3538,12 @@ class ReadingPlanPanel(wx.Panel):
 
         day_sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.day_label = wx.StaticText(panel, label=_("Day:"))
-        day_sizer.Add(self.day_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
-        self.day_combo = wx.ComboBox(panel, style=wx.CB_READONLY)
-        self.day_combo.SetMinSize((300, -1))
-        self.day_combo.Bind(wx.EVT_COMBOBOX, self.on_day_changed)
-        self.day_combo.Bind(wx.EVT_KEY_DOWN, self.on_day_space_pressed)
-        day_sizer.Add(self.day_combo, 0, wx.ALL, 5)
+        day_sizer.Add(self.day_label, 0, wx.ALIGN_TOP | wx.ALL, 5)
+        self.day_list = VirtualListCtrl(panel, self.get_day_list_text, _("Day"))
+        self.day_list.SetMinSize((300, 120))
+        self.day_list.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_day_changed)
+        self.day_list.Bind(wx.EVT_KEY_DOWN, self.on_day_space_pressed)
+        day_sizer.Add(self.day_list, 0, wx.ALL, 5)
         main_sizer.Add(day_sizer, 0, wx.EXPAND | wx.ALL, 5)
 
         content_sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -2860,7 +3573,7 @@ class ReadingPlanPanel(wx.Panel):
         self.Bind(wx.EVT_SIZE, self.on_size)
 
         self.apply_font_size(font_size)
-        self.update_day_combo()
+        self.update_day_list()
         self.load_day_data(self.current_day)
         self.update_window_title()
         self.content_text.SetFocus()
@@ -2956,6 +3669,7 @@ class ReadingPlanPanel(wx.Panel):
     def on_plan_selected(self, plan_name):
         self.settings.set_current_reading_plan(plan_name)
         self.plan_name = plan_name
+        self.plan_key = self.settings.get_plan_file_key(plan_name)
         self.plan_data = self.settings.get_reading_plan_data(plan_name)
         self.progress = self.settings.get_reading_plan_progress(plan_name)
 
@@ -2969,12 +3683,13 @@ class ReadingPlanPanel(wx.Panel):
                 if "translation" not in self.progress:
                     self.progress["translation"] = {}
                 self.progress["translation"][self.plan_name] = self.current_translation
-                self.settings.set_reading_plan_progress(self.plan_name, self.progress)
+                self.settings.set_reading_plan_progress(self.plan_name, self.progress, save=False)
 
+        self.day_index = self.build_day_index()
         total_days = len(self.plan_data["days"])
         self.current_day = self.settings.get_last_unread_day(plan_name, total_days)
     
-        self.update_day_combo()
+        self.update_day_list()
         self.load_day_data(self.current_day)
         self.update_window_title()
         self.content_text.SetFocus()
@@ -3057,20 +3772,7 @@ class ReadingPlanPanel(wx.Panel):
             return f"{book_name} {chapter}:{verse}"
 
     def get_reading_key(self, reading):
-        book_num = reading["book"]
-        chapter = reading["chapter"]
-        verse = reading.get("verse")
-        if verse is None:
-            return f"{book_num}_{chapter}_chapter"
-        elif isinstance(verse, int):
-            return f"{book_num}_{chapter}_{verse}"
-        elif isinstance(verse, str) and '-' in verse:
-            return f"{book_num}_{chapter}_{verse}"
-        elif isinstance(verse, list) and len(verse) == 2:
-            start_verse, end_verse = verse
-            return f"{book_num}_{chapter}_{start_verse}-{end_verse}"
-        else:
-            return f"{book_num}_{chapter}_{verse}"
+        return get_reading_key(reading)
 
     def format_short_reference(self, ref):
         parts = ref.split(".")
@@ -3089,48 +3791,17 @@ class ReadingPlanPanel(wx.Panel):
 
     def get_current_verse(self):
         current_pos = self.content_text.GetInsertionPoint()
-        text_value = self.content_text.GetValue()
-        lines = text_value.split('\n')
-        adjusted_line_starts = []
-        char_count = 0
-        for i, line in enumerate(lines):
-            line_length = len(line) + 1
-            if i == len(lines) - 1 and not text_value.endswith('\n'):
-                line_length = len(line)
-            adjusted_start = char_count + i
-            adjusted_line_starts.append(adjusted_start)
-            char_count += line_length
-        for i, adjusted_start in enumerate(adjusted_line_starts):
-            next_adjusted_start = adjusted_line_starts[i + 1] if i + 1 < len(adjusted_line_starts) else float('inf')
-            if current_pos >= adjusted_start and current_pos < next_adjusted_start:
-                return i + 1
-        return 1
+        line_starts = get_line_starts(self.content_text.GetValue(), newline_width=2)
+        return get_line_number(line_starts, current_pos)
 
     def set_cursor_to_verse_number(self, verse_number=None, verse_offset=0):
         if verse_number is None:
             verse_number = self.get_current_verse()
         verse_number += verse_offset
         verse_number = max(1, verse_number)
-        text_value = self.content_text.GetValue()
-        lines = text_value.split('\n')
-        char_count = 0
-        verse_count = 0
-        for i, line in enumerate(lines):
-            line_length = len(line) + 1
-            if i == len(lines) - 1 and not text_value.endswith('\n'):
-                line_length = len(line)
-            adjusted_start = char_count + i
-            if line.strip():
-                verse_count += 1
-                if verse_count == verse_number:
-                    self.content_text.SetInsertionPoint(adjusted_start)
-                    self.content_text.ShowPosition(adjusted_start)
-                    return
-            char_count += line_length
-        if lines:
-            last_line_start = adjusted_start if 'adjusted_start' in locals() else 0
-            self.content_text.SetInsertionPoint(last_line_start)
-            self.content_text.ShowPosition(last_line_start)
+        position = get_verse_position(self.content_text.GetValue(), verse_number, newline_width=2)
+        self.content_text.SetInsertionPoint(position)
+        self.content_text.ShowPosition(position)
 
     def focus_and_speak_verse(self, verse_number=None, verse_offset=0):
         if verse_number is None:
@@ -3138,17 +3809,11 @@ class ReadingPlanPanel(wx.Panel):
         verse_number += verse_offset
         verse_number = max(1, verse_number)
         self.set_cursor_to_verse_number(verse_number)
-        text_value = self.content_text.GetValue()
-        lines = text_value.split('\n')
-        verse_count = 0
-        verse_line = None
-        for line in lines:
-            if line.strip():
-                verse_count += 1
-                if verse_count == verse_number:
-                    verse_line = line.strip()
-                    break
+        _line_index, _line_start, verse_line = find_verse_line(
+            self.content_text.GetValue(), verse_number
+        )
         if verse_line:
+            verse_line = verse_line.strip()
             if self.show_verse_numbers:
                 clean_text = re.sub(r'^\d+\.\s*', '', verse_line)
                 ui.message(f"{verse_number}. {clean_text}")
@@ -3165,9 +3830,8 @@ class ReadingPlanPanel(wx.Panel):
         current_verse = self.get_current_verse()
         self.show_verse_numbers = not self.show_verse_numbers
         self.settings.set_show_verse_numbers(self.show_verse_numbers)
-        day_index = self.day_combo.GetSelection()
-        day = self.plan_data["days"][day_index]["day"]
-        day_info = next((item for item in self.plan_data["days"] if item["day"] == day), None)
+        day = self.current_day
+        day_info = self.get_day_info(day)
         if day_info:
             selection = self.content_list.GetSelection()
             intro_content = day_info.get("intro", "")
@@ -3190,63 +3854,15 @@ class ReadingPlanPanel(wx.Panel):
             print(f"No bible data for translation: {translation}")
             return ""
 
-        books = list(bible_data.keys())
-        if book_idx < 0 or book_idx >= len(books):
-            print(f"Invalid book index: {book_idx}")
-            return ""
-    
-        book_key = books[book_idx]
-        if chapter not in bible_data[book_key]:
-            print(f"Chapter {chapter} not found in book {book_key}")
-            return ""
-
-        chapter_data = bible_data[book_key][chapter]
-        verses = [f"{verse}. {text}" for verse, text in chapter_data.items()]
-        return "\n".join(verses)
+        return get_text_store(bible_data).get_chapter_text(book_idx, chapter)
 
     def get_formatted_verse_text(self, ref, include_verse_number=True):
-        parts = ref.split(".")
-        if len(parts) < 3:
-            return ""
-
-        book_idx, chapter, verse_part = parts[0], parts[1], parts[2]
-
         bible_data = self.get_translation_data(self.current_translation)
         if not bible_data:
             print(f"No bible data for translation: {self.current_translation}")
             return ""
 
-        books = list(bible_data.keys())
-        if int(book_idx) < 0 or int(book_idx) >= len(books):
-            print(f"Invalid book index: {book_idx}")
-            return ""
-
-        book_key = books[int(book_idx)]
-        if chapter not in bible_data[book_key]:
-            print(f"Chapter {chapter} not found in book {book_key}")
-            return ""
-
-        chapter_data = bible_data[book_key][chapter]
-        if "-" in verse_part:
-            start_verse, end_verse = map(int, verse_part.split("-"))
-            verses = []
-            for verse in range(start_verse, end_verse + 1):
-                if str(verse) in chapter_data:
-                    verse_text = chapter_data[str(verse)]
-                    if include_verse_number:
-                        verses.append(f"{verse}. {verse_text}")
-                    else:
-                        verses.append(verse_text)
-            return "\n".join(verses)
-        else:
-            verse = int(verse_part)
-            if str(verse) in chapter_data:
-                verse_text = chapter_data[str(verse)]
-                if include_verse_number:
-                    return f"{verse}. {verse_text}"
-                else:
-                    return verse_text
-        return ""
+        return get_text_store(bible_data).get_verse_text(ref, include_verse_number)
 
     def show_reading(self, day_info, reading_index):
         readings = day_info.get("readings", [])
@@ -3318,14 +3934,24 @@ class ReadingPlanPanel(wx.Panel):
             self    .content_text.SetInsertionPoint(verse_start)
             self.content_text.ShowPosition(verse_start)
 
+    def build_day_index(self):
+        return build_day_index(self.plan_data)
+
+    def get_day_info(self, day):
+        index = self.day_index.get(day)
+        if index is None:
+            return None
+        return self.plan_data["days"][index]
+
     def get_day_date(self, day_number):
         start_date_str = self.progress.get("start_date", datetime.date.today().isoformat())
         start_date = datetime.date.fromisoformat(start_date_str)
         current_date = start_date + datetime.timedelta(days=day_number - 1)
         return current_date.strftime("%d %B %Y")
 
+    @perf.timed("plan_day_render")
     def load_day_data(self, day):
-        day_info = next((item for item in self.plan_data["days"] if item["day"] == day), None)
+        day_info = self.get_day_info(day)
         if not day_info:
             self.content_text.SetValue(_("No data for selected day"))
             self.content_list.Clear()
@@ -3402,7 +4028,7 @@ class ReadingPlanPanel(wx.Panel):
             self.progress["start_date"] = datetime.date.today().isoformat()
 
         self.progress[str(day)]["intro"] = completed
-        self.settings.set_reading_plan_progress(self.plan_name, self.progress)
+        self.save_day_progress(day)
 
     def mark_reading_completed(self, day, reading_key, completed=True):
         if str(day) not in self.progress:
@@ -3411,7 +4037,7 @@ class ReadingPlanPanel(wx.Panel):
         if "start_date" not in self.progress:
             self.progress["start_date"] = datetime.date.today().isoformat()
 
-        day_info = next((item for item in self.plan_data["days"] if item["day"] == day), None)
+        day_info = self.get_day_info(day)
         if not day_info:
             return
 
@@ -3434,10 +4060,17 @@ class ReadingPlanPanel(wx.Panel):
         if all_unread and "intro" in self.progress[str(day)]:
             self.progress[str(day)]["intro"] = False
 
+        self.save_day_progress(day)
+
+    def save_day_progress(self, day):
+        # The same check that rebuilds the frontier, so the bitmask and the day status agree.
+        day_info = self.get_day_info(day)
+        is_completed = bool(day_info) and is_day_read(day_info, self.progress.get(str(day), {}))
+        self.settings.set_plan_day_completed(self.plan_name, day, is_completed)
         self.settings.set_reading_plan_progress(self.plan_name, self.progress)
 
     def mark_all_readings_completed(self, day):
-        day_info = next((item for item in self.plan_data["days"] if item["day"] == day), None)
+        day_info = self.get_day_info(day)
         if not day_info:
             return
 
@@ -3454,14 +4087,13 @@ class ReadingPlanPanel(wx.Panel):
             self.mark_reading_completed(day, reading_key, True)
 
         self.update_content_list(day)
-        self.update_day_combo()
+        self.update_day_list()
         ui.message(_("Marked as read"))
 
     def on_content_selected(self, event):
         selection = self.content_list.GetSelection()
-        day_index = self.day_combo.GetSelection()
-        day = self.plan_data["days"][day_index]["day"]
-        day_info = next((item for item in self.plan_data["days"] if item["day"] == day), None)
+        day = self.current_day
+        day_info = self.get_day_info(day)
         if not day_info:
             return
 
@@ -3475,7 +4107,7 @@ class ReadingPlanPanel(wx.Panel):
             self.show_reading(day_info, reading_index)
 
     def update_content_list(self, day):
-        day_info = next((item for item in self.plan_data["days"] if item["day"] == day), None)
+        day_info = self.get_day_info(day)
         if not day_info:
             return
 
@@ -3502,8 +4134,8 @@ class ReadingPlanPanel(wx.Panel):
         key_code = event.GetKeyCode()
         if key_code == wx.WXK_SPACE:
             selection = self.content_list.GetSelection()
-            day_number = self.plan_data["days"][self.day_combo.GetSelection()]["day"]
-            day_info = next((item for item in self.plan_data["days"] if item["day"] == day_number), None)
+            day_number = self.current_day
+            day_info = self.get_day_info(day_number)
             if not day_info:
                 return
 
@@ -3515,7 +4147,7 @@ class ReadingPlanPanel(wx.Panel):
                 self.mark_intro_completed(day_number, not current_state)
                 wx.CallAfter(self.update_content_list, day_number)
                 wx.CallAfter(self.content_list.SetSelection, selection)
-                wx.CallAfter(self.update_day_combo)
+                wx.CallAfter(self.update_day_list)
                 if not current_state:
                     ui.message(_("Marked as read"))
                 else:
@@ -3530,7 +4162,7 @@ class ReadingPlanPanel(wx.Panel):
                     self.mark_reading_completed(day_number, reading_key, not current_state)
                     wx.CallAfter(self.update_content_list, day_number)
                     wx.CallAfter(self.content_list.SetSelection, selection)
-                    wx.CallAfter(self.update_day_combo)
+                    wx.CallAfter(self.update_day_list)
                     if not current_state:
                         ui.message(_("Marked as read"))
                     else:
@@ -3541,10 +4173,12 @@ class ReadingPlanPanel(wx.Panel):
     def on_day_space_pressed(self, event):
         key_code = event.GetKeyCode()
         if key_code == wx.WXK_SPACE:
-            current_selection = self.day_combo.GetSelection()
+            current_selection = self.day_list.get_selected_index()
+            if current_selection == -1:
+                return
             day_number = self.plan_data["days"][current_selection]["day"]
 
-            day_info = next((item for item in self.plan_data["days"] if item["day"] == day_number), None)
+            day_info = self.get_day_info(day_number)
             if not day_info:
                 return
 
@@ -3565,9 +4199,8 @@ class ReadingPlanPanel(wx.Panel):
                     self.progress[str(day_number)][intro_key] = True
                     ui.message(_("Marked as completed"))
 
-                self.settings.set_reading_plan_progress(self.plan_name, self.progress)
-                self.update_day_combo()
-                self.day_combo.SetSelection(current_selection)
+                self.save_day_progress(day_number)
+                self.update_day_list()
                 self.update_content_list(day_number)
                 return
 
@@ -3598,67 +4231,43 @@ class ReadingPlanPanel(wx.Panel):
 
                 ui.message(_("Marked as completed"))
 
-            self.settings.set_reading_plan_progress(self.plan_name, self.progress)
-            self.update_day_combo()
-            self.day_combo.SetSelection(current_selection)
+            self.save_day_progress(day_number)
+            self.update_day_list()
             self.update_content_list(day_number)
         else:
             event.Skip()
 
 
     def get_day_status(self, day):
-        day_info = next((item for item in self.plan_data["days"] if item["day"] == day), None)
-        if not day_info:
-            return "Not Started"
-        readings = day_info.get("readings", [])
-        intro_key = "intro"
-        is_intro_read = self.progress.get(str(day), {}).get(intro_key, False)
-        if not readings:
-            if is_intro_read:
-                return "Completed"
-            else:
-                return "Not Started"
-        all_read = is_intro_read
-        any_read = is_intro_read
-        for reading in readings:
-            reading_key = self.get_reading_key(reading)
-            is_read = self.is_reading_completed(day, reading_key)
-            if not is_read:
-                all_read = False
-            else:
-                any_read = True
-        if all_read:
-            return "Completed"
-        elif any_read:
-            return "Not completed"
-        else:
-            return "Not Started"
-
-    def update_day_combo(self):
-        day_choices = []
-        for day_info in self.plan_data["days"]:
-            day = day_info["day"]
-            day_date = self.get_day_date(day)
-            status = self.get_day_status(day)
-            status_text = {
-                "Completed": f" ({_('Completed')})",
-                "Not completed": f" ({_('Not completed')})",
-                "Not Started": f" ({_('Not started')})"
-            }.get(status, "")
-            day_choices.append(f"{day_date}{status_text}")
-        self.day_combo.SetItems(day_choices)
-        current_day_date = self.get_day_date(self.current_day)
-        for i, choice in enumerate(day_choices):
-            if choice.startswith(current_day_date):
-                self.day_combo.SetSelection(i)
-                break
-        else:
-            self.day_combo.SetSelection(0)
-        self.parent_frame.UpdateMenuBar()
+        return get_day_status(self.get_day_info(day), self.progress.get(str(day), {}))
+
+    def update_day_list(self):
+        self.updating_day_list = True
+        try:
+            self.day_list.set_item_count(
+                len(self.plan_data["days"]),
+                self.day_index.get(self.current_day, 0)
+            )
+        finally:
+            self.updating_day_list = False
+        if self.parent_frame and self.parent_frame.current_mode == "reading_plan":
+            self.parent_frame.UpdateMenuBar()
+
+    def get_day_list_text(self, index):
+        day = self.plan_data["days"][index]["day"]
+        status_text = {
+            "Completed": f" ({_('Completed')})",
+            "Not completed": f" ({_('Not completed')})",
+            "Not Started": f" ({_('Not started')})"
+        }.get(self.get_day_status(day), "")
+        return f"{self.get_day_date(day)}{status_text}"
 
     def on_day_changed(self, event):
-        selected_index = self.day_combo.GetSelection()
-        day_number = self.plan_data["days"][selected_index]["day"]
+        if self.updating_day_list:
+            return
+        day_number = self.plan_data["days"][event.GetIndex()]["day"]
+        if day_number == self.current_day:
+            return
         self.current_day = day_number
         self.update_window_title()
         self.load_day_data(day_number)
@@ -3686,7 +4295,7 @@ class ReadingPlanPanel(wx.Panel):
         self.SetFont(font)
         self.content_text.SetFont(font)
         self.content_list.SetFont(font)
-        self.day_combo.SetFont(font)
+        self.day_list.SetFont(font)
 
     def handle_key_down(self, event):
         key_code = event.GetKeyCode()
@@ -4058,82 +4667,41 @@ class SearchOnPageDialog:
     def on_close(self, event):
         self.dialog.Destroy()
 
+    def find_in_list(self, search_text, case_sensitive=False, whole_word=False, forward=True):
+        list_ctrl = self.text_display
+        found_index, cycle_restarted = find_in_items(
+            list_ctrl.get_item_text, list_ctrl.GetItemCount(), list_ctrl.get_selected_index(),
+            search_text, case_sensitive, whole_word, forward
+        )
+        if found_index == -1:
+            ui.message(_("Text not found."))
+            return False
+
+        list_ctrl.select_item(found_index)
+        list_ctrl.SetFocus()
+        if cycle_restarted:
+            self.play_wrap_sound()
+        ui.message(list_ctrl.get_item_text(found_index))
+        if hasattr(self, 'dialog') and self.dialog:
+            self.dialog.Destroy()
+        return True
+
+    def play_wrap_sound(self):
+        sound_thread = threading.Thread(
+            target=winsound.PlaySound, args=("SystemAsterisk", winsound.SND_ALIAS)
+        )
+        sound_thread.daemon = True
+        sound_thread.start()
+
     def find_in_text_display(self, search_text, case_sensitive=False, whole_word=False, forward=True):
-        def play_sound():
-            winsound.PlaySound("SystemAsterisk", winsound.SND_ALIAS)
+        if isinstance(self.text_display, VirtualListCtrl):
+            return self.find_in_list(search_text, case_sensitive, whole_word, forward)
 
         text_ctrl = self.text_display
         text = text_ctrl.GetValue()
-
-        if not case_sensitive:
-            text_lower = text.lower()
-            search_text_lower = search_text.lower()
-        else:
-            text_lower = text
-            search_text_lower = search_text
-
-        start_pos = text_ctrl.GetInsertionPoint()
-        found_pos = -1
-        cycle_restarted = False
-
-        if whole_word:
-            if not case_sensitive:
-                pattern = re.compile(r'\b' + re.escape(search_text_lower) + r'\b')
-                if forward:
-                    match = pattern.search(text_lower, start_pos + 1)
-                    if match:
-                        found_pos = match.start()
-                    else:
-                        match = pattern.search(text_lower)
-                        if match:
-                            found_pos = match.start()
-                            cycle_restarted = True
-                else:
-                    matches = list(pattern.finditer(text_lower[:start_pos]))
-                    if matches:
-                        found_pos = matches[-1].start()
-                    else:
-                        matches = list(pattern.finditer(text_lower))
-                        if matches:
-                            found_pos = matches[-1].start()
-                            cycle_restarted = True
-            else:
-                pattern = re.compile(r'\b' + re.escape(search_text) + r'\b')
-                if forward:
-                    match = pattern.search(text, start_pos + 1)
-                    if match:
-                        found_pos = match.start()
-                    else:
-                        match = pattern.search(text)
-                        if match:
-                            found_pos = match.start()
-                            cycle_restarted = True
-                else:
-                    matches = list(pattern.finditer(text[:start_pos]))
-                    if matches:
-                        found_pos = matches[-1].start()
-                    else:
-                        matches = list(pattern.finditer(text))
-                        if matches:
-                            found_pos = matches[-1].start()
-                            cycle_restarted = True
-        else:
-            if forward:
-                search_range = text_lower[start_pos + 1:]
-                found_pos = search_range.find(search_text_lower)
-                if found_pos != -1:
-                    found_pos += start_pos + 1
-                else:
-                    found_pos = text_lower.find(search_text_lower)
-                    if found_pos != -1:
-                        cycle_restarted = True
-            else:
-                search_range = text_lower[:start_pos]
-                found_pos = search_range.rfind(search_text_lower)
-                if found_pos == -1:
-                    found_pos = text_lower.rfind(search_text_lower)
-                    if found_pos != -1:
-                        cycle_restarted = True
+        found_pos, cycle_restarted = find_in_text(
+            text, search_text, text_ctrl.GetInsertionPoint(), case_sensitive, whole_word, forward
+        )
 
         if found_pos != -1:
             text_ctrl.SetInsertionPoint(found_pos)
@@ -4141,18 +4709,9 @@ class SearchOnPageDialog:
             text_ctrl.ShowPosition(found_pos)
 
             if cycle_restarted:
-                sound_thread = threading.Thread(target=play_sound)
-                sound_thread.daemon = True
-                sound_thread.start()
+                self.play_wrap_sound()
 
-            lines = text.split('\n')
-            char_count = 0
-            for line in lines:
-                line_length = len(line) + 1
-                if char_count + line_length > found_pos:
-                    ui.message(line.strip())
-                    break
-                char_count += line_length
+            ui.message(get_line_at(text, found_pos).strip())
 
             if hasattr(self, 'dialog') and self.dialog:
                 self.dialog.Destroy()
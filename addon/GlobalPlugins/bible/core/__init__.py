@@ -0,0 +1,4 @@
+# Data logic shared by the dialogs. Nothing here may import wx or NVDA modules,
+# so it can be used and measured outside the screen reader. The modules are
+# imported where they are used, not re-exported here, so that loading the
+# plugin at NVDA startup does not load the search code.
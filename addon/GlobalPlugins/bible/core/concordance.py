@@ -0,0 +1,61 @@
+from array import array
+from bisect import bisect_left
+
+from .query import parse_proximity_query, evaluate_proximity
+
+# Testaments are only told apart for the usual 66-book canon.
+CANON_BOOK_COUNT = 66
+OLD_TESTAMENT_BOOK_COUNT = 39
+
+
+def get_occurrences(index, search_text):
+    # Returns (sorted verse ids, occurrences in each verse) for a word, a phrase or a NEAR query.
+    node = parse_proximity_query(search_text)
+    if node[0] == "phrase" and len(node[1]) == 1:
+        posting = index.postings.get(node[1][0])
+        if posting is None:
+            return array("I"), array("H")
+        return posting[0], posting[1]
+    matches = evaluate_proximity(index, node)
+    verse_ids = sorted(matches)
+    return verse_ids, [len(matches[verse_id]) for verse_id in verse_ids]
+
+
+def build_concordance(index, search_text):
+    verse_ids, counts = get_occurrences(index, search_text)
+
+    # Verse ids are sorted and numbered book by book, so each book is one slice.
+    books = []
+    for book_index, book_name in enumerate(index.books):
+        start, end = index.get_book_range(book_index)
+        low = bisect_left(verse_ids, start)
+        high = bisect_left(verse_ids, end, low)
+        if high > low:
+            books.append((book_index, book_name, high - low, sum(counts[low:high])))
+
+    concordance = {
+        "verse_ids": verse_ids,
+        "verses": len(verse_ids),
+        "occurrences": sum(counts),
+        "books": books,
+        "first": index.get_ref(verse_ids[0]) if verse_ids else None,
+        "last": index.get_ref(verse_ids[-1]) if verse_ids else None,
+        "old_testament": None,
+        "new_testament": None,
+    }
+    if len(index.books) == CANON_BOOK_COUNT:
+        for key, in_testament in (
+            ("old_testament", lambda book_index: book_index < OLD_TESTAMENT_BOOK_COUNT),
+            ("new_testament", lambda book_index: book_index >= OLD_TESTAMENT_BOOK_COUNT),
+        ):
+            selected = [book for book in books if in_testament(book[0])]
+            concordance[key] = (sum(book[2] for book in selected), sum(book[3] for book in selected))
+    return concordance
+
+
+def get_book_refs(index, concordance, book_index=None):
+    verse_ids = concordance["verse_ids"]
+    if book_index is not None:
+        start, end = index.get_book_range(book_index)
+        verse_ids = verse_ids[bisect_left(verse_ids, start):bisect_left(verse_ids, end)]
+    return index.get_refs(verse_ids)
@@ -0,0 +1,467 @@
+import copy
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .normalize import fold_text
+from .scan import ScanBuffer
+from .stemmers import stem_word
+
+# NumPy is not shipped with NVDA; when it is importable the scoring runs
+# vectorised, otherwise the same formulas run in plain Python.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INDEX_VERSION = 6
+# Combining marks, e.g. stress marks, belong to the word they are written on.
+WORD_PATTERN = re.compile(r"\w[\w\u0300-\u036f]*(?:['’ʼ][\w\u0300-\u036f]+)*")
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_THEME_LIMIT = 200
+DEFAULT_SUGGESTION_LIMIT = 10
+
+
+def tokenize(text):
+    return WORD_PATTERN.findall(text.casefold())
+
+
+def contains_sorted(values, value):
+    i = bisect_left(values, value)
+    return i < len(values) and values[i] == value
+
+
+class SearchIndex:
+    def __init__(self):
+        self.books = []
+        self.book_starts = array("I")
+        self.verse_chapters = []
+        self.verse_numbers = []
+        self.verse_lengths = array("I")
+        self.postings = {}
+        self.average_length = 0.0
+        self.source_version = None
+        self.language = ""
+        self.folded_terms = {}
+        self.stem_terms = {}
+        self.sorted_terms = []
+        self.folded_texts = []
+        self._base = self
+        self._views = {}
+        self._length_norms = None
+        self._offsets = {}
+        self._ref_ids = None
+        self._folded_data = None
+        self._folded_buffer = None
+
+    # Each posting is (verse ids, term frequencies, positions): the positions of
+    # a term in one verse follow each other, in the same order as the verse ids.
+    @classmethod
+    def build(cls, bible_data, language=""):
+        index = cls()
+        index.language = language
+        term_ids = {}
+        term_frequencies = {}
+        term_positions = {}
+        verse_id = 0
+
+        for book_name, chapters in bible_data.items():
+            index.books.append(book_name)
+            index.book_starts.append(verse_id)
+            for chapter, verses in chapters.items():
+                for verse_number, text in verses.items():
+                    tokens = tokenize(text)
+                    index.folded_texts.append(fold_text(text, language))
+                    index.verse_chapters.append(chapter)
+                    index.verse_numbers.append(verse_number)
+                    index.verse_lengths.append(len(tokens))
+
+                    verse_positions = {}
+                    for position, token in enumerate(tokens[:65535]):
+                        verse_positions.setdefault(token, []).append(position)
+                    for token, positions in verse_positions.items():
+                        ids = term_ids.get(token)
+                        if ids is None:
+                            ids = term_ids[token] = array("I")
+                            term_frequencies[token] = array("H")
+                            term_positions[token] = array("H")
+                        ids.append(verse_id)
+                        term_frequencies[token].append(len(positions))
+                        term_positions[token].extend(positions)
+                    verse_id += 1
+
+        index.postings = {
+            term: (ids, term_frequencies[term], term_positions[term]) for term, ids in term_ids.items()
+        }
+        index.average_length = sum(index.verse_lengths) / verse_id if verse_id else 0.0
+        index.folded_terms = index.build_folded_terms()
+        index.stem_terms = index.build_stem_terms()
+        # Pickle stores each term once, so the sorted list adds little to the file.
+        index.sorted_terms = sorted(index.postings)
+        return index
+
+    def build_folded_terms(self):
+        # {folded form: terms written with accents, other apostrophes, ...}; terms
+        # that fold to themselves and have no variants are left out.
+        folded_terms = {}
+        for term in self.postings:
+            folded = fold_text(term, self.language)
+            if folded != term:
+                folded_terms.setdefault(folded, []).append(term)
+        for folded, terms in folded_terms.items():
+            if folded in self.postings:
+                terms.append(folded)
+            terms.sort()
+        return folded_terms
+
+    def build_stem_terms(self):
+        # {stem: every term with that stem}; stems are taken from folded terms,
+        # so matching word forms also ignores accents.
+        stem_terms = {}
+        for term in self.postings:
+            stem_terms.setdefault(self.get_stem(term), []).append(term)
+        for terms in stem_terms.values():
+            terms.sort()
+        return stem_terms
+
+    def to_dict(self):
+        return {
+            "version": INDEX_VERSION,
+            "source_version": self.source_version,
+            "books": self.books,
+            "book_starts": self.book_starts,
+            "verse_chapters": self.verse_chapters,
+            "verse_numbers": self.verse_numbers,
+            "verse_lengths": self.verse_lengths,
+            "postings": self.postings,
+            "average_length": self.average_length,
+            "language": self.language,
+            "folded_terms": self.folded_terms,
+            "stem_terms": self.stem_terms,
+            "sorted_terms": self.sorted_terms,
+            "folded_texts": self.folded_texts,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        index = cls()
+        index.source_version = data["source_version"]
+        index.books = data["books"]
+        index.book_starts = data["book_starts"]
+        index.verse_chapters = data["verse_chapters"]
+        index.verse_numbers = data["verse_numbers"]
+        index.verse_lengths = data["verse_lengths"]
+        index.postings = data["postings"]
+        index.average_length = data["average_length"]
+        index.language = data["language"]
+        index.folded_terms = data["folded_terms"]
+        index.stem_terms = data["stem_terms"]
+        index.sorted_terms = data["sorted_terms"]
+        index.folded_texts = data["folded_texts"]
+        return index
+
+    @property
+    def verse_count(self):
+        return len(self.verse_lengths)
+
+    def get_book_index(self, verse_id):
+        return bisect_right(self.book_starts, verse_id) - 1
+
+    def get_ref(self, verse_id):
+        return (
+            self.books[self.get_book_index(verse_id)],
+            self.verse_chapters[verse_id],
+            self.verse_numbers[verse_id],
+        )
+
+    def get_refs(self, verse_ids):
+        return [self.get_ref(verse_id) for verse_id in verse_ids]
+
+    def get_book_range(self, book_index):
+        start = self.book_starts[book_index]
+        end = self.book_starts[book_index + 1] if book_index + 1 < len(self.books) else self.verse_count
+        return start, end
+
+    def get_folded_data(self):
+        # The text of each verse folded as fold_text(text, language) does, in
+        # the shape of the translation. It is kept with the index, so an
+        # accent-insensitive search does not fold the whole Bible first.
+        base = self._base
+        if base._folded_data is None:
+            folded_data = {}
+            for book_index, book_name in enumerate(base.books):
+                chapters = folded_data[book_name] = {}
+                for verse_id in range(*base.get_book_range(book_index)):
+                    chapter = base.verse_chapters[verse_id]
+                    verses = chapters.get(chapter)
+                    if verses is None:
+                        verses = chapters[chapter] = {}
+                    verses[base.verse_numbers[verse_id]] = base.folded_texts[verse_id]
+            base._folded_data = folded_data
+        return base._folded_data
+
+    def get_folded_buffer(self):
+        base = self._base
+        if base._folded_buffer is None:
+            base._folded_buffer = ScanBuffer(base.get_folded_data())
+        return base._folded_buffer
+
+    def get_book_indexes(self, book_names):
+        selected = set(book_names)
+        return {book_index for book_index, book_name in enumerate(self.books) if book_name in selected}
+
+    def get_idf(self, document_frequency):
+        return math.log(1 + (self.verse_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def get_length_norms(self):
+        if self._length_norms is None:
+            average = self.average_length or 1.0
+            norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / average) for length in self.verse_lengths]
+            self._length_norms = numpy.array(norms, dtype=numpy.float32) if numpy is not None else norms
+        return self._length_norms
+
+    def get_known_terms(self, terms):
+        # Spelling variants share one posting in the folded view; each counts once.
+        known = {}
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                known.setdefault(id(posting), term)
+        return list(known.values())
+
+    def get_scores(self, terms):
+        # BM25 score of every verse containing one of the terms: a float32 array
+        # over all verses with NumPy, otherwise a {verse id: score} dict.
+        norms = self.get_length_norms()
+        if numpy is not None:
+            scores = numpy.zeros(self.verse_count, dtype=numpy.float32)
+            for term in terms:
+                ids, frequencies, _positions = self.postings[term]
+                ids = numpy.frombuffer(ids, dtype=numpy.uint32)
+                frequencies = numpy.frombuffer(frequencies, dtype=numpy.uint16).astype(numpy.float32)
+                idf = self.get_idf(len(ids))
+                # A verse appears once per posting list, so plain fancy indexing is safe.
+                scores[ids] += idf * frequencies * (BM25_K1 + 1) / (frequencies + norms[ids])
+            return scores
+
+        scores = {}
+        for term in terms:
+            ids, frequencies, _positions = self.postings[term]
+            idf = self.get_idf(len(ids))
+            for verse_id, frequency in zip(ids, frequencies):
+                scores[verse_id] = scores.get(verse_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (
+                    frequency + norms[verse_id]
+                )
+        return scores
+
+    def score_terms(self, terms, book_names=None, limit=DEFAULT_THEME_LIMIT):
+        terms = self.get_known_terms(terms)
+        if not terms:
+            return []
+        book_indexes = self.get_book_indexes(book_names) if book_names is not None else None
+        scores = self.get_scores(terms)
+        if numpy is not None:
+            return self.select_top_numpy(scores, book_indexes, limit)
+
+        if book_indexes is not None:
+            scores = {
+                verse_id: score for verse_id, score in scores.items()
+                if self.get_book_index(verse_id) in book_indexes
+            }
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [verse_id for verse_id, _score in best]
+
+    def select_top_numpy(self, scores, book_indexes, limit):
+        if book_indexes is not None:
+            mask = numpy.zeros(self.verse_count, dtype=bool)
+            for book_index in book_indexes:
+                start, end = self.get_book_range(book_index)
+                mask[start:end] = True
+            scores[~mask] = 0
+        found = int(numpy.count_nonzero(scores))
+        count = min(limit, found)
+        if not count:
+            return []
+        top = numpy.argpartition(-scores, count - 1)[:count]
+        top = top[numpy.lexsort((top, -scores[top]))]
+        return [int(verse_id) for verse_id in top]
+
+    def rank_verse_ids(self, terms, verse_ids):
+        # Orders already found verses by BM25 score; ties and verses without
+        # any of the terms keep the canonical order.
+        terms = self.get_known_terms(terms)
+        if not terms or len(verse_ids) < 2:
+            return sorted(verse_ids)
+        scores = self.get_scores(terms)
+        if numpy is not None:
+            ids = numpy.array(verse_ids, dtype=numpy.int64)
+            return [int(verse_id) for verse_id in ids[numpy.lexsort((ids, -scores[ids]))]]
+        return sorted(verse_ids, key=lambda verse_id: (-scores.get(verse_id, 0.0), verse_id))
+
+    def get_verse_id(self, ref):
+        if self._ref_ids is None:
+            ref_ids = {}
+            for book_index, book_name in enumerate(self.books):
+                for verse_id in range(*self.get_book_range(book_index)):
+                    ref_ids[(book_name, self.verse_chapters[verse_id], self.verse_numbers[verse_id])] = verse_id
+            self._ref_ids = ref_ids
+        return self._ref_ids.get(tuple(ref))
+
+    def theme_search(self, text, book_names=None, limit=DEFAULT_THEME_LIMIT):
+        return self.score_terms(tokenize(text), book_names, limit)
+
+    def get_verse_ids(self, term):
+        posting = self.postings.get(term)
+        return posting[0] if posting else array("I")
+
+    def get_positions(self, term, verse_id):
+        posting = self.postings.get(term)
+        if not posting:
+            return ()
+        ids, frequencies, positions = posting
+        i = bisect_left(ids, verse_id)
+        if i == len(ids) or ids[i] != verse_id:
+            return ()
+        offsets = self._offsets.get(term)
+        if offsets is None:
+            offsets = array("I", [0])
+            total = 0
+            for frequency in frequencies:
+                total += frequency
+                offsets.append(total)
+            self._offsets[term] = offsets
+        return positions[offsets[i]:offsets[i + 1]]
+
+    def find_phrase(self, terms, candidates=None):
+        # Returns {verse id: [(first position, last position), ...]}.
+        if not terms or any(term not in self.postings for term in terms):
+            return {}
+        rarest = min(set(terms), key=lambda term: len(self.postings[term][0]))
+        if candidates is not None and len(candidates) < len(self.postings[rarest][0]):
+            # Few candidates: look each one up in the posting lists instead.
+            verse_ids = set(candidates)
+            for term in set(terms):
+                ids = self.get_verse_ids(term)
+                verse_ids = {verse_id for verse_id in verse_ids if contains_sorted(ids, verse_id)}
+        else:
+            verse_ids = set(self.get_verse_ids(rarest))
+            for term in set(terms):
+                if term != rarest:
+                    verse_ids.intersection_update(self.get_verse_ids(term))
+            if isinstance(candidates, range):
+                verse_ids = {verse_id for verse_id in verse_ids if verse_id in candidates}
+            elif candidates is not None:
+                verse_ids.intersection_update(candidates)
+
+        last = len(terms) - 1
+        matches = {}
+        for verse_id in verse_ids:
+            starts = set(self.get_positions(terms[0], verse_id))
+            for offset, term in enumerate(terms[1:], 1):
+                term_positions = set(self.get_positions(term, verse_id))
+                starts = {start for start in starts if start + offset in term_positions}
+                if not starts:
+                    break
+            if starts:
+                matches[verse_id] = [(start, start + last) for start in sorted(starts)]
+        return matches
+
+    def suggest(self, prefix, limit=DEFAULT_SUGGESTION_LIMIT):
+        # Words starting with the prefix, the most frequent first, as (term, verse count).
+        prefix = prefix.casefold()
+        if not prefix:
+            return []
+        terms = self.sorted_terms
+        start = bisect_left(terms, prefix)
+        end = bisect_left(terms, prefix + "\U0010ffff", start)
+        postings = self.postings
+        best = heapq.nlargest(
+            limit, (terms[i] for i in range(start, end)), key=lambda term: len(postings[term][0])
+        )
+        return [(term, len(postings[term][0])) for term in best]
+
+    def get_term_variants(self, term):
+        folded = fold_text(term, self.language)
+        variants = self.folded_terms.get(folded)
+        if variants is not None:
+            return variants
+        return [folded] if folded in self.postings else []
+
+    def get_stem(self, term):
+        return stem_word(fold_text(term, self.language), self.language)
+
+    def get_word_forms(self, stem):
+        return self.stem_terms.get(stem, [])
+
+    def get_view(self, ignore_accents=False, word_forms=False):
+        # The same index, but every term also matches its accented and other
+        # spelling variants, or all its word forms. Queries run on it unchanged.
+        base = self._base
+        if word_forms:
+            key = "word_forms"
+        elif ignore_accents:
+            key = "ignore_accents"
+        else:
+            return base
+        view = base._views.get(key)
+        if view is None:
+            view = copy.copy(base)
+            if word_forms:
+                view.postings = VariantPostings(base, base.get_stem, base.get_word_forms)
+            else:
+                view.postings = VariantPostings(
+                    base, lambda term: fold_text(term, base.language), base.get_term_variants
+                )
+            view._offsets = {}
+            base._views[key] = view
+        return view
+
+
+class VariantPostings:
+    # Looks like the postings dict, but a term's posting is the merged postings
+    # of every term get_variants(get_key(term)) lists.
+    def __init__(self, index, get_key, get_variants):
+        self.index = index
+        self.get_key = get_key
+        self.get_variants = get_variants
+        self.merged = {}
+
+    def get(self, term, default=None):
+        key = self.get_key(term)
+        if key not in self.merged:
+            self.merged[key] = self.merge(self.get_variants(key))
+        posting = self.merged[key]
+        return default if posting is None else posting
+
+    def __getitem__(self, term):
+        posting = self.get(term)
+        if posting is None:
+            raise KeyError(term)
+        return posting
+
+    def __contains__(self, term):
+        return self.get(term) is not None
+
+    def merge(self, variants):
+        if not variants:
+            return None
+        if len(variants) == 1:
+            return self.index.postings[variants[0]]
+        verse_positions = {}
+        for variant in variants:
+            for verse_id in self.index.get_verse_ids(variant):
+                verse_positions.setdefault(verse_id, []).extend(self.index.get_positions(variant, verse_id))
+        ids = array("I")
+        frequencies = array("H")
+        positions = array("H")
+        for verse_id in sorted(verse_positions):
+            verse_id_positions = sorted(verse_positions[verse_id])
+            ids.append(verse_id)
+            frequencies.append(min(len(verse_id_positions), 65535))
+            positions.extend(verse_id_positions)
+        return ids, frequencies, positions
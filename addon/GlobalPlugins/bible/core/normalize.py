@@ -0,0 +1,78 @@
+import re
+import unicodedata
+
+# Translation folders are named "<Language> - <Title>".
+LANGUAGE_CODES = {
+    "belarusian": "be",
+    "bulgarian": "bg",
+    "czech": "cs",
+    "english": "en",
+    "polish": "pl",
+    "portuguese": "pt",
+    "russian": "ru",
+    "ukrainian": "uk",
+}
+
+APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'", "‘": "'", "`": "'", "´": "'"})
+
+# Letters that look like a base letter with a mark but are letters of their own
+# in the language, e.g. Ukrainian "й" and "ї"; their marks are kept.
+KEPT_MARKS = {
+    "be": {("и", "̆"), ("у", "̆"), ("е", "̈")},
+    "bg": {("и", "̆")},
+    "ru": {("и", "̆")},
+    "uk": {("и", "̆"), ("і", "̈")},
+}
+
+# Letters NFKD does not take apart, and spelling variants found in older texts.
+EQUIVALENTS = {
+    "": {"ł": "l", "ø": "o", "đ": "d", "ħ": "h"},
+    "uk": {"ґ": "г"},
+}
+
+LANGUAGE_PREFIX = re.compile(r"^\s*([A-Za-z]+)\s*-")
+
+
+def get_translation_language(translation):
+    match = LANGUAGE_PREFIX.match(translation or "")
+    if not match:
+        return ""
+    return LANGUAGE_CODES.get(match.group(1).lower(), "")
+
+
+def fold_text(text, language="", keep_case=False):
+    # Case, accents, stress marks and apostrophe variants are folded away so
+    # that e.g. "ё" matches "е" and "Jesús" matches "Jesus".
+    if not keep_case:
+        text = text.casefold()
+    text = text.translate(APOSTROPHES)
+    kept = KEPT_MARKS.get(language, ())
+    decomposed = unicodedata.normalize("NFKD", text)
+    chars = []
+    base = ""
+    for char in decomposed:
+        if unicodedata.combining(char):
+            if (base.lower(), char) in kept:
+                chars.append(char)
+            continue
+        base = char
+        chars.append(char)
+    text = unicodedata.normalize("NFC", "".join(chars))
+    for table in (EQUIVALENTS[""], EQUIVALENTS.get(language, {})):
+        for letter, replacement in table.items():
+            if letter in text:
+                text = text.replace(letter, replacement)
+            upper = letter.upper()
+            if keep_case and upper in text:
+                text = text.replace(upper, replacement.upper())
+    return text
+
+
+def fold_bible_data(bible_data, language="", keep_case=False):
+    return {
+        book_name: {
+            chapter: {verse: fold_text(text, language, keep_case) for verse, text in verses.items()}
+            for chapter, verses in chapters.items()
+        }
+        for book_name, chapters in bible_data.items()
+    }
@@ -0,0 +1,52 @@
+DAY_COMPLETED = "Completed"
+DAY_NOT_COMPLETED = "Not completed"
+DAY_NOT_STARTED = "Not Started"
+
+
+def get_reading_key(reading):
+    book_num = reading["book"]
+    chapter = reading["chapter"]
+    verse = reading.get("verse")
+
+    if verse is None:
+        return f"{book_num}_{chapter}_chapter"
+    elif isinstance(verse, list) and len(verse) == 2:
+        start_verse, end_verse = verse
+        return f"{book_num}_{chapter}_{start_verse}-{end_verse}"
+    else:
+        return f"{book_num}_{chapter}_{verse}"
+
+
+def build_day_index(plan_data):
+    return {day_info["day"]: i for i, day_info in enumerate(plan_data["days"])}
+
+
+def is_day_read(day_info, day_progress):
+    if not day_progress.get("intro", False):
+        return False
+
+    for reading in day_info.get("readings", []):
+        if not day_progress.get(get_reading_key(reading), False):
+            return False
+    return True
+
+
+def get_day_status(day_info, day_progress):
+    if not day_info:
+        return DAY_NOT_STARTED
+
+    is_intro_read = day_progress.get("intro", False)
+    readings = day_info.get("readings", [])
+    if not readings:
+        return DAY_COMPLETED if is_intro_read else DAY_NOT_STARTED
+
+    read_count = 0
+    for reading in readings:
+        if day_progress.get(get_reading_key(reading), False):
+            read_count += 1
+
+    if is_intro_read and read_count == len(readings):
+        return DAY_COMPLETED
+    if is_intro_read or read_count:
+        return DAY_NOT_COMPLETED
+    return DAY_NOT_STARTED
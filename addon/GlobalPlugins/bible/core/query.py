@@ -0,0 +1,336 @@
+import re
+from bisect import bisect_left
+
+from .index import WORD_PATTERN
+
+QUERY_TOKEN = re.compile(r'"[^"]*"?|\S+')
+BOOLEAN_TOKEN = re.compile(r'"[^"]*"?|[()]|[^\s()"]+')
+PROXIMITY_OPERATOR = re.compile(r"^(NEAR|PRE)/(\d+)$")
+BOOK_FILTER = re.compile(r"^book:((?:\d+(?:-\d+)?,?)+)$", re.IGNORECASE)
+BOOLEAN_OPERATORS = ("AND", "OR", "NOT")
+
+
+class QueryParseError(Exception):
+    pass
+
+
+# A parsed query is a tree of tuples:
+#   ("phrase", [terms], [words as typed])
+#   ("near", left, right, distance, ordered)
+#   ("book", {book indexes})
+#   ("and", [included nodes], [excluded nodes])
+#   ("or", [nodes])
+#   ("all",)
+def make_phrase(words):
+    return ("phrase", [word.casefold() for word in words], list(words))
+
+
+def parse_proximity_query(text):
+    node = None
+    operator = None
+    words = []
+
+    def flush_words():
+        nonlocal node, operator
+        if not words:
+            return
+        phrase = make_phrase(words)
+        words.clear()
+        if node is None:
+            node = phrase
+        elif operator is not None:
+            node = ("near", node, phrase, operator[0], operator[1])
+            operator = None
+        else:
+            raise QueryParseError(text)
+
+    for token in QUERY_TOKEN.findall(text):
+        match = PROXIMITY_OPERATOR.match(token)
+        if match:
+            flush_words()
+            if node is None or operator is not None:
+                raise QueryParseError(text)
+            operator = (int(match.group(2)), match.group(1) == "PRE")
+        elif token.startswith('"'):
+            flush_words()
+            words.extend(WORD_PATTERN.findall(token.strip('"')))
+            flush_words()
+        else:
+            words.extend(WORD_PATTERN.findall(token))
+    flush_words()
+
+    if node is None or operator is not None:
+        raise QueryParseError(text)
+    return node
+
+
+def get_query_words(text):
+    words = []
+    for token in QUERY_TOKEN.findall(text):
+        if not PROXIMITY_OPERATOR.match(token):
+            words.extend(WORD_PATTERN.findall(token))
+    return words
+
+
+def get_query_terms(text):
+    # The words a query searches for, without operators or book filters.
+    terms = []
+    for token in BOOLEAN_TOKEN.findall(text):
+        if token in BOOLEAN_OPERATORS or PROXIMITY_OPERATOR.match(token) or BOOK_FILTER.match(token):
+            continue
+        terms.extend(word.casefold() for word in WORD_PATTERN.findall(token))
+    return terms
+
+
+def spans_are_near(left_spans, right_spans, distance, ordered):
+    for left_start, left_end in left_spans:
+        for right_start, right_end in right_spans:
+            if 0 < right_start - left_end <= distance:
+                return (left_start, right_end)
+            if not ordered and 0 < left_start - right_end <= distance:
+                return (right_start, left_end)
+    return None
+
+
+def evaluate_proximity(index, node, candidates=None):
+    # Returns {verse id: [(first position, last position), ...]}.
+    if node[0] == "phrase":
+        return index.find_phrase(node[1], candidates)
+
+    _kind, left, right, distance, ordered = node
+    left_matches = evaluate_proximity(index, left, candidates)
+    if not left_matches:
+        return {}
+    right_matches = evaluate_proximity(index, right, left_matches.keys())
+    matches = {}
+    for verse_id, right_spans in right_matches.items():
+        span = spans_are_near(left_matches[verse_id], right_spans, distance, ordered)
+        if span:
+            matches[verse_id] = [span]
+    return matches
+
+
+def match_verse_ids(index, node):
+    # A single word needs no positions; its posting list is already the answer.
+    if node[0] == "phrase" and len(node[1]) == 1:
+        return list(index.get_verse_ids(node[1][0]))
+    return sorted(evaluate_proximity(index, node))
+
+
+class BooleanQueryParser:
+    # Grammar, from the loosest to the tightest binding:
+    #   query   := and_list ("OR" and_list)*
+    #   and_list := (["AND"] near | "NOT" near)+
+    #   near    := primary (("NEAR/n" | "PRE/n") primary)*
+    #   primary := word | "quoted phrase" | book:1,45-50 | "(" query ")"
+    def __init__(self, text):
+        self.text = text
+        self.tokens = BOOLEAN_TOKEN.findall(text)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        if token is None:
+            raise QueryParseError(self.text)
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QueryParseError(self.text)
+        return node
+
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and(self):
+        included = []
+        excluded = []
+        while self.peek() not in (None, ")", "OR"):
+            token = self.take()
+            if token == "NOT":
+                excluded.append(self.parse_near())
+            elif token == "AND":
+                if self.peek() in (None, ")", "OR", "AND"):
+                    raise QueryParseError(self.text)
+            else:
+                self.position -= 1
+                included.append(self.parse_near())
+        if not included and not excluded:
+            raise QueryParseError(self.text)
+        if not excluded and len(included) == 1:
+            return included[0]
+        return ("and", included or [("all",)], excluded)
+
+    def parse_near(self):
+        node = self.parse_primary()
+        while self.peek() is not None and PROXIMITY_OPERATOR.match(self.peek()):
+            match = PROXIMITY_OPERATOR.match(self.take())
+            right = self.parse_primary()
+            if node[0] not in ("phrase", "near") or right[0] not in ("phrase", "near"):
+                raise QueryParseError(self.text)
+            node = ("near", node, right, int(match.group(2)), match.group(1) == "PRE")
+        return node
+
+    def parse_primary(self):
+        token = self.take()
+        if token == "(":
+            node = self.parse_or()
+            if self.take() != ")":
+                raise QueryParseError(self.text)
+            return node
+        if token == ")" or token in BOOLEAN_OPERATORS or PROXIMITY_OPERATOR.match(token):
+            raise QueryParseError(self.text)
+        match = BOOK_FILTER.match(token)
+        if match:
+            return ("book", parse_book_numbers(match.group(1)))
+        words = WORD_PATTERN.findall(token.strip('"'))
+        if not words:
+            raise QueryParseError(self.text)
+        return make_phrase(words)
+
+
+def parse_book_numbers(text):
+    # Books are numbered from 1 in the order of the translation, e.g. book:40-43,45.
+    book_indexes = set()
+    for part in filter(None, text.split(",")):
+        first, _, last = part.partition("-")
+        first = int(first)
+        last = int(last) if last else first
+        if first < 1 or last < first:
+            raise QueryParseError(text)
+        book_indexes.update(range(first - 1, last))
+    return book_indexes
+
+
+def parse_boolean_query(text):
+    return BooleanQueryParser(text).parse()
+
+
+def get_node_words(node):
+    if node[0] == "phrase":
+        return node[2]
+    if node[0] == "near":
+        return get_node_words(node[1]) + get_node_words(node[2])
+    return []
+
+
+def slice_sorted(verse_ids, start, end):
+    return verse_ids[bisect_left(verse_ids, start):bisect_left(verse_ids, end)]
+
+
+def intersect_sorted(first, second):
+    # A range, e.g. from a book filter, cuts the other list down by bisection.
+    if isinstance(first, range):
+        return slice_sorted(second, first.start, first.stop)
+    if isinstance(second, range):
+        return slice_sorted(first, second.start, second.stop)
+    if len(first) > len(second):
+        first, second = second, first
+    if len(first) * 16 < len(second):
+        # Much shorter list: look each id up by bisection instead of walking both.
+        matches = []
+        low = 0
+        for verse_id in first:
+            low = bisect_left(second, verse_id, low)
+            if low == len(second):
+                break
+            if second[low] == verse_id:
+                matches.append(verse_id)
+        return matches
+    second = set(second)
+    return [verse_id for verse_id in first if verse_id in second]
+
+
+def union_sorted(lists):
+    merged = set()
+    for verse_ids in lists:
+        merged.update(verse_ids)
+    return sorted(merged)
+
+
+def difference_sorted(first, second):
+    if not isinstance(second, range):
+        second = set(second)
+    return [verse_id for verse_id in first if verse_id not in second]
+
+
+def get_book_ranges(index, book_indexes):
+    # Each book is one run of verse ids; books next to each other make one run.
+    ranges = []
+    for book_index in sorted(book_indexes):
+        if book_index >= len(index.books):
+            break
+        start, end = index.get_book_range(book_index)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        elif start < end:
+            ranges.append((start, end))
+    return ranges
+
+
+def estimate_size(index, node):
+    kind = node[0]
+    if kind == "phrase":
+        return min(len(index.get_verse_ids(term)) for term in node[1])
+    if kind == "near":
+        return min(estimate_size(index, node[1]), estimate_size(index, node[2]))
+    if kind == "book":
+        return sum(end - start for start, end in get_book_ranges(index, node[1]))
+    if kind == "and":
+        return min(estimate_size(index, child) for child in node[1])
+    if kind == "or":
+        return sum(estimate_size(index, child) for child in node[1])
+    return index.verse_count
+
+
+def evaluate_query(index, node, refine=None, candidates=None):
+    # Returns the sorted verse ids matching the node, limited to the sorted
+    # candidates when given. refine(node, verse_ids) may narrow the ids found
+    # for a word, phrase or NEAR leaf.
+    kind = node[0]
+    if kind in ("phrase", "near"):
+        if candidates is None:
+            verse_ids = match_verse_ids(index, node)
+        elif kind == "phrase" and len(node[1]) == 1:
+            verse_ids = intersect_sorted(index.get_verse_ids(node[1][0]), candidates)
+        else:
+            verse_ids = sorted(evaluate_proximity(index, node, candidates))
+        return refine(node, verse_ids) if refine is not None and verse_ids else verse_ids
+    if kind == "book":
+        ranges = get_book_ranges(index, node[1])
+        if candidates is not None:
+            verse_ids = []
+            for start, end in ranges:
+                verse_ids.extend(slice_sorted(candidates, start, end))
+            return verse_ids
+        # One run of books, e.g. book:40-43, stays a range; only separate runs are listed.
+        if len(ranges) == 1:
+            return range(*ranges[0])
+        return [verse_id for start, end in ranges for verse_id in range(start, end)]
+    if kind == "all":
+        return candidates if candidates is not None else range(index.verse_count)
+    if kind == "or":
+        return union_sorted(evaluate_query(index, child, refine, candidates) for child in node[1])
+
+    # The smallest list goes first; every later part is only checked against
+    # the verses that are still left.
+    included = sorted(node[1], key=lambda child: estimate_size(index, child))
+    verse_ids = candidates
+    for child in included:
+        verse_ids = evaluate_query(index, child, refine, verse_ids)
+        if not verse_ids:
+            return []
+    for child in node[2]:
+        verse_ids = difference_sorted(verse_ids, evaluate_query(index, child, refine, verse_ids))
+        if not verse_ids:
+            return []
+    return verse_ids
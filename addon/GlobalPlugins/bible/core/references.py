@@ -0,0 +1,80 @@
+import re
+
+from .text_store import get_text_store
+
+REFERENCE_PATTERN = re.compile(r"^(\w+)\.?\s*(\d+)(?:[,:]\s*(\d+)(?:-(\d+))?)?$")
+
+UNKNOWN_BOOK = "unknown_book"
+BOOK_NOT_AVAILABLE = "book_not_available"
+CHAPTER_NOT_FOUND = "chapter_not_found"
+VERSE_NOT_FOUND = "verse_not_found"
+END_VERSE_NOT_FOUND = "end_verse_not_found"
+INVALID_RANGE = "invalid_range"
+INVALID_FORMAT = "invalid_format"
+
+
+class ReferenceParseError(Exception):
+    def __init__(self, code, **details):
+        super().__init__(code)
+        self.code = code
+        self.details = details
+
+
+def parse_reference(verse_reference, book_abbreviations, bible_data):
+    match = REFERENCE_PATTERN.match(verse_reference)
+    if not match:
+        raise ReferenceParseError(INVALID_FORMAT)
+
+    book_abbr, chapter, verse_start, verse_end = match.groups()
+    book_abbr = book_abbr.lower()
+    if book_abbr not in book_abbreviations:
+        raise ReferenceParseError(UNKNOWN_BOOK, book_abbr=book_abbr)
+
+    store = get_text_store(bible_data)
+    book_index = book_abbreviations[book_abbr]
+    book_key = store.get_book_key(book_index)
+    if book_key is None:
+        raise ReferenceParseError(BOOK_NOT_AVAILABLE, book_abbr=book_abbr)
+
+    chapter_data = bible_data[book_key].get(chapter)
+    if chapter_data is None:
+        raise ReferenceParseError(CHAPTER_NOT_FOUND, chapter=chapter, book=book_key)
+
+    if not verse_start:
+        return book_index, int(chapter), 1, 1
+
+    verse_start_int = int(verse_start)
+    if str(verse_start_int) not in chapter_data:
+        raise ReferenceParseError(
+            VERSE_NOT_FOUND, verse=verse_start_int, book=book_key, chapter=chapter
+        )
+
+    verse_end_int = verse_start_int
+    if verse_end:
+        verse_end_int = int(verse_end)
+        if str(verse_end_int) not in chapter_data:
+            raise ReferenceParseError(
+                END_VERSE_NOT_FOUND, verse=verse_end_int, book=book_key, chapter=chapter
+            )
+        if verse_start_int > verse_end_int:
+            raise ReferenceParseError(INVALID_RANGE)
+
+    return book_index, int(chapter), verse_start_int, verse_end_int
+
+
+def format_short_reference(ref, book_names):
+    parts = ref.split(".")
+    if len(parts) < 3:
+        return ref
+    try:
+        book_idx = int(parts[0])
+    except ValueError:
+        return ref
+    if 0 <= book_idx < len(book_names):
+        return f"{book_names[book_idx]} {parts[1]}:{parts[2]}"
+    return ref
+
+
+def reference_sort_key(ref):
+    parts = ref.split(".")
+    return int(parts[0]), int(parts[1]), int(parts[2].split("-")[0])
@@ -0,0 +1,157 @@
+import re
+from array import array
+from bisect import bisect_right
+
+# Verses are joined with this character. It is whitespace, so word boundaries
+# and str.split() see the verse edges the same way in the buffer.
+SEPARATOR = "\n"
+
+# Patterns that can tell the buffer from a single verse: they look past the
+# verse edges or anchor to the start or end of the whole string.
+EDGE_SENSITIVE = re.compile(r"\\[AZz]|\(\?[=!<]")
+
+# Each hit costs a step of the sweep. Once at least one verse in
+# DENSE_HIT_RATIO has hits, the remaining verses are tested one by one.
+MIN_DENSE_HITS = 64
+DENSE_HIT_RATIO = 4
+
+
+class ScanBuffer:
+    # The whole translation as one string with the start offset of each verse,
+    # so a search is one str.find or regex sweep instead of a loop over verses.
+    def __init__(self, bible_data):
+        self.bible_data = bible_data
+        self.refs = []
+        self.book_ranges = {}
+        self.starts = array("I")
+        parts = []
+        offset = 0
+        for book_name, chapters in bible_data.items():
+            first = len(self.refs)
+            for chapter, verses in chapters.items():
+                for verse, text in verses.items():
+                    self.refs.append((book_name, chapter, verse))
+                    self.starts.append(offset)
+                    parts.append(text)
+                    offset += len(text) + 1
+            self.book_ranges[book_name] = (first, len(self.refs))
+        # One more start past the end, so verse i always ends at starts[i + 1] - 1.
+        self.starts.append(offset)
+        self.text = SEPARATOR.join(parts)
+        # A verse with a line break of its own would split where it should not.
+        self.has_separator = self.text.count(SEPARATOR) > max(len(self.refs) - 1, 0)
+
+    def get_verse(self, verse_id):
+        return self.text[self.starts[verse_id]:self.starts[verse_id + 1] - 1]
+
+    def get_ranges(self, book_names):
+        for book_name in book_names:
+            verse_range = self.book_ranges.get(book_name)
+            if verse_range and verse_range[1] > verse_range[0]:
+                yield verse_range
+
+    def get_verse_id(self, position, next_id):
+        # position is at or after the start of verse next_id. Hits in common
+        # words are often in the very next verse, which saves the bisect.
+        starts = self.starts
+        if position < starts[next_id + 1]:
+            return next_id
+        return bisect_right(starts, position, next_id) - 1
+
+    def is_dense(self, hits, scanned):
+        return hits >= MIN_DENSE_HITS and scanned < hits * DENSE_HIT_RATIO
+
+    def find_text(self, book_names, search_text, whole_word=False):
+        # With whole_word the text must be a whole whitespace-separated word, as str.split() gives them.
+        if whole_word:
+            matches = lambda verse_text: search_text in verse_text.split()
+        else:
+            matches = lambda verse_text: search_text in verse_text
+        if not search_text or SEPARATOR in search_text or (whole_word and search_text.split() != [search_text]):
+            return self.filter_verses(book_names, matches)
+        text = self.text
+        starts = self.starts
+        refs = self.refs
+        length = len(search_text)
+        found = []
+        scanned = 0
+        for first, end in self.get_ranges(book_names):
+            if self.is_dense(len(found), scanned):
+                found.extend(self.filter_range(first, end, matches))
+                continue
+            scanned += end - first
+            position = starts[first]
+            end_position = starts[end] - 1
+            next_id = first
+            while True:
+                position = text.find(search_text, position, end_position)
+                if position == -1:
+                    break
+                if whole_word and not (
+                    (position == 0 or text[position - 1].isspace())
+                    and (position + length == len(text) or text[position + length].isspace())
+                ):
+                    position += 1
+                    continue
+                next_id = self.get_verse_id(position, next_id) + 1
+                found.append(refs[next_id - 1])
+                if self.is_dense(len(found), scanned - (end - next_id)):
+                    found.extend(self.filter_range(next_id, end, matches))
+                    break
+                # One hit is enough; carry on from the next verse.
+                position = starts[next_id]
+        return found
+
+    def find_pattern(self, book_names, pattern, prefix=""):
+        # pattern should be compiled with re.MULTILINE, so ^ and $ match at the
+        # verse edges. A match that runs over the separator into the next verse
+        # is checked again against its verse alone. With a prefix that every
+        # match starts with, str.find looks for the next place to try a match.
+        if self.has_separator or EDGE_SENSITIVE.search(pattern.pattern):
+            return self.filter_verses(book_names, pattern.search)
+        text = self.text
+        starts = self.starts
+        refs = self.refs
+        search = pattern.search
+        found = []
+        scanned = 0
+        for first, end in self.get_ranges(book_names):
+            if self.is_dense(len(found), scanned):
+                found.extend(self.filter_range(first, end, search))
+                continue
+            scanned += end - first
+            position = starts[first]
+            end_position = starts[end] - 1
+            next_id = first
+            while position <= end_position:
+                if prefix:
+                    position = text.find(prefix, position, end_position)
+                    if position == -1:
+                        break
+                    match = pattern.match(text, position, end_position)
+                    if match is None:
+                        position += 1
+                        continue
+                else:
+                    match = search(text, position, end_position)
+                    if match is None:
+                        break
+                verse_id = self.get_verse_id(match.start(), next_id)
+                next_id = verse_id + 1
+                position = starts[next_id]
+                if match.end() < position or search(self.get_verse(verse_id)):
+                    found.append(refs[verse_id])
+                    if self.is_dense(len(found), scanned - (end - next_id)):
+                        found.extend(self.filter_range(next_id, end, search))
+                        break
+        return found
+
+    def filter_verses(self, book_names, matches):
+        found = []
+        for first, end in self.get_ranges(book_names):
+            found.extend(self.filter_range(first, end, matches))
+        return found
+
+    def filter_range(self, first, end, matches):
+        bible_data = self.bible_data
+        return [ref for ref in self.refs[first:end] if matches(bible_data[ref[0]][ref[1]][ref[2]])]
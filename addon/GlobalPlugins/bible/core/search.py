@@ -0,0 +1,299 @@
+import re
+
+from .index import WORD_PATTERN
+from .normalize import fold_text
+from .stemmers import stem_word
+from .text_store import get_text_store
+from .query import (
+    parse_proximity_query, parse_boolean_query, match_verse_ids, evaluate_query,
+    get_query_words, get_query_terms, get_node_words
+)
+
+
+# Pattern syntax that lower_pattern() leaves alone: escapes and group
+# headers are copied as they are, the rest of the pattern is lowercased.
+PATTERN_SYNTAX = re.compile(r"\\.|\(\?(?:<[=!]|[:=!])?", re.DOTALL)
+# Escapes that name a character by its code or name, and group names,
+# inline flags or comments: lowercasing around them is not safe.
+UNSAFE_PATTERN_SYNTAX = re.compile(r"\\[xuUN0-9]|\(\?[^:=!<]|\(\?<[^=!]")
+REGEX_SPECIAL = set("\\.^$*+?{}[]()|")
+
+
+def lower_pattern(search_text):
+    # The text of a case-insensitive search is already lowercased, so a pattern
+    # with its letters lowercased finds the same verses without re.IGNORECASE.
+    # Without that flag the regex engine can jump to a literal prefix instead
+    # of trying every position. Returns None for patterns it cannot rewrite.
+    if UNSAFE_PATTERN_SYNTAX.search(search_text):
+        return None
+    parts = []
+    position = 0
+    for match in PATTERN_SYNTAX.finditer(search_text):
+        parts.append(search_text[position:match.start()].lower())
+        parts.append(match.group())
+        position = match.end()
+    parts.append(search_text[position:].lower())
+    lowered = "".join(parts)
+    if len(lowered) != len(search_text):
+        return None
+    try:
+        re.compile(lowered)
+    except re.error:
+        return None
+    return lowered
+
+
+def get_literal_prefix(pattern):
+    # The plain text every match of the pattern starts with, or "". str.find
+    # reaches it faster than the regex engine does.
+    if pattern.flags & re.IGNORECASE or "|" in pattern.pattern:
+        return ""
+    text = pattern.pattern
+    end = 0
+    while end < len(text) and text[end] not in REGEX_SPECIAL:
+        end += 1
+    # A quantifier may leave out the last letter, as in "loves?".
+    if end < len(text) and text[end] in "*?{":
+        end -= 1
+    return text[:end]
+
+
+def compile_pattern(search_text, case_sensitive=False, flags=0):
+    # Without case_sensitive the pattern runs on lowercased text, see get_search_data().
+    if case_sensitive:
+        return re.compile(search_text, flags)
+    lowered = lower_pattern(search_text)
+    if lowered is None:
+        # The pattern itself is not lowercased: that would turn e.g. \W into \w.
+        return re.compile(search_text, flags | re.IGNORECASE)
+    return re.compile(lowered, flags)
+
+
+def build_verse_matcher(search_text, whole_word=False, case_sensitive=False, use_regex=False):
+    # Without case_sensitive the matcher expects lowercased verse text, see get_search_data().
+    if use_regex:
+        return compile_pattern(search_text, case_sensitive).search
+
+    search_text_check = search_text if case_sensitive else search_text.lower()
+
+    if whole_word:
+        return lambda verse_text: search_text_check in verse_text.split()
+
+    return lambda verse_text: search_text_check in verse_text
+
+
+def get_search_data(bible_data, case_sensitive=False):
+    return bible_data if case_sensitive else get_text_store(bible_data).get_lowered_data()
+
+
+def search_verses(bible_data, book_names, search_text, whole_word=False, case_sensitive=False, use_regex=False):
+    buffer = get_text_store(bible_data).get_scan_buffer(case_sensitive)
+    return scan_verses(buffer, book_names, search_text, whole_word, case_sensitive, use_regex)
+
+
+def scan_verses(buffer, book_names, search_text, whole_word=False, case_sensitive=False, use_regex=False):
+    # Same results as build_verse_matcher() applied to each verse of the buffer.
+    if use_regex:
+        pattern = compile_pattern(search_text, case_sensitive, re.MULTILINE)
+        return buffer.find_pattern(book_names, pattern, get_literal_prefix(pattern))
+
+    search_text_check = search_text if case_sensitive else search_text.lower()
+    return buffer.find_text(book_names, search_text_check, whole_word)
+
+
+def build_words_check(words, fold=None):
+    if fold is not None:
+        folded_words = {fold(word) for word in words}
+        return lambda verse_text: folded_words <= {fold(word) for word in WORD_PATTERN.findall(verse_text)}
+    patterns = [
+        re.compile(r"(?<!\w)" + re.escape(word) + r"(?!\w)") for word in dict.fromkeys(words)
+    ]
+    return lambda verse_text: all(pattern.search(verse_text) for pattern in patterns)
+
+
+def get_case_fold(index, ignore_accents=False, word_forms=False):
+    # Case-sensitive searches that ignore accents or match word forms compare
+    # words folded (and stemmed) but with their case kept.
+    language = index.language
+    if word_forms:
+        return lambda word: stem_word(fold_text(word, language, keep_case=True), language)
+    if ignore_accents:
+        return lambda word: fold_text(word, language, keep_case=True)
+    return None
+
+
+def get_folded_buffer(bible_data, language="", case_sensitive=False, index=None):
+    # The index keeps the text folded without case; only case-sensitive
+    # searches, or a translation without an index, fold the Bible here.
+    if index is not None and not case_sensitive and index.language == language:
+        return index.get_folded_buffer()
+    return get_text_store(bible_data).get_scan_buffer(case_sensitive, language)
+
+
+def get_folded_data(bible_data, language="", case_sensitive=False, index=None):
+    if index is not None and not case_sensitive and index.language == language:
+        return index.get_folded_data()
+    return get_text_store(bible_data).get_folded_data(language, case_sensitive)
+
+
+def search_folded_verses(
+    bible_data, book_names, search_text, language="", whole_word=False, case_sensitive=False, index=None
+):
+    buffer = get_folded_buffer(bible_data, language, case_sensitive, index)
+    folded_text = fold_text(search_text, language, keep_case=case_sensitive)
+    return scan_verses(buffer, book_names, folded_text, whole_word=whole_word, case_sensitive=True)
+
+
+def filter_case_sensitive(bible_data, refs, search_text, fold=None):
+    # The index is case-folded; case-sensitive searches recheck each word in the verse text.
+    check = build_words_check(get_query_words(search_text), fold)
+    return [ref for ref in refs if check(bible_data[ref[0]][ref[1]][ref[2]])]
+
+
+def search_whole_words(
+    index, bible_data, book_names, search_text, case_sensitive=False, ignore_accents=False, word_forms=False
+):
+    fold = get_case_fold(index, ignore_accents, word_forms)
+    index = index.get_view(ignore_accents, word_forms)
+    node = parse_proximity_query(search_text)
+    book_indexes = index.get_book_indexes(book_names)
+    refs = [
+        index.get_ref(verse_id) for verse_id in match_verse_ids(index, node)
+        if index.get_book_index(verse_id) in book_indexes
+    ]
+    if case_sensitive:
+        refs = filter_case_sensitive(bible_data, refs, search_text, fold)
+    return refs
+
+
+def search_query(
+    index, bible_data, book_names, search_text, case_sensitive=False, ignore_accents=False, word_forms=False
+):
+    # Boolean queries such as: love AND (faith OR hope) NOT law book:45-50
+    fold = get_case_fold(index, ignore_accents, word_forms)
+    index = index.get_view(ignore_accents, word_forms)
+    node = parse_boolean_query(search_text)
+    refine = make_case_refine(index, bible_data, fold) if case_sensitive else None
+    book_indexes = index.get_book_indexes(book_names)
+    return [
+        index.get_ref(verse_id) for verse_id in evaluate_query(index, node, refine)
+        if index.get_book_index(verse_id) in book_indexes
+    ]
+
+
+def make_case_refine(index, bible_data, fold=None):
+    def refine(leaf, verse_ids):
+        check = build_words_check(get_node_words(leaf), fold)
+        return [
+            verse_id for verse_id in verse_ids
+            if check(get_verse_text(bible_data, index.get_ref(verse_id)))
+        ]
+    return refine
+
+
+def match_refs_by_index(
+    index, bible_data, refs, search_text, case_sensitive=False, ignore_accents=False, word_forms=False,
+    query_language=False
+):
+    # Evaluates the query only against the given verses: each posting list is
+    # intersected with them, so the cost follows the number of refs.
+    fold = get_case_fold(index, ignore_accents, word_forms)
+    index = index.get_view(ignore_accents, word_forms)
+    node = parse_boolean_query(search_text) if query_language else parse_proximity_query(search_text)
+    refine = make_case_refine(index, bible_data, fold) if case_sensitive else None
+    candidates = sorted(
+        verse_id for verse_id in (index.get_verse_id(ref) for ref in refs) if verse_id is not None
+    )
+    return set(index.get_refs(evaluate_query(index, node, refine, candidates)))
+
+
+def match_refs_by_text(bible_data, refs, search_text, whole_word=False, case_sensitive=False, use_regex=False):
+    matches = build_verse_matcher(search_text, whole_word, case_sensitive, use_regex)
+    search_data = get_search_data(bible_data, case_sensitive)
+    return {ref for ref in refs if matches(get_verse_text(search_data, ref))}
+
+
+def refine_results(refs, matching, exclude=False):
+    # Keeps the order of refs, e.g. a relevance order.
+    return [ref for ref in refs if (ref in matching) != exclude]
+
+
+def order_results(index, refs, search_text, by_relevance=True):
+    # Verses missing from the index (e.g. a changed translation) go last, in the order found.
+    verse_ids = []
+    missing = []
+    for ref in refs:
+        verse_id = index.get_verse_id(ref)
+        if verse_id is None:
+            missing.append(ref)
+        else:
+            verse_ids.append(verse_id)
+    if by_relevance:
+        verse_ids = index.rank_verse_ids(get_query_terms(search_text), verse_ids)
+    else:
+        verse_ids.sort()
+    return index.get_refs(verse_ids) + missing
+
+
+def get_verse_text(bible_data, ref):
+    return bible_data[ref[0]][ref[1]][ref[2]]
+
+
+def build_find_pattern(search_text, case_sensitive=False, whole_word=False):
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if whole_word:
+        return re.compile(r"\b" + re.escape(search_text) + r"\b", flags)
+    return re.compile(re.escape(search_text), flags)
+
+
+def find_in_text(text, search_text, start_pos, case_sensitive=False, whole_word=False, forward=True):
+    if not search_text:
+        return -1, False
+
+    if not whole_word:
+        text_check = text if case_sensitive else text.lower()
+        search_check = search_text if case_sensitive else search_text.lower()
+        if forward:
+            found_pos = text_check.find(search_check, start_pos + 1)
+            if found_pos != -1:
+                return found_pos, False
+            found_pos = text_check.find(search_check)
+        else:
+            found_pos = text_check.rfind(search_check, 0, start_pos)
+            if found_pos != -1:
+                return found_pos, False
+            found_pos = text_check.rfind(search_check)
+        return found_pos, found_pos != -1
+
+    pattern = build_find_pattern(search_text, case_sensitive, whole_word)
+    if forward:
+        match = pattern.search(text, start_pos + 1)
+        if match:
+            return match.start(), False
+        match = pattern.search(text)
+        return (match.start(), True) if match else (-1, False)
+
+    last_match = None
+    for match in pattern.finditer(text, 0, start_pos):
+        last_match = match
+    if last_match:
+        return last_match.start(), False
+    for match in pattern.finditer(text):
+        last_match = match
+    return (last_match.start(), True) if last_match else (-1, False)
+
+
+def find_in_items(get_item_text, count, start_index, search_text, case_sensitive=False, whole_word=False, forward=True):
+    if not count or not search_text:
+        return -1, False
+
+    pattern = build_find_pattern(search_text, case_sensitive, whole_word)
+    step = 1 if forward else -1
+    if start_index == -1:
+        start_index = -1 if forward else count
+    for offset in range(1, count + 1):
+        raw_index = start_index + step * offset
+        index = raw_index % count
+        if pattern.search(get_item_text(index)):
+            return index, raw_index != index
+    return -1, False
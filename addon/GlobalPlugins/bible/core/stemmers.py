@@ -0,0 +1,91 @@
+# Light suffix-stripping stemmers. They work on text folded by fold_text(),
+# so endings are written without accents (Polish "ów" is "ow" here). A stem
+# is only used to group word forms, never shown, so it need not be a real word.
+MIN_STEM_LENGTH = 3
+# Portuguese verb roots are often two letters long: am-ar, am-ado.
+MIN_STEM_LENGTHS = {"pt": 2}
+
+REFLEXIVE_ENDINGS = {
+    "ru": ("ся", "сь"),
+    "uk": ("ся", "сь"),
+    "be": ("ся", "цца"),
+}
+
+ENDINGS = {
+    "uk": (
+        "ами", "ями", "ого", "ому", "ими", "іми",
+        "ити", "ати", "іти", "яти", "ути", "ють", "уть", "ать", "ять", "ить", "емо", "ємо",
+        "имо", "ете", "єте", "ите", "ала", "ало", "али", "ила", "ило", "или",
+        "ах", "ях", "ам", "ям", "ом", "ем", "ою", "ею", "єю", "ів", "їв", "ей", "ий", "ій",
+        "их", "іх", "ім", "им", "ої", "ую", "юю", "ая", "яя", "ти", "ть", "ла", "ли", "ло",
+        "ив", "ав", "ує", "еш", "єш", "иш",
+        "а", "я", "о", "е", "є", "у", "ю", "і", "ї", "и", "ь",
+    ),
+    "ru": (
+        "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими", "ать", "ять", "ить",
+        "еть", "уть", "ешь", "ишь", "ете", "ите", "ала", "ало", "али", "ила", "ило", "или",
+        "ых", "их", "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее", "ую", "юю", "ом", "ем",
+        "ам", "ям", "ах", "ях", "ов", "ев", "ия", "ие", "ию", "ии", "ет", "ит", "ют", "ут",
+        "ат", "ят", "им", "ал", "ял", "ил", "ел", "ла", "ли", "ло", "ью",
+        "а", "я", "о", "е", "у", "ю", "ы", "и", "ь", "й",
+    ),
+    "be": (
+        "амі", "ямі", "ага", "ому", "ымі", "імі", "аць", "яць", "іць", "ець",
+        "ах", "ях", "ам", "ям", "ом", "ем", "ой", "ей", "ый", "ій", "ая", "яя", "ае", "ое",
+        "ую", "юю", "ых", "іх", "ым", "ім", "оў", "еў", "ла", "лі", "ло",
+        "а", "я", "о", "е", "у", "ю", "ы", "і", "ь", "й", "ў",
+    ),
+    "bg": (
+        "ията", "ието", "ищата", "ите", "ата", "ото", "ята", "ият", "ища", "ове", "еве",
+        "ах", "ях", "ше", "ха", "ме", "те", "ят", "ът", "та", "то", "ия", "ие",
+        "а", "я", "о", "е", "и", "ъ", "ш", "м",
+    ),
+    "pl": (
+        "ujecie", "ujemy", "owego", "owemu", "ami", "ach", "owi", "ego", "emu", "ymi", "imi",
+        "ych", "ich", "ala", "alo", "ali", "ila", "ilo", "ili", "uje", "uja", "esz", "emy",
+        "ecie", "iem", "om", "ow", "em", "ie", "ia", "iu", "ej", "ac", "ic", "yc", "ec", "al", "il",
+        "a", "e", "i", "o", "u", "y",
+    ),
+    "cs": (
+        "ujeme", "ujete", "ovat", "ami", "emi", "ech", "ich", "ych", "ovi", "ove", "eho",
+        "emu", "imu", "ymi", "imi", "uje", "ou", "um", "em", "im", "ym", "at", "it", "et",
+        "la", "li", "lo",
+        "a", "e", "i", "o", "u", "y", "l",
+    ),
+    "pt": (
+        "amentos", "imentos", "amento", "imento", "idades", "mente", "idade", "ismos",
+        "istas", "acoes", "aram", "eram", "iram", "avam", "ando", "endo", "indo", "ados",
+        "idos", "adas", "idas", "ismo", "ista", "acao", "ado", "ido", "ada", "ida",
+        "ar", "er", "ir", "ou", "eu", "iu", "as", "es", "os",
+        "a", "e", "o", "s",
+    ),
+    "en": (
+        "ingly", "edly", "ings", "eth", "est", "ing", "ies", "ied", "ed", "es", "ly", "'s",
+        "s", "e", "y",
+    ),
+}
+
+# The longest matching ending is removed first.
+ENDINGS = {
+    language: tuple(sorted(set(endings), key=len, reverse=True)) for language, endings in ENDINGS.items()
+}
+
+
+def strip_ending(word, endings, min_length=MIN_STEM_LENGTH):
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= min_length:
+            return word[:-len(ending)]
+    return word
+
+
+def stem_word(word, language):
+    endings = ENDINGS.get(language)
+    if endings is None:
+        return word
+    min_length = MIN_STEM_LENGTHS.get(language, MIN_STEM_LENGTH)
+    word = strip_ending(word, REFLEXIVE_ENDINGS.get(language, ()), min_length)
+    return strip_ending(word, endings, min_length).rstrip("'")
+
+
+def has_stemmer(language):
+    return language in ENDINGS
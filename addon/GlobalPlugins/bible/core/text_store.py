@@ -0,0 +1,211 @@
+from bisect import bisect_right
+from collections import OrderedDict
+
+from .normalize import fold_bible_data
+from .scan import ScanBuffer
+
+# Translations are large; a handful of stores covers every open tab and plan.
+MAX_CACHED_STORES = 8
+
+_stores = OrderedDict()
+
+
+def get_text_store(bible_data):
+    key = id(bible_data)
+    store = _stores.get(key)
+    if store is not None and store.bible_data is bible_data:
+        _stores.move_to_end(key)
+        return store
+
+    store = TextStore(bible_data)
+    _stores[key] = store
+    while len(_stores) > MAX_CACHED_STORES:
+        _stores.popitem(last=False)
+    return store
+
+
+def clear_text_stores():
+    _stores.clear()
+
+
+def split_reference(ref):
+    parts = ref.split(".")
+    if len(parts) < 3:
+        return None
+    try:
+        book_idx = int(parts[0])
+    except ValueError:
+        return None
+    return book_idx, parts[1], parts[2]
+
+
+def parse_verse_range(verse_part):
+    if "-" in verse_part:
+        start, end = verse_part.split("-", 1)
+        return int(start), int(end)
+    verse = int(verse_part)
+    return verse, verse
+
+
+class TextStore:
+    def __init__(self, bible_data):
+        self.bible_data = bible_data or {}
+        self.books = list(self.bible_data.keys())
+        self.book_indexes = {book: index for index, book in enumerate(self.books)}
+        self.sorted_chapters = {}
+        self.folded_data = {}
+        self.lowered_data = None
+        self.scan_buffers = {}
+
+    def get_folded_data(self, language="", keep_case=False):
+        # Accent-insensitive substring searches scan this copy of the text, folded once.
+        key = (language, keep_case)
+        data = self.folded_data.get(key)
+        if data is None:
+            data = self.folded_data[key] = fold_bible_data(self.bible_data, language, keep_case)
+        return data
+
+    def get_lowered_data(self):
+        # Case-insensitive searches scan this lowercased copy instead of lowering every verse per query.
+        if self.lowered_data is None:
+            self.lowered_data = {
+                book_name: {
+                    chapter: {verse: text.lower() for verse, text in verses.items()}
+                    for chapter, verses in chapters.items()
+                }
+                for book_name, chapters in self.bible_data.items()
+            }
+        return self.lowered_data
+
+    def get_scan_buffer(self, case_sensitive=True, language=None):
+        # With a language, the buffer holds the text folded for it (see get_folded_data).
+        key = (case_sensitive, language)
+        buffer = self.scan_buffers.get(key)
+        if buffer is None:
+            if language is not None:
+                data = self.get_folded_data(language, case_sensitive)
+            elif case_sensitive:
+                data = self.bible_data
+            else:
+                data = self.get_lowered_data()
+            buffer = self.scan_buffers[key] = ScanBuffer(data)
+        return buffer
+
+    def get_book_key(self, book_idx):
+        if 0 <= book_idx < len(self.books):
+            return self.books[book_idx]
+        return None
+
+    def get_book_index(self, book_key):
+        return self.book_indexes.get(book_key)
+
+    def get_chapters(self, book_key):
+        chapters = self.sorted_chapters.get(book_key)
+        if chapters is None:
+            chapters = sorted(self.bible_data.get(book_key, {}).keys(), key=int)
+            self.sorted_chapters[book_key] = chapters
+        return chapters
+
+    def get_chapter(self, book_idx, chapter):
+        book_key = self.get_book_key(book_idx)
+        if book_key is None:
+            return None
+        return self.bible_data[book_key].get(str(chapter))
+
+    def is_valid_reference(self, ref):
+        parsed = split_reference(ref)
+        if parsed is None:
+            return False
+        book_idx, chapter, verse_part = parsed
+        chapter_data = self.get_chapter(book_idx, chapter)
+        if chapter_data is None:
+            return False
+        try:
+            verse_start, _verse_end = parse_verse_range(verse_part)
+        except ValueError:
+            return False
+        if "-" in verse_part:
+            return str(verse_start) in chapter_data
+        return verse_part in chapter_data
+
+    def get_verse_text(self, ref, include_verse_number=False):
+        parsed = split_reference(ref)
+        if parsed is None:
+            return ""
+        book_idx, chapter, verse_part = parsed
+        chapter_data = self.get_chapter(book_idx, chapter)
+        if not chapter_data:
+            return ""
+        try:
+            verse_start, verse_end = parse_verse_range(verse_part)
+        except ValueError:
+            return ""
+
+        verses = []
+        for verse in range(verse_start, verse_end + 1):
+            verse_text = chapter_data.get(str(verse))
+            if verse_text is None:
+                continue
+            if include_verse_number:
+                verses.append(f"{verse}. {verse_text}")
+            else:
+                verses.append(verse_text)
+        return "\n".join(verses)
+
+    def get_chapter_text(self, book_idx, chapter, include_verse_numbers=True):
+        chapter_data = self.get_chapter(book_idx, chapter)
+        if not chapter_data:
+            return ""
+        if include_verse_numbers:
+            return "\n".join(f"{verse}. {text}" for verse, text in chapter_data.items())
+        return "\n".join(chapter_data.values())
+
+
+# Some rich edit controls count a line break as two positions; callers pass
+# newline_width=2 for those so offsets match the control's insertion points.
+def get_line_starts(text, newline_width=1):
+    line_starts = [0]
+    extra = newline_width - 1
+    position = text.find("\n")
+    while position != -1:
+        line_starts.append(position + 1 + extra * len(line_starts))
+        position = text.find("\n", position + 1)
+    return line_starts
+
+
+def get_line_number(line_starts, position):
+    return max(1, bisect_right(line_starts, position))
+
+
+def get_line_at(text, position):
+    start = text.rfind("\n", 0, position) + 1
+    end = text.find("\n", position)
+    if end == -1:
+        end = len(text)
+    return text[start:end]
+
+
+def find_verse_line(text, verse_number):
+    # Verses are counted over non-blank lines.
+    verse_count = 0
+    line_index = 0
+    line_start = 0
+    while True:
+        line_end = text.find("\n", line_start)
+        line = text[line_start:] if line_end == -1 else text[line_start:line_end]
+        if line.strip():
+            verse_count += 1
+            if verse_count == verse_number:
+                return line_index, line_start, line
+        if line_end == -1:
+            return -1, -1, None
+        line_start = line_end + 1
+        line_index += 1
+
+
+def get_verse_position(text, verse_number, newline_width=1):
+    line_index, line_start, _line = find_verse_line(text, verse_number)
+    if line_index == -1:
+        line_index = text.count("\n")
+        line_start = text.rfind("\n") + 1
+    return line_start + (newline_width - 1) * line_index
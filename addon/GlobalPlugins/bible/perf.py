@@ -0,0 +1,129 @@
+import datetime
+import functools
+import threading
+import time
+from collections import deque
+
+# Only the newest samples of each timer are kept for the percentiles.
+MAX_SAMPLES = 500
+
+enabled = False
+
+_lock = threading.Lock()
+_timers = {}
+
+
+class TimerStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        self.samples.append(seconds)
+
+
+def set_enabled(value):
+    global enabled
+    enabled = bool(value)
+
+
+def record(name, seconds):
+    with _lock:
+        stats = _timers.get(name)
+        if stats is None:
+            stats = _timers[name] = TimerStats()
+        stats.add(seconds)
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+
+
+class timed:
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter() if enabled else None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.start is not None:
+            record(self.name, time.perf_counter() - self.start)
+        return False
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return wrapper
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def get_stats():
+    with _lock:
+        snapshot = {
+            name: (stats.count, stats.total, stats.maximum, sorted(stats.samples))
+            for name, stats in _timers.items()
+        }
+
+    result = {}
+    for name, (count, total, maximum, samples) in sorted(snapshot.items()):
+        result[name] = {
+            "count": count,
+            "total_ms": total * 1000,
+            "mean_ms": total * 1000 / count if count else 0.0,
+            "p50_ms": percentile(samples, 0.5) * 1000,
+            "p90_ms": percentile(samples, 0.9) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+            "max_ms": maximum * 1000,
+        }
+    return result
+
+
+def format_report():
+    stats = get_stats()
+    lines = [f"Bible performance report {datetime.datetime.now().isoformat(timespec='seconds')}"]
+    if not stats:
+        lines.append("No timings recorded.")
+        return "\n".join(lines)
+
+    lines.append(
+        f"{'timer':32} {'count':>7} {'mean ms':>10} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}"
+    )
+    for name, values in stats.items():
+        lines.append(
+            f"{name:32} {values['count']:7d} {values['mean_ms']:10.2f} {values['p50_ms']:10.2f} "
+            f"{values['p90_ms']:10.2f} {values['p99_ms']:10.2f} {values['max_ms']:10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def dump(path):
+    report = format_report()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(report + "\n\n")
+    return report
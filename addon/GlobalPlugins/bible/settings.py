@@ -1,17 +1,18 @@
-import tempfile
-import zipfile
 import shutil
-import pickle
 import re
 import datetime
+import hashlib
+import threading
+from collections import OrderedDict
 import globalVars
 import languageHandler
 import json
 import os
-import requests
 import wx
 import ui
 import addonHandler
+from . import perf
+from .ai_cache import AiSearchCache
 
 addonHandler.initTranslation()
 
@@ -19,24 +20,45 @@ user_config_dir = globalVars.appArgs.configPath
 settings_file = os.path.join(user_config_dir, 'bible.json')
 TRANSLATIONS_PATH = os.path.join(user_config_dir, "bibleData/translations")
 PLANS_PATH = os.path.join(user_config_dir, "bibleData/plans")
+PERFORMANCE_LOG_FILE = os.path.join(user_config_dir, "bibleData", "performance.log")
+LAST_CHAPTER_FILE = os.path.join(user_config_dir, "bibleData", "last_chapter.json")
+AI_SEARCH_CACHE_FILE = os.path.join(user_config_dir, "bibleData", "ai_search_cache.json")
 plugin_dir = os.path.dirname(__file__)
 BOOK_ABBREVIATIONS_FILE = os.path.join(plugin_dir, "book_abbreviations.json")
 
 BIBLE_FILE = "bible.pkl"
 CROSS_REFERENCES_FILE = "cross_references.pkl"
+SEARCH_INDEX_FILE = "search_index.pkl"
+
+PLAN_DOWNLOAD_WORKERS = 4
+PLAN_SYNC_DOWNLOADED = "downloaded"
+PLAN_SYNC_UP_TO_DATE = "up_to_date"
+PLAN_SYNC_NOT_FOUND = "not_found"
+PLAN_SYNC_FAILED = "failed"
+
+# Cached translations are dropped after the Bible window has been closed or
+# hidden for this long.
+DEFAULT_CACHE_IDLE_MINUTES = 10
+
+# Parsed plans, local or read from GitHub, are kept while they stay under this total size.
+MAX_PLAN_CACHE_BYTES = 8 * 1024 * 1024
 
 
 class Settings:
     _instance = None
+    # The first Settings() may run on the update thread while the user opens the window.
+    _lock = threading.RLock()
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(Settings, cls).__new__(cls)
-        return cls._instance
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(Settings, cls).__new__(cls)
+            return cls._instance
 
     def __init__(self):
-        if not hasattr(self, 'initialized'):
-            self.initialized = True
+        with Settings._lock:
+            if hasattr(self, 'initialized'):
+                return
             self.rename_cache_files()
 
             self.settings_file = settings_file
@@ -46,11 +68,20 @@ class Settings:
             self.github_plans_cache = {}
             self.github_translations_cache = {}
             self.cross_references_cache = {}
-            self.plan_cache = {}
+            # plan name -> (file mtime, size in bytes, plan data); the mtime is
+            # None for plans read from GitHub and not downloaded.
+            self.plan_cache = OrderedDict()
+            self.plan_cache_bytes = 0
+            self.ai_search_cache = AiSearchCache(AI_SEARCH_CACHE_FILE)
+            self.ai_client = None
+            self.search_index_cache = {}
+            self.search_index_lock = threading.Lock()
             self.load_settings()
+            perf.set_enabled(self.get_setting("performance_log", False))
             self.load_available_translations()
             self.load_available_plans()
             self.translation_mapping = self.load_available_translations_mapping()
+            self.initialized = True
 
     def rename_cache_files(self):
         if not os.path.exists(TRANSLATIONS_PATH):
@@ -124,6 +155,7 @@ class Settings:
             self.convert_translation_json_to_pickle(translation)
 
     def convert_translation_json_to_pickle(self, translation_name):
+        import pickle
         translation_path = os.path.join(TRANSLATIONS_PATH, translation_name)
 
         if not os.path.isdir(translation_path):
@@ -215,6 +247,7 @@ class Settings:
             }
             self.save_settings()
 
+    @perf.timed("settings_save")
     def save_settings(self):
         with open(self.settings_file, 'w', encoding='utf-8') as f:
             json.dump(self.settings, f, indent=4)
@@ -303,6 +336,7 @@ class Settings:
                 plan_path = os.path.join(PLANS_PATH, f"{name}.json")
                 if os.path.exists(plan_path):
                     os.remove(plan_path)
+                self.invalidate_plan_cache(name)
                 self.remove_reading_plan_progress(name)
             except Exception:
                 success = False
@@ -310,16 +344,55 @@ class Settings:
         self.load_available_plans()
         return success
 
+    def get_plan_file_key(self, plan_name):
+        # (mtime in ns, size) of the plan file, None if it is missing. The
+        # same key tells the plan cache and the open plan panel that the file changed.
+        try:
+            stat = os.stat(os.path.join(PLANS_PATH, f"{plan_name}.json"))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def get_reading_plan_data(self, plan_name):
+        # The parsed plan is shared by every caller and must not be modified.
+        plan_path = os.path.join(PLANS_PATH, f"{plan_name}.json")
+        key = self.get_plan_file_key(plan_name)
+        if key is None:
+            self.invalidate_plan_cache(plan_name)
+            return None
+
+        # The plan download worker invalidates entries while the window reads them.
+        with Settings._lock:
+            cached = self.plan_cache.get(plan_name)
+            if cached and cached[:2] == key:
+                self.plan_cache.move_to_end(plan_name)
+                return cached[2]
+
         try:
-            plan_path = os.path.join(PLANS_PATH, f"{plan_name}.json")
-            if not os.path.exists(plan_path):
-                return None
-            with open(plan_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with perf.timed("plan_load"), open(plan_path, 'r', encoding='utf-8') as f:
+                plan_data = json.load(f)
         except Exception:
+            self.invalidate_plan_cache(plan_name)
             return None
 
+        self.cache_plan(plan_name, key[0], key[1], plan_data)
+        return plan_data
+
+    def cache_plan(self, plan_name, mtime, size, plan_data):
+        with Settings._lock:
+            self.invalidate_plan_cache(plan_name)
+            self.plan_cache[plan_name] = (mtime, size, plan_data)
+            self.plan_cache_bytes += size
+            while self.plan_cache_bytes > MAX_PLAN_CACHE_BYTES and len(self.plan_cache) > 1:
+                unused_name, evicted = self.plan_cache.popitem(last=False)
+                self.plan_cache_bytes -= evicted[1]
+
+    def invalidate_plan_cache(self, plan_name):
+        with Settings._lock:
+            cached = self.plan_cache.pop(plan_name, None)
+            if cached:
+                self.plan_cache_bytes -= cached[1]
+
     def get_current_reading_plan(self):
         return self.get_setting("current_reading_plan")
 
@@ -337,94 +410,161 @@ class Settings:
         self.set_setting("plan_progress", plan_progress)
         self.save_settings()
 
+    @perf.timed("network.plan_list")
+    def get_github_plan_files(self):
+        import requests
+        repo_owner = "Halimon-Alexandr"
+        repo_name = "nvda-bible-plugin"
+        branch = "master"
+        current_lang = languageHandler.getLanguage().split('_')[0].lower()
+
+        api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans?ref={branch}"
+        response = requests.get(api_url, timeout=10)
+        if response.status_code != 200:
+            return None
+        folders = response.json()
+        available_lang_folders = [
+            folder['name']
+            for folder in folders
+            if folder['type'] == 'dir'
+        ]
+        selected_lang = current_lang if current_lang in available_lang_folders else 'en'
+
+        api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans/{selected_lang}?ref={branch}"
+        response = requests.get(api_url, timeout=10)
+        if response.status_code != 200:
+            return None
+        return [
+            file_info for file_info in response.json()
+            if file_info['name'].endswith('.json')
+        ]
+
     def load_available_plans_from_github(self):
         current_lang = languageHandler.getLanguage().split('_')[0].lower()
         if current_lang in self.github_plans_cache:
             return self.github_plans_cache[current_lang]
 
         try:
-            repo_owner = "Halimon-Alexandr"
-            repo_name = "nvda-bible-plugin"
-            branch = "master"
-            api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans?ref={branch}"
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200:
-                return []
-            folders = response.json()
-            available_lang_folders = [
-                folder['name']
-                for folder in folders
-                if folder['type'] == 'dir'
-            ]
-            selected_lang = current_lang if current_lang in available_lang_folders else 'en'
-            api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans/{selected_lang}?ref={branch}"
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200:
+            files = self.get_github_plan_files()
+            if files is None:
                 return []
-            files = response.json()
-            github_plans = [
-                file['name'].replace('.json', '')
-                for file in files
-                if file['name'].endswith('.json')
-            ]
+            github_plans = [file_info['name'][:-len('.json')] for file_info in files]
             github_plans.sort()
-            self.github_plans_cache[selected_lang] = github_plans
+            self.github_plans_cache[current_lang] = github_plans
             return github_plans
         except Exception:
             return []
 
-    def download_reading_plan(self, plan_names):
+    def get_git_blob_sha(self, path):
+        with open(path, 'rb') as f:
+            return self.get_git_blob_sha_of(f.read())
+
+    def get_git_blob_sha_of(self, data):
+        return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+    @perf.timed("network.plan_download")
+    def fetch_plan_file(self, plan_name, download_url, expected_sha=None):
+        import requests
+        plan_path = os.path.join(PLANS_PATH, f"{plan_name}.json")
+        tmp_path = plan_path + ".part"
+        try:
+            response = requests.get(download_url, timeout=20)
+            if response.status_code != 200:
+                return False
+            # A truncated file or an HTML error page must not replace a good plan;
+            # its SHA would then match nothing and it would never be fixed.
+            if expected_sha and self.get_git_blob_sha_of(response.content) != expected_sha:
+                print("[PLAN DOWNLOAD ERROR]", plan_name, "checksum mismatch")
+                return False
+            json.loads(response.content.decode('utf-8'))
+            with open(tmp_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_path, plan_path)
+            return True
+        except Exception as e:
+            print("[PLAN DOWNLOAD ERROR]", plan_name, e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def sync_reading_plans(self, plan_names, progress_callback=None, cancel_event=None):
+        from concurrent.futures import ThreadPoolExecutor, as_completed
         if isinstance(plan_names, str):
             targets = [plan_names]
         else:
-            targets = plan_names
+            targets = list(plan_names)
 
+        results = {name: PLAN_SYNC_FAILED for name in targets}
         try:
-            repo_owner = "Halimon-Alexandr"
-            repo_name = "nvda-bible-plugin"
-            branch = "master"
-            current_lang = languageHandler.getLanguage().split('_')[0].lower()
+            files = self.get_github_plan_files()
+        except Exception:
+            files = None
+        if files is None:
+            return results
+
+        remote_files = {
+            file_info['name'][:-len('.json')]: file_info
+            for file_info in files
+            if file_info['name'][:-len('.json')] in results
+        }
 
-            api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans?ref={branch}"
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200: return False
-            
-            folders = response.json()
-            available_langs = [f['name'] for f in folders if f['type'] == 'dir']
-            selected_lang = current_lang if current_lang in available_langs else 'en'
+        os.makedirs(PLANS_PATH, exist_ok=True)
+        outdated = {}
+        for name in targets:
+            file_info = remote_files.get(name)
+            if not file_info:
+                results[name] = PLAN_SYNC_NOT_FOUND
+                continue
+            plan_path = os.path.join(PLANS_PATH, f"{name}.json")
+            try:
+                is_current = (
+                    os.path.exists(plan_path) and
+                    file_info.get('sha') == self.get_git_blob_sha(plan_path)
+                )
+            except OSError:
+                is_current = False
+            if is_current:
+                results[name] = PLAN_SYNC_UP_TO_DATE
+            else:
+                outdated[name] = (file_info['download_url'], file_info.get('sha'))
 
-            api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans/{selected_lang}?ref={branch}"
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200: return False
+        for name in targets:
+            if name not in outdated and progress_callback:
+                progress_callback(name, results[name])
+
+        if outdated:
+            with ThreadPoolExecutor(max_workers=PLAN_DOWNLOAD_WORKERS) as executor:
+                futures = {
+                    executor.submit(self.fetch_plan_file, name, url, sha): name
+                    for name, (url, sha) in outdated.items()
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    if future.result():
+                        results[name] = PLAN_SYNC_DOWNLOADED
+                        # Runs on the sync worker: both take the Settings lock the window also takes.
+                        with Settings._lock:
+                            self.invalidate_plan_cache(name)
+                            self.remove_plan_frontier(name)
+                    if progress_callback:
+                        progress_callback(name, results[name])
+                    if cancel_event is not None and cancel_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
 
-            files = response.json()
-            download_map = {
-                file['name'].replace('.json', ''): file['download_url']
-                for file in files if file['name'].replace('.json', '') in targets
-            }
+            self.load_available_plans()
 
-            if not download_map: return False
+        return results
 
-            success_count = 0
-            for name, url in download_map.items():
-                plan_response = requests.get(url, timeout=20)
-                if plan_response.status_code == 200:
-                    plan_data = plan_response.json()
-                    plan_path = os.path.join(PLANS_PATH, f"{name}.json")
-                    
-                    os.makedirs(os.path.dirname(plan_path), exist_ok=True)
-                    with open(plan_path, 'w', encoding='utf-8') as f:
-                        json.dump(plan_data, f, ensure_ascii=False, indent=4)
-                    
-                    self.plan_cache[name] = plan_data
-                    success_count += 1
-
-            self.load_available_plans()
-            return success_count > 0
-        except Exception:
-            return False
+    def download_reading_plan(self, plan_names):
+        results = self.sync_reading_plans(plan_names)
+        return any(
+            status in (PLAN_SYNC_DOWNLOADED, PLAN_SYNC_UP_TO_DATE)
+            for status in results.values()
+        )
 
     def load_available_translations(self):
+        import requests
         if hasattr(self, 'github_translations_cache') and self.github_translations_cache:
             return self.available_translations
 
@@ -434,7 +574,8 @@ class Settings:
             folder_path = "translations"
             branch = "master"
             api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{folder_path}?ref={branch}"
-            response = requests.get(api_url, timeout=10)
+            with perf.timed("network.translation_list"):
+                response = requests.get(api_url, timeout=10)
             github_translations = []
             if response.status_code == 200:
                 files = response.json()
@@ -498,7 +639,11 @@ class Settings:
     def download_translation(self, translation_name):
         return self.download_translations_bulk([translation_name])
 
+    @perf.timed("network.translation_download")
     def download_translations_bulk(self, translation_names):
+        import requests
+        import tempfile
+        import zipfile
         try:
             repo_owner = "Halimon-Alexandr"
             repo_name = "nvda-bible-plugin"
@@ -548,6 +693,12 @@ class Settings:
                         shutil.copytree(content_dir, translation_path)
 
                         self.convert_translation_json_to_pickle(name)
+                        # The search index is built now so the first search does not wait
+                        # for it; the text it was built from is loaded again when needed.
+                        self.bible_cache.pop(name, None)
+                        self.search_index_cache.pop(name, None)
+                        self.build_search_index(name)
+                        self.bible_cache.pop(name, None)
                         
                         if name not in self.local_translations:
                             self.local_translations.append(name)
@@ -562,6 +713,7 @@ class Settings:
             return False
 
     def get_translation_data(self, translation):
+        import pickle
         if translation in self.bible_cache:
             return self.bible_cache[translation]
 
@@ -574,7 +726,7 @@ class Settings:
             return {}
 
         try:
-            with open(pickle_path, "rb") as f:
+            with perf.timed("translation_load"), open(pickle_path, "rb") as f:
                 self.bible_cache[translation] = pickle.load(f)
             
             return self.bible_cache[translation]
@@ -583,7 +735,126 @@ class Settings:
             print("[BIBLE LOAD ERROR]", e)
             return {}
 
+    def get_translation_version(self, translation):
+        pickle_path = os.path.join(TRANSLATIONS_PATH, translation, BIBLE_FILE)
+        try:
+            return os.path.getmtime(pickle_path)
+        except OSError:
+            return None
+
+    def is_translation_cached(self, translation):
+        return translation in self.bible_cache
+
+    def load_chapter_snapshot(self):
+        if not os.path.exists(LAST_CHAPTER_FILE):
+            return None
+        try:
+            with open(LAST_CHAPTER_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print("[SNAPSHOT LOAD ERROR]", e)
+            return None
+
+    def save_chapter_snapshot(self, snapshot):
+        try:
+            os.makedirs(os.path.dirname(LAST_CHAPTER_FILE), exist_ok=True)
+            with open(LAST_CHAPTER_FILE, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+        except Exception as e:
+            print("[SNAPSHOT SAVE ERROR]", e)
+
+    def get_ai_search_cache(self):
+        return self.ai_search_cache
+
+    def get_ai_client(self):
+        from .ai_client import AiClient, DEFAULT_HOST, DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES
+        api_key = self.get_setting("gemini_api_key")
+        host = self.get_setting("ai_host") or DEFAULT_HOST
+        timeout = self.get_setting("ai_timeout", DEFAULT_TIMEOUT)
+        max_retries = self.get_setting("ai_max_retries", DEFAULT_MAX_RETRIES)
+
+        client = self.ai_client
+        if client is None or (client.api_key, client.host, client.timeout, client.max_retries) != (
+            api_key, host, timeout, max_retries
+        ):
+            if client is not None:
+                client.close()
+            client = self.ai_client = AiClient(
+                api_key, host=host, timeout=timeout, max_retries=max_retries
+            )
+        return client
+
+    def get_cache_idle_minutes(self):
+        try:
+            minutes = int(self.get_setting("cache_idle_minutes", DEFAULT_CACHE_IDLE_MINUTES))
+        except (TypeError, ValueError):
+            minutes = DEFAULT_CACHE_IDLE_MINUTES
+        return max(1, minutes)
+
+    def is_search_index_ready(self, translation):
+        return translation in self.search_index_cache
+
+    def get_search_index(self, translation):
+        # A ready index is returned without the lock, which a worker may hold
+        # while it builds the index of another translation.
+        index = self.search_index_cache.get(translation)
+        if index is not None:
+            return index
+        # The dialog prefetches the index on a thread; a worker started meanwhile waits here.
+        with self.search_index_lock:
+            index = self.search_index_cache.get(translation)
+            if index is None:
+                index = self.load_search_index(translation) or self.build_search_index(translation)
+                if index is not None:
+                    self.search_index_cache[translation] = index
+            return index
+
+    def load_search_index(self, translation):
+        import pickle
+        from .core.index import SearchIndex
+        index_path = os.path.join(TRANSLATIONS_PATH, translation, SEARCH_INDEX_FILE)
+        if not os.path.exists(index_path):
+            return None
+        try:
+            with perf.timed("search_index_load"), open(index_path, "rb") as f:
+                index = SearchIndex.from_dict(pickle.load(f))
+        except Exception as e:
+            print("[SEARCH INDEX LOAD ERROR]", e)
+            return None
+        if index is None or index.source_version != self.get_translation_version(translation):
+            return None
+        return index
+
+    def build_search_index(self, translation):
+        import pickle
+        from .core.index import SearchIndex
+        from .core.normalize import get_translation_language
+        try:
+            bible_data = self.get_translation_data(translation)
+            if not bible_data:
+                return None
+            with perf.timed("search_index_build"):
+                index = SearchIndex.build(bible_data, get_translation_language(translation))
+            index.source_version = self.get_translation_version(translation)
+            index_path = os.path.join(TRANSLATIONS_PATH, translation, SEARCH_INDEX_FILE)
+            with open(index_path, "wb") as f:
+                pickle.dump(index.to_dict(), f, protocol=pickle.HIGHEST_PROTOCOL)
+            return index
+        except Exception as e:
+            print("[SEARCH INDEX BUILD ERROR]", e)
+            return None
+
+    def dump_performance_log(self):
+        os.makedirs(os.path.dirname(PERFORMANCE_LOG_FILE), exist_ok=True)
+        perf.dump(PERFORMANCE_LOG_FILE)
+        return PERFORMANCE_LOG_FILE
+
+    def get_text_store(self, translation):
+        from .core.text_store import get_text_store
+        return get_text_store(self.get_translation_data(translation))
+
     def get_cross_references(self, translation):
+        import pickle
         if translation in self.cross_references_cache:
             cached = self.cross_references_cache[translation]
             if cached:
@@ -598,7 +869,7 @@ class Settings:
             return {}
 
         try:
-            with open(cross_references_path, "rb") as f:
+            with perf.timed("cross_references_load"), open(cross_references_path, "rb") as f:
                 self.cross_references_cache[translation] = pickle.load(f)
             
             return self.cross_references_cache[translation]
@@ -614,7 +885,7 @@ class Settings:
         progress_data = self.get_setting("reading_plan_progress", {})
         return progress_data.get(plan_name, {})
 
-    def set_reading_plan_progress(self, plan_name, progress):
+    def set_reading_plan_progress(self, plan_name, progress, save=True):
         days_to_delete = []
         for day, day_progress in progress.items():
             if day == "start_date":
@@ -631,53 +902,68 @@ class Settings:
         progress_data = self.get_setting("reading_plan_progress", {})
         progress_data[plan_name] = progress
         self.set_setting("reading_plan_progress", progress_data)
-        self.save_settings()
+        if save:
+            self.save_settings()
 
-    def get_last_unread_day(self, plan_name, total_days):
+    def get_first_unread_day(self, completed_mask):
+        # Position of the lowest zero bit, counted from 1 like plan days.
+        return ((completed_mask + 1) & ~completed_mask).bit_length()
+
+    def get_plan_frontier(self, plan_name):
+        with Settings._lock:
+            frontiers = self.get_setting("reading_plan_frontier", {})
+            frontier = frontiers.get(plan_name)
+            if frontier is None:
+                frontier = self.rebuild_plan_frontier(plan_name)
+            return frontier
+
+    def rebuild_plan_frontier(self, plan_name):
+        from .core.plans import is_day_read
         progress = self.get_reading_plan_progress(plan_name)
         plan_data = self.get_reading_plan_data(plan_name)
-        if not plan_data:
-            return 1
 
-        for day_info in plan_data["days"]:
-            day = day_info["day"]
-            day_str = str(day)
-            day_progress = progress.get(day_str, {})
-
-            intro_key = "intro"
-            is_intro_read = day_progress.get(intro_key, False)
-
-            if not is_intro_read:
-                return day
-
-            readings = day_info.get("readings", [])
-            all_read = True
-            for reading in readings:
-                book_num = reading["book"]
-                chapter = reading["chapter"]
-                verse = reading.get("verse")
-
-                if verse is None:
-                    reading_key = f"{book_num}_{chapter}_chapter"
-                elif isinstance(verse, int):
-                    reading_key = f"{book_num}_{chapter}_{verse}"
-                elif isinstance(verse, str) and '-' in verse:
-                    reading_key = f"{book_num}_{chapter}_{verse}"
-                elif isinstance(verse, list) and len(verse) == 2:
-                    start_verse, end_verse = verse
-                    reading_key = f"{book_num}_{chapter}_{start_verse}-{end_verse}"
-                else:
-                    reading_key = f"{book_num}_{chapter}_{verse}"
-
-                is_read = day_progress.get(reading_key, False)
-                if not is_read:
-                    all_read = False
-                    break
-
-            if not all_read:
-                return day
+        completed_mask = 0
+        if plan_data:
+            for day_info in plan_data["days"]:
+                day = day_info["day"]
+                if is_day_read(day_info, progress.get(str(day), {})):
+                    completed_mask |= 1 << (day - 1)
+
+        frontier = {
+            "day": self.get_first_unread_day(completed_mask),
+            "completed": completed_mask,
+        }
+        with Settings._lock:
+            frontiers = self.get_setting("reading_plan_frontier", {})
+            frontiers[plan_name] = frontier
+            self.set_setting("reading_plan_frontier", frontiers)
+        return frontier
+
+    def set_plan_day_completed(self, plan_name, day, completed):
+        day_bit = 1 << (day - 1)
+        with Settings._lock:
+            frontier = self.get_plan_frontier(plan_name)
+            if completed:
+                frontier["completed"] |= day_bit
+                if day == frontier["day"]:
+                    frontier["day"] = self.get_first_unread_day(frontier["completed"])
+            else:
+                frontier["completed"] &= ~day_bit
+                if day < frontier["day"]:
+                    frontier["day"] = day
+
+    def remove_plan_frontier(self, plan_name):
+        with Settings._lock:
+            frontiers = self.get_setting("reading_plan_frontier", {})
+            if plan_name in frontiers:
+                del frontiers[plan_name]
+                self.set_setting("reading_plan_frontier", frontiers)
 
-        return 1
+    def get_last_unread_day(self, plan_name, total_days):
+        frontier = self.get_plan_frontier(plan_name)
+        if frontier["day"] > total_days:
+            return 1
+        return frontier["day"]
 
     def cleanup_reading_plan_progress(self, available_plans):
         progress_data = self.get_setting("reading_plan_progress", {})
@@ -686,6 +972,13 @@ class Settings:
             if plan_name not in available_plans:
                 del progress_data[plan_name]
         self.set_setting("reading_plan_progress", progress_data)
+
+        with Settings._lock:
+            frontiers = self.get_setting("reading_plan_frontier", {})
+            for plan_name in list(frontiers.keys()):
+                if plan_name not in available_plans:
+                    del frontiers[plan_name]
+            self.set_setting("reading_plan_frontier", frontiers)
         self.save_settings()
 
     def remove_reading_plan_progress(self, plan_name):
@@ -693,38 +986,26 @@ class Settings:
         if plan_name in progress_data:
             del progress_data[plan_name]
             self.set_setting("reading_plan_progress", progress_data)
-            self.save_settings()
+        self.remove_plan_frontier(plan_name)
+        self.save_settings()
 
         self.load_settings()
 
+    @perf.timed("network.plan_download")
     def load_plan_from_github(self, plan_name):
-        if plan_name in self.plan_cache:
-            return self.plan_cache[plan_name]
+        import requests
+        with Settings._lock:
+            cached = self.plan_cache.get(plan_name)
+            if cached:
+                self.plan_cache.move_to_end(plan_name)
+                return cached[2]
         try:
-            repo_owner = "Halimon-Alexandr"
-            repo_name = "nvda-bible-plugin"
-            branch = "master"
-            current_lang = languageHandler.getLanguage().split('_')[0].lower()
-            api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans?ref={branch}"
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200:
+            files = self.get_github_plan_files()
+            if files is None:
                 return None
-            folders = response.json()
-            available_lang_folders = [
-                folder['name']
-                for folder in folders
-                if folder['type'] == 'dir'
-            ]
-            selected_lang = current_lang if current_lang in available_lang_folders else 'en'
-            api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/plans/{selected_lang}?ref={branch}"
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200:
-                return None
-            files = response.json()
             download_url = None
             for file_info in files:
-                if (file_info['name'].endswith('.json') and
-                    file_info['name'].replace('.json', '') == plan_name):
+                if file_info['name'][:-len('.json')] == plan_name:
                     download_url = file_info['download_url']
                     break
             if not download_url:
@@ -733,7 +1014,7 @@ class Settings:
             if plan_response.status_code != 200:
                 return None
             plan_data = plan_response.json()
-            self.plan_cache[plan_name] = plan_data
+            self.cache_plan(plan_name, None, len(plan_response.content), plan_data)
             return plan_data
         except Exception:
             return None
@@ -752,5 +1033,8 @@ class Settings:
     def clear_bible_cache(self):
         self.bible_cache.clear()
         self.cross_references_cache.clear()
+        self.search_index_cache.clear()
+        from .core.text_store import clear_text_stores
+        clear_text_stores()
         import gc
         gc.collect()
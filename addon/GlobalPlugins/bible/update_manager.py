@@ -1,5 +1,4 @@
 import addonHandler
-import requests
 import json
 import threading
 import wx
@@ -10,6 +9,7 @@ import os
 import core
 import winsound
 import time
+from . import perf
 
 addonHandler.initTranslation()
 
@@ -19,15 +19,17 @@ class UpdateManager:
         self.pending_update = None
 
     def check_for_updates(self, is_start=False, callback=None):
+        import requests
         try:
             current_addon = addonHandler.getCodeAddon()
             current_version = current_addon.manifest["version"]
             current_version_int = int(current_version.replace(".", ""))
 
-            response = requests.get(
-                "https://api.github.com/repos/Halimon-Alexandr/nvda-bible-plugin/releases/latest",
-                timeout=10
-            )
+            with perf.timed("network.update_check"):
+                response = requests.get(
+                    "https://api.github.com/repos/Halimon-Alexandr/nvda-bible-plugin/releases/latest",
+                    timeout=10
+                )
             response.raise_for_status()
             data = response.json()
 
@@ -84,6 +86,7 @@ class UpdateManager:
             time.sleep(1)
 
     def download_and_install(self, version, download_url):
+        import requests
         stop_beep = threading.Event()
         beep_thread = threading.Thread(target=self.play_beep_loop, args=(stop_beep,))
         beep_thread.start()
@@ -0,0 +1,220 @@
+import json
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from nvda_stubs import load_addon_module
+from checks import CheckFailed, check
+
+# The AI client against a local HTTP server: kept-alive connections, retries
+# with backoff, streamed answers and cancelling. Nothing leaves 127.0.0.1.
+BACKOFF = 0.05
+ANSWER = {"candidates": [{"content": {"parts": [{"text": "John.3.16"}]}}]}
+
+
+def send_json(handler, status=200, body=ANSWER):
+    data = json.dumps(body).encode("utf-8")
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(data)))
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+def send_unavailable(handler):
+    send_json(handler, 503, {"error": "busy"})
+
+
+def send_and_drop(handler):
+    # The answer claims keep-alive, but the server closes the connection after it.
+    send_json(handler)
+    handler.close_connection = True
+
+
+def send_stream_and_fail(handler):
+    handler.send_response(200)
+    handler.send_header("Content-Type", "text/event-stream")
+    handler.send_header("Transfer-Encoding", "chunked")
+    handler.end_headers()
+    event = f"data: {json.dumps(ANSWER)}\n\n".encode("utf-8")
+    handler.wfile.write(f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n")
+    handler.wfile.flush()
+    # Once the client has the first piece, the connection is reset mid-stream.
+    handler.server.fake.text_seen.wait(5)
+    handler.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    handler.connection.close()
+    handler.close_connection = True
+
+
+def hang(handler):
+    handler.server.fake.release.wait(10)
+    handler.close_connection = True
+
+
+class FakeGeminiServer:
+    def __init__(self, actions):
+        self.actions = list(actions)
+        self.requests = 0
+        self.connections = 0
+        self.release = threading.Event()
+        self.received = threading.Event()
+        self.text_seen = threading.Event()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeGeminiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def host(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.fake.connections += 1
+
+    def do_POST(self):
+        fake = self.server.fake
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        fake.requests += 1
+        fake.received.set()
+        action = fake.actions.pop(0) if fake.actions else send_json
+        action(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_client(ai_client, server, **options):
+    options.setdefault("backoff", BACKOFF)
+    options.setdefault("timeout", 5)
+    return ai_client.AiClient("test-key", host=server.host, **options)
+
+
+def check_keep_alive(ai_client):
+    with FakeGeminiServer([]) as server:
+        client = make_client(ai_client, server)
+        for _ in range(3):
+            check(client.generate_content("love") == ANSWER, "keep-alive: wrong answer")
+        client.close()
+    check(server.requests == 3, f"keep-alive: {server.requests} requests, expected 3")
+    check(server.connections == 1, f"keep-alive: {server.connections} connections, expected 1")
+
+
+def check_retry(ai_client):
+    with FakeGeminiServer([send_unavailable, send_unavailable]) as server:
+        client = make_client(ai_client, server, max_retries=2)
+        start = time.perf_counter()
+        result = client.generate_content("love")
+        elapsed = time.perf_counter() - start
+        client.close()
+    check(result == ANSWER, "retry: wrong answer after 503")
+    check(server.requests == 3, f"retry: {server.requests} requests, expected 3")
+    # Two waits: backoff, then twice the backoff.
+    check(elapsed >= BACKOFF * 3, f"retry: took {elapsed:.3f} s, shorter than the backoff")
+
+    with FakeGeminiServer([send_unavailable] * 3) as server:
+        client = make_client(ai_client, server, max_retries=1)
+        try:
+            client.generate_content("love")
+            status = None
+        except ai_client.AiRequestError as e:
+            status = e.status
+        client.close()
+    check(status == 503, f"retry: gave up with status {status}, expected 503")
+    check(server.requests == 2, f"retry: {server.requests} requests with one retry, expected 2")
+
+
+def check_no_retry_after_stream(ai_client):
+    received = []
+    with FakeGeminiServer([send_stream_and_fail]) as server:
+        client = make_client(ai_client, server, max_retries=2)
+
+        def on_text(text):
+            received.append(text)
+            server.text_seen.set()
+
+        try:
+            client.stream_generate_content("love", on_text)
+            failed = False
+        except ai_client.AiRequestError:
+            failed = True
+        client.close()
+    check(failed, "stream: a broken stream did not fail")
+    check(received == ["John.3.16"], f"stream: handed out {received}, expected the first piece once")
+    check(server.requests == 1, f"stream: {server.requests} requests after text started, expected 1")
+
+
+def check_cancel(ai_client):
+    outcome = []
+    with FakeGeminiServer([hang]) as server:
+        client = make_client(ai_client, server, timeout=10)
+        cancel = ai_client.CancelHandle()
+
+        def request():
+            try:
+                client.generate_content("love", cancel)
+                outcome.append("answered")
+            except ai_client.AiRequestCancelled:
+                outcome.append("cancelled")
+            except Exception as e:
+                outcome.append(repr(e))
+
+        thread = threading.Thread(target=request, daemon=True)
+        thread.start()
+        check(server.received.wait(5), "cancel: the request never reached the server")
+        start = time.perf_counter()
+        cancel.cancel()
+        thread.join(5)
+        elapsed = time.perf_counter() - start
+        client.close()
+    check(outcome == ["cancelled"], f"cancel: outcome {outcome}, expected cancelled")
+    check(elapsed < 1, f"cancel: the blocked read took {elapsed:.3f} s to stop")
+
+
+def check_reconnect(ai_client):
+    with FakeGeminiServer([send_and_drop]) as server:
+        # A long backoff and no retries: only the immediate reconnect can succeed in time.
+        client = make_client(ai_client, server, backoff=5, max_retries=0)
+        check(client.generate_content("love") == ANSWER, "reconnect: wrong first answer")
+        time.sleep(0.05)
+        start = time.perf_counter()
+        result = client.generate_content("love")
+        elapsed = time.perf_counter() - start
+        client.close()
+    check(result == ANSWER, "reconnect: wrong answer on the new connection")
+    check(server.connections == 2, f"reconnect: {server.connections} connections, expected 2")
+    check(elapsed < 1, f"reconnect: took {elapsed:.3f} s, it waited for a backoff")
+
+
+def run_checks():
+    ai_client = load_addon_module("ai_client")
+    count = 0
+    for check_case in (check_keep_alive, check_retry, check_no_retry_after_stream, check_cancel, check_reconnect):
+        check_case(ai_client)
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    try:
+        print(f"AI client checks passed: {run_checks()}")
+    except CheckFailed as e:
+        print(f"AI client check failed: {e}")
+        raise SystemExit(1)
@@ -0,0 +1,281 @@
+import random
+import re
+
+from nvda_stubs import load_addon_module
+import data
+
+# Correctness checks run before the timings: the fast search paths must give
+# the same verses as a plain loop over every verse. A smaller synthetic
+# translation keeps the slow reference loops short.
+CHECK_SCALE = 0.1
+
+REGEX_PATTERNS = [
+    r"^{word}",
+    r"{word}\.$",
+    r"\b{prefix}\w*",
+    r"{word}\s+\w+",
+    r"\w+\s+\w+$",
+    r"[^.]{{120}}",
+    r"x*",
+    r"\A{word}",
+    r"(?<=\s){word}",
+    r"(?s){prefix}.{{3}}",
+    r"(?i){upper}",
+    r"{upper}\W",
+    r"[{upper}]{{2}}\w*",
+    r"(?:{upper}|\bZ)\S",
+]
+
+
+class CheckFailed(AssertionError):
+    pass
+
+
+def check(condition, message):
+    if not condition:
+        raise CheckFailed(message)
+
+
+def get_sample_words(bible_data, count=6, seed=3):
+    rng = random.Random(seed)
+    verses = [
+        text for chapters in bible_data.values() for verses in chapters.values() for text in verses.values()
+    ]
+    words = []
+    for text in rng.sample(verses, min(count, len(verses))):
+        words.append(rng.choice(text.split()).strip(".,;:"))
+    return words
+
+
+def get_book_selections(bible_data, seed=4):
+    rng = random.Random(seed)
+    books = list(bible_data)
+    selected = rng.sample(books, max(1, len(books) // 3))
+    return [books, selected, selected[::-1], books[:1]]
+
+
+def scan_every_verse(search, bible_data, book_names, search_text, whole_word, case_sensitive, use_regex):
+    # The search as it was before the scan buffer: one matcher call per verse,
+    # and a case-insensitive pattern run with re.IGNORECASE as typed.
+    if use_regex:
+        matches = re.compile(search_text, 0 if case_sensitive else re.IGNORECASE).search
+    else:
+        matches = search.build_verse_matcher(search_text, whole_word, case_sensitive, use_regex)
+    search_data = search.get_search_data(bible_data, case_sensitive)
+    return [
+        (book_name, chapter, verse)
+        for book_name in book_names
+        for chapter, verses in search_data.get(book_name, {}).items()
+        for verse, text in verses.items()
+        if matches(text)
+    ]
+
+
+def check_scan_buffer(bible_data):
+    search = load_addon_module("core.search")
+    words = get_sample_words(bible_data)
+    queries = []
+    for word in words:
+        queries.extend(
+            (word, whole_word, case_sensitive, False)
+            for whole_word in (False, True) for case_sensitive in (False, True)
+        )
+    for word in words[:3]:
+        for pattern in REGEX_PATTERNS:
+            regex = pattern.format(
+                word=re.escape(word), prefix=re.escape(word[:2]), upper=re.escape(word.upper())
+            )
+            queries.extend((regex, False, case_sensitive, True) for case_sensitive in (False, True))
+    queries.extend([("", False, False, False), (" ", True, False, False), ("a b", True, True, False)])
+
+    count = 0
+    for book_names in get_book_selections(bible_data):
+        for search_text, whole_word, case_sensitive, use_regex in queries:
+            expected = scan_every_verse(
+                search, bible_data, book_names, search_text, whole_word, case_sensitive, use_regex
+            )
+            found = search.search_verses(
+                bible_data, book_names, search_text, whole_word, case_sensitive, use_regex
+            )
+            check(
+                found == expected,
+                f"scan buffer: {search_text!r} whole_word={whole_word} case_sensitive={case_sensitive} "
+                f"regex={use_regex} found {len(found)} verses, expected {len(expected)}",
+            )
+            count += 1
+    return count
+
+
+def get_phrase_spans(terms, tokens):
+    length = len(terms)
+    return [(i, i + length - 1) for i in range(len(tokens) - length + 1) if tokens[i:i + length] == terms]
+
+
+def get_node_spans(node, tokens):
+    if node[0] == "phrase":
+        return get_phrase_spans(node[1], tokens)
+    _kind, left, right, distance, ordered = node
+    left_spans = get_node_spans(left, tokens)
+    right_spans = get_node_spans(right, tokens)
+    return [
+        (left_start, right_end)
+        for left_start, left_end in left_spans for right_start, right_end in right_spans
+        if 0 < right_start - left_end <= distance
+    ] + [
+        (right_start, left_end)
+        for left_start, left_end in left_spans for right_start, right_end in right_spans
+        if not ordered and 0 < left_start - right_end <= distance
+    ]
+
+
+def match_node(node, tokens, book_index):
+    kind = node[0]
+    if kind in ("phrase", "near"):
+        return bool(get_node_spans(node, tokens))
+    if kind == "book":
+        return book_index in node[1]
+    if kind == "all":
+        return True
+    if kind == "or":
+        return any(match_node(child, tokens, book_index) for child in node[1])
+    return (
+        all(match_node(child, tokens, book_index) for child in node[1])
+        and not any(match_node(child, tokens, book_index) for child in node[2])
+    )
+
+
+def iter_verse_texts(bible_data):
+    for chapters in bible_data.values():
+        for verses in chapters.values():
+            yield from verses.values()
+
+
+def get_verse_tokens(index_module, bible_data):
+    return [
+        (book_index, (book_name, chapter, verse), index_module.tokenize(text))
+        for book_index, (book_name, chapters) in enumerate(bible_data.items())
+        for chapter, verses in chapters.items()
+        for verse, text in verses.items()
+    ]
+
+
+def check_boolean_queries(bible_data, index):
+    index_module = load_addon_module("core.index")
+    query = load_addon_module("core.query")
+    search = load_addon_module("core.search")
+    verse_tokens = get_verse_tokens(index_module, bible_data)
+    first, second, third, fourth, fifth, sixth = [word.lower() for word in get_sample_words(bible_data)]
+    texts = [
+        f"{first} AND {second}",
+        f"{first} OR {second} OR {third}",
+        f"{first} NOT {second}",
+        f"NOT {first}",
+        f"({first} OR {second}) {third} NOT ({fourth} OR {fifth})",
+        f"{first} NEAR/5 {second}",
+        f"{first} PRE/3 {sixth} OR {third}",
+        f'"{first} {second}" OR {fourth}',
+        f"{first} book:1-10,40",
+        f"book:2 NOT {second}",
+        "book:3",
+        f"book:2-4 {first}",
+        f"book:1,3-4 NOT {second}",
+        f"(book:2 OR {third}) {fourth}",
+        f"book:1-200 {fifth}",
+    ]
+    books = list(bible_data)
+    count = 0
+    for text in texts:
+        node = query.parse_boolean_query(text)
+        for book_names in (books, books[len(books) // 2:]):
+            book_set = set(book_names)
+            expected = [
+                ref for book_index, ref, tokens in verse_tokens
+                if ref[0] in book_set and match_node(node, tokens, book_index)
+            ]
+            found = search.search_query(index, bible_data, book_names, text)
+            check(found == expected, f"query {text!r} found {len(found)} verses, expected {len(expected)}")
+            count += 1
+    return count
+
+
+def get_sample_run(bible_data, length, seed):
+    # Words next to each other in one verse, so phrases and NEAR/n have hits.
+    rng = random.Random(seed)
+    verses = [text.split() for text in iter_verse_texts(bible_data)]
+    words = rng.choice([words for words in verses if len(words) >= length])
+    start = rng.randrange(len(words) - length + 1)
+    return [word.strip(".,;:") for word in words[start:start + length]]
+
+
+def check_whole_word_queries(bible_data, index):
+    index_module = load_addon_module("core.index")
+    query = load_addon_module("core.query")
+    search = load_addon_module("core.search")
+    verse_tokens = get_verse_tokens(index_module, bible_data)
+    verse_words = [set(index_module.WORD_PATTERN.findall(text)) for text in iter_verse_texts(bible_data)]
+    first, second = get_sample_words(bible_data, count=2, seed=7)
+    phrase = get_sample_run(bible_data, 3, seed=8)
+    near = get_sample_run(bible_data, 4, seed=9)
+    texts = [
+        first,
+        first.capitalize(),
+        f"{first} {second}",
+        " ".join(phrase),
+        f'"{phrase[1]} {phrase[2]}"',
+        f"{near[0]} NEAR/3 {near[3]}",
+        f"{near[3]} NEAR/2 {near[0]}",
+        f"{near[0]} PRE/3 {near[3]}",
+        f"{near[3]} PRE/3 {near[0]}",
+        f"{phrase[0]}, {phrase[1]}!",
+    ]
+    books = list(bible_data)
+    count = 0
+    for text in texts:
+        node = query.parse_proximity_query(text)
+        words = set(query.get_query_words(text))
+        for case_sensitive in (False, True):
+            for book_names in (books, books[len(books) // 3:]):
+                book_set = set(book_names)
+                expected = [
+                    ref for (book_index, ref, tokens), word_set in zip(verse_tokens, verse_words)
+                    if ref[0] in book_set and match_node(node, tokens, book_index)
+                    and (not case_sensitive or words <= word_set)
+                ]
+                found = search.search_whole_words(index, bible_data, book_names, text, case_sensitive)
+                check(
+                    found == expected,
+                    f"whole word {text!r} case_sensitive={case_sensitive} found {len(found)} verses, "
+                    f"expected {len(expected)}",
+                )
+                count += 1
+    return count
+
+
+def check_folded_text(bible_data, index):
+    # The folded text kept with the index must match folding the translation again.
+    search = load_addon_module("core.search")
+    count = 0
+    for word in get_sample_words(bible_data):
+        for text in (word, word.upper(), word[1:4]):
+            for whole_word in (False, True):
+                for book_names in get_book_selections(bible_data)[:2]:
+                    expected = search.search_folded_verses(bible_data, book_names, text, whole_word=whole_word)
+                    found = search.search_folded_verses(
+                        bible_data, book_names, text, whole_word=whole_word, index=index
+                    )
+                    check(
+                        found == expected,
+                        f"folded text {text!r} whole_word={whole_word} found {len(found)} verses, "
+                        f"expected {len(expected)}",
+                    )
+                    count += 1
+    return count
+
+
+def run_checks():
+    bible_data, _vocabulary = data.make_bible(seed=5, scale=CHECK_SCALE)
+    index = load_addon_module("core.index").SearchIndex.build(bible_data)
+    return (
+        check_scan_buffer(bible_data) + check_boolean_queries(bible_data, index)
+        + check_whole_word_queries(bible_data, index) + check_folded_text(bible_data, index)
+    )
@@ -0,0 +1,139 @@
+import json
+import os
+import pickle
+import random
+import shutil
+
+SYLLABLES = [
+    "ba", "ca", "da", "el", "fa", "ga", "ha", "in", "jo", "ka", "lo", "ma",
+    "ne", "or", "pa", "qu", "ra", "si", "to", "ur", "ve", "wi", "ya", "zo",
+    "бо", "ві", "до", "же", "зи", "ка", "ли", "мо", "но", "пі", "ро", "сє",
+]
+
+BOOK_COUNT = 66
+
+
+def make_vocabulary(rng, size=4000):
+    words = set()
+    while len(words) < size:
+        length = rng.randint(1, 4)
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(length)))
+    return sorted(words)
+
+
+def make_bible(seed=1, scale=1.0):
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+
+    bible_data = {}
+    for book_index in range(BOOK_COUNT):
+        book_name = f"Book {book_index + 1}"
+        chapters = {}
+        chapter_count = max(1, int(rng.randint(1, 35) * scale))
+        for chapter in range(1, chapter_count + 1):
+            verses = {}
+            for verse in range(1, rng.randint(12, 40) + 1):
+                words = rng.choices(vocabulary, weights, k=rng.randint(8, 35))
+                words[0] = words[0].capitalize()
+                verses[str(verse)] = " ".join(words) + "."
+            chapters[str(chapter)] = verses
+        bible_data[book_name] = chapters
+    return bible_data, vocabulary
+
+
+def make_cross_references(bible_data, seed=2):
+    rng = random.Random(seed)
+    all_refs = []
+    for book_index, chapters in enumerate(bible_data.values()):
+        for chapter, verses in chapters.items():
+            for verse in verses:
+                all_refs.append(f"{book_index}.{chapter}.{verse}")
+
+    cross_references = {}
+    for ref in all_refs:
+        if rng.random() < 0.35:
+            targets = rng.sample(all_refs, rng.randint(3, 15))
+            cross_references[ref] = targets
+    return cross_references
+
+
+def count_verses(bible_data):
+    return sum(
+        len(verses) for chapters in bible_data.values() for verses in chapters.values()
+    )
+
+
+def write_translation(translations_path, name, bible_data, cross_references=None):
+    translation_path = os.path.join(translations_path, name)
+    os.makedirs(translation_path, exist_ok=True)
+    with open(os.path.join(translation_path, "bible.pkl"), "wb") as f:
+        pickle.dump(bible_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    if cross_references is not None:
+        with open(os.path.join(translation_path, "cross_references.pkl"), "wb") as f:
+            pickle.dump(cross_references, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return translation_path
+
+
+def copy_translation(translations_path, source_path):
+    name = os.path.basename(os.path.normpath(source_path))
+    target_path = os.path.join(translations_path, name)
+    if os.path.exists(target_path):
+        shutil.rmtree(target_path)
+    shutil.copytree(source_path, target_path)
+    return name
+
+
+def load_plans(plans_dir):
+    plans = {}
+    if not plans_dir or not os.path.isdir(plans_dir):
+        return plans
+    for file_name in sorted(os.listdir(plans_dir)):
+        if not file_name.endswith(".json"):
+            continue
+        with open(os.path.join(plans_dir, file_name), "r", encoding="utf-8") as f:
+            plans[file_name[:-5]] = json.load(f)
+    return plans
+
+
+def make_plan(bible_data, days=365, seed=3):
+    rng = random.Random(seed)
+    books = list(bible_data.values())
+    plan_days = []
+    for day in range(1, days + 1):
+        readings = []
+        for _ in range(rng.randint(1, 4)):
+            book_index = rng.randrange(len(books))
+            chapter = rng.choice(list(books[book_index].keys()))
+            verse_count = len(books[book_index][chapter])
+            kind = rng.random()
+            if kind < 0.4:
+                verse = None
+            elif kind < 0.7:
+                start = rng.randint(1, verse_count)
+                verse = f"{start}-{min(verse_count, start + rng.randint(1, 10))}"
+            else:
+                verse = str(rng.randint(1, verse_count))
+            readings.append({"book": book_index, "chapter": chapter, "verse": verse})
+        plan_days.append({"day": day, "intro": "Intro" if day % 7 == 1 else "", "readings": readings})
+    return {"days": plan_days}
+
+
+def make_plan_progress(plan_data, completed_ratio=0.6, seed=4):
+    rng = random.Random(seed)
+    progress = {"start_date": "2024-01-01"}
+    for day_info in plan_data["days"]:
+        if rng.random() > completed_ratio:
+            continue
+        day_progress = {"intro": True}
+        for reading in day_info.get("readings", []):
+            verse = reading.get("verse")
+            if verse is None:
+                key = f"{reading['book']}_{reading['chapter']}_chapter"
+            elif isinstance(verse, list) and len(verse) == 2:
+                key = f"{reading['book']}_{reading['chapter']}_{verse[0]}-{verse[1]}"
+            else:
+                key = f"{reading['book']}_{reading['chapter']}_{verse}"
+            day_progress[key] = rng.random() < 0.9
+        progress[str(day_info["day"])] = day_progress
+    return progress
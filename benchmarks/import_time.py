@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that are only needed once the Bible window, the settings panel or a
+# download is used. The core modules come first, so that their cost is
+# reported apart from the viewer that imports them.
+DEFERRED_MODULES = [
+    "bible.core.text_store",
+    "bible.core.plans",
+    "bible.core.search",
+    "bible.core.index",
+    "bible.core.concordance",
+    "unicodedata",
+    "numpy",
+    "bible.bible_viewer",
+    "bible.update_manager",
+    "requests",
+    "zipfile",
+    "tempfile",
+    "pickle",
+    "http.client",
+    "webbrowser",
+    "concurrent.futures",
+]
+
+CHILD_SCRIPT = """
+import importlib, json, sys, time
+sys.path.insert(0, {benchmarks_dir!r})
+from nvda_stubs import install_stubs, import_addon_package
+install_stubs({config_path!r})
+before = set(sys.modules)
+start = time.perf_counter()
+import_addon_package()
+startup = time.perf_counter() - start
+loaded_at_startup = sorted(name for name in {deferred!r} if name in sys.modules and name not in before)
+deferred = {{}}
+for name in {deferred!r}:
+    if name in sys.modules:
+        continue
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        continue
+    deferred[name] = time.perf_counter() - start
+requests_stubbed = type(sys.modules.get("requests")).__name__ == "StubModule"
+print(json.dumps({{"startup": startup, "deferred": deferred, "loaded_at_startup": loaded_at_startup, "requests_stubbed": requests_stubbed}}))
+"""
+
+
+def measure_once(config_path):
+    script = CHILD_SCRIPT.format(
+        benchmarks_dir=BENCHMARKS_DIR, config_path=config_path, deferred=DEFERRED_MODULES
+    )
+    output = subprocess.check_output([sys.executable, "-c", script], text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the add-on import cost at NVDA startup.")
+    parser.add_argument("--repeat", type=int, default=7, help="fresh interpreters to measure")
+    args = parser.parse_args()
+
+    config_path = tempfile.mkdtemp(prefix="bible-import-")
+    runs = [measure_once(config_path) for _ in range(args.repeat)]
+
+    startup = statistics.median(run["startup"] for run in runs) * 1000
+    deferred_names = sorted({name for run in runs for name in run["deferred"]})
+    print(f"{'plugin import at startup':32} {startup:9.2f} ms")
+    deferred_total = 0.0
+    for name in deferred_names:
+        value = statistics.median(run["deferred"].get(name, 0.0) for run in runs) * 1000
+        deferred_total += value
+        print(f"  deferred {name:23} {value:9.2f} ms")
+    print(f"{'saved at startup':32} {deferred_total:9.2f} ms")
+
+    if any(run["requests_stubbed"] for run in runs):
+        print("requests is not installed here, so its import cost is not included.")
+
+    eager = sorted({name for run in runs for name in run["loaded_at_startup"]})
+    if eager:
+        print("Still imported at startup: " + ", ".join(eager))
+
+
+if __name__ == "__main__":
+    main()
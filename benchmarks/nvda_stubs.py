@@ -0,0 +1,99 @@
+import builtins
+import importlib
+import os
+import sys
+import tempfile
+import types
+
+ADDON_PACKAGE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addon", "GlobalPlugins", "bible"
+)
+
+STUBBED_MODULES = [
+    "wx",
+    "gui",
+    "gui.settingsDialogs",
+    "ui",
+    "winsound",
+    "queueHandler",
+    "globalPluginHandler",
+    "scriptHandler",
+    "core",
+    "config",
+    "languageHandler",
+    "addonHandler",
+    "globalVars",
+]
+
+
+class StubObject:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return StubObject()
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StubObject()
+
+    def __or__(self, other):
+        return self
+
+    __ror__ = __or__
+
+
+class StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = type(name, (StubObject,), {})
+        setattr(self, name, value)
+        return value
+
+
+def install_stubs(config_path=None):
+    if config_path is None:
+        config_path = tempfile.mkdtemp(prefix="bible-bench-")
+
+    for name in STUBBED_MODULES:
+        sys.modules[name] = StubModule(name)
+
+    wx = sys.modules["wx"]
+    wx.NOT_FOUND = -1
+    wx.CallAfter = lambda func, *args, **kwargs: func(*args, **kwargs)
+
+    sys.modules["gui"].settingsDialogs = sys.modules["gui.settingsDialogs"]
+    sys.modules["ui"].message = lambda text: None
+    sys.modules["globalVars"].appArgs = types.SimpleNamespace(
+        configPath=config_path, secure=False
+    )
+    sys.modules["languageHandler"].getLanguage = lambda: "en"
+    sys.modules["addonHandler"].initTranslation = lambda: None
+    builtins._ = lambda text: text
+
+    try:
+        importlib.import_module("requests")
+    except ImportError:
+        sys.modules["requests"] = StubModule("requests")
+
+    return config_path
+
+
+def import_addon_package():
+    plugins_dir = os.path.dirname(ADDON_PACKAGE_DIR)
+    if plugins_dir not in sys.path:
+        sys.path.insert(0, plugins_dir)
+    return importlib.import_module("bible")
+
+
+def load_addon_module(name):
+    # The package __init__ registers the global plugin; the benchmarks only
+    # need the modules behind it, so the package is created without running it.
+    if "bible" not in sys.modules:
+        package = types.ModuleType("bible")
+        package.__path__ = [ADDON_PACKAGE_DIR]
+        sys.modules["bible"] = package
+    return importlib.import_module(f"bible.{name}")
@@ -0,0 +1,601 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from nvda_stubs import install_stubs, load_addon_module
+import ai_client_checks
+import checks
+import data
+
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+DEFAULT_PLANS_DIR = os.path.join(REPO_DIR, "plans", "en")
+SYNTHETIC_TRANSLATION = "BENCH - Synthetic"
+# (case, reference case, minimum speedup): a fast path must beat the plain
+# loop it replaced by this much, whatever the baseline says.
+SPEEDUPS = [
+    ("search_rare_regex", "search_rare_regex_per_verse", 3.0),
+]
+
+
+class FakeTextCtrl:
+    def __init__(self):
+        self.value = ""
+        self.insertion_point = 0
+
+    def SetValue(self, value):
+        self.value = value
+        self.insertion_point = 0
+
+    def GetValue(self):
+        return self.value
+
+    def GetInsertionPoint(self):
+        return self.insertion_point
+
+    def SetInsertionPoint(self, position):
+        self.insertion_point = position
+
+    def ShowPosition(self, position):
+        pass
+
+    def GetLastPosition(self):
+        return len(self.value)
+
+    def GetRange(self, start, end):
+        return self.value[start:end]
+
+    def SetFocus(self):
+        pass
+
+
+class FakeChoice:
+    def __init__(self, items=None, value=""):
+        self.items = list(items or [])
+        self.selection = 0 if self.items else -1
+        self.value = value
+
+    def Set(self, items):
+        self.items = list(items)
+
+    def GetSelection(self):
+        return self.selection
+
+    def GetSelections(self):
+        return list(range(len(self.items)))
+
+    def SetSelection(self, index):
+        self.selection = index
+
+    def GetString(self, index):
+        return self.items[index]
+
+    def GetCount(self):
+        return len(self.items)
+
+    def GetValue(self):
+        return self.value
+
+    def Clear(self):
+        pass
+
+    def Append(self, items):
+        pass
+
+
+class FakeSettings:
+    def __init__(self, values):
+        self.values = dict(values)
+
+    def get_setting(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set_setting(self, key, value):
+        self.values[key] = value
+
+
+def bind(target, cls, *names):
+    for name in names:
+        setattr(target, name, types.MethodType(getattr(cls, name), target))
+    return target
+
+
+class BenchmarkContext:
+    def __init__(self, args):
+        self.config_path = install_stubs()
+        self.settings_module = load_addon_module("settings")
+        self.viewer = load_addon_module("bible_viewer")
+        self.references = load_addon_module("core.references")
+        self.concordance = load_addon_module("core.concordance")
+        self.search = load_addon_module("core.search")
+        self.settings = self.settings_module.Settings()
+        self.translations_path = self.settings_module.TRANSLATIONS_PATH
+        os.makedirs(self.translations_path, exist_ok=True)
+
+        self.datasets = []
+        bible_data, _vocabulary = data.make_bible(scale=args.scale)
+        cross_references = data.make_cross_references(bible_data)
+        data.write_translation(
+            self.translations_path, SYNTHETIC_TRANSLATION, bible_data, cross_references
+        )
+        self.datasets.append(("synthetic", SYNTHETIC_TRANSLATION))
+
+        if args.translation:
+            name = data.copy_translation(self.translations_path, args.translation)
+            self.datasets.append(("real", name))
+
+        self.plans = data.load_plans(args.plans_dir)
+        with open(self.settings_module.BOOK_ABBREVIATIONS_FILE, "r", encoding="utf-8") as f:
+            self.book_abbreviations = json.load(f)
+
+    def load_dataset(self, translation):
+        bible_data = self.settings.get_translation_data(translation)
+        cross_references = self.settings.get_cross_references(translation)
+        return bible_data, cross_references
+
+    def make_frame(self, bible_data, cross_references):
+        frame = types.SimpleNamespace()
+        frame.current_tab = types.SimpleNamespace(
+            bible_data=bible_data,
+            cross_referenc=cross_references,
+            state={"verse_number": 1},
+            is_loading=False,
+        )
+        frame.book_combo = FakeChoice(bible_data.keys())
+        frame.chapter_combo = FakeChoice()
+        frame.text_display = FakeTextCtrl()
+        frame.show_verse_numbers = True
+        return bind(
+            frame, self.viewer.BibleFrame,
+            "display_chapter_text", "set_cursor_to_verse_number", "get_current_verse",
+            "get_formatted_verse_text", "get_full_chapter_text", "is_valid_reference",
+            "get_text_store",
+        )
+
+    def make_search_dialog(self, bible_data, query, index=None, **options):
+        settings = FakeSettings({
+            "search_history": [query],
+            "whole_word": options.get("whole_word", False),
+            "case_sensitive": options.get("case_sensitive", False),
+            "use_regex": options.get("use_regex", False),
+            "query_language": options.get("query_language", False),
+            "sort_by_relevance": options.get("sort_by_relevance", False),
+            "ignore_accents": options.get("ignore_accents", False),
+            "word_forms": options.get("word_forms", False),
+            "ai_search": False,
+        })
+        dialog = types.SimpleNamespace(
+            bible_data=bible_data,
+            settings=settings,
+            text_ctrl=FakeChoice(value=query),
+            book_list=FakeChoice(bible_data.keys()),
+            results=[],
+            result_query=None,
+            ai_cancel=None,
+        )
+        dialog.show_results = lambda results: setattr(dialog, "results", results)
+        # The index is ready, so the search goes on at once as it does in the
+        # dialog; the work meant for the worker thread runs first, in line.
+        def with_search_index(on_ready, prepare=None):
+            if prepare is not None:
+                prepare(index)
+            on_ready(index)
+
+        dialog.with_search_index = with_search_index
+        dialog.get_translation_name = lambda: SYNTHETIC_TRANSLATION
+        return bind(
+            dialog, self.viewer.SearchInBibleDialog,
+            "handle_find_button", "perform_query_search", "show_text_results", "order_results",
+            "with_query_index", "uses_word_index", "check_search_text", "prepare_folded_text",
+            "refine_search", "get_matching_refs"
+        )
+
+    def make_cross_references_dialog(self, frame):
+        dialog = types.SimpleNamespace(
+            bible_frame=frame, references=[], text_display=FakeTextCtrl()
+        )
+        return bind(
+            dialog, self.viewer.CrossReferencesDialog,
+            "load_cross_references", "format_short_reference",
+        )
+
+    def make_plan_panel(self, plan_data, progress):
+        panel = types.SimpleNamespace(plan_data=plan_data, progress=progress)
+        bind(
+            panel, self.viewer.ReadingPlanPanel,
+            "build_day_index", "get_day_info", "get_day_status", "get_reading_key",
+            "is_reading_completed", "get_day_date", "get_day_list_text",
+        )
+        panel.day_index = panel.build_day_index()
+        return panel
+
+
+def chapter_positions(bible_data, limit):
+    positions = []
+    for book_index, chapters in enumerate(bible_data.values()):
+        for chapter_index in range(len(chapters)):
+            positions.append((book_index, chapter_index))
+            if len(positions) >= limit:
+                return positions
+    return positions
+
+
+def longest_chapter(bible_data):
+    best = (0, 0, 0)
+    for book_index, chapters in enumerate(bible_data.values()):
+        ordered = sorted(chapters.keys(), key=int)
+        for chapter_index, chapter in enumerate(ordered):
+            if len(chapters[chapter]) > best[2]:
+                best = (book_index, chapter_index, len(chapters[chapter]))
+    return best
+
+
+def build_cases(context):
+    cases = []
+
+    for label, translation in context.datasets:
+        bible_data, cross_references = context.load_dataset(translation)
+        verse_count = data.count_verses(bible_data)
+        frame = context.make_frame(bible_data, cross_references)
+
+        def translation_load(translation=translation):
+            context.settings.bible_cache.pop(translation, None)
+            context.settings.get_translation_data(translation)
+
+        cases.append((f"{label}/translation_load", translation_load, verse_count, "verses"))
+
+        positions = chapter_positions(bible_data, 200)
+
+        def chapter_render(frame=frame, positions=positions):
+            for book_index, chapter_index in positions:
+                frame.book_combo.selection = book_index
+                frame.chapter_combo.selection = chapter_index
+                frame.display_chapter_text()
+
+        cases.append((f"{label}/chapter_render", chapter_render, len(positions), "chapters"))
+
+        book_index, chapter_index, chapter_verses = longest_chapter(bible_data)
+
+        def verse_cursor(frame=frame, book_index=book_index, chapter_index=chapter_index, chapter_verses=chapter_verses):
+            frame.book_combo.selection = book_index
+            frame.chapter_combo.selection = chapter_index
+            frame.display_chapter_text()
+            for verse in range(1, chapter_verses + 1):
+                frame.set_cursor_to_verse_number(verse)
+                frame.get_current_verse()
+
+        cases.append((f"{label}/verse_cursor", verse_cursor, chapter_verses * 2, "lookups"))
+
+        def index_build(translation=translation):
+            context.settings.build_search_index(translation)
+
+        def index_load(translation=translation):
+            context.settings.load_search_index(translation)
+
+        cases.append((f"{label}/index_build", index_build, verse_count, "verses"))
+        cases.append((f"{label}/index_load", index_load, verse_count, "verses"))
+
+        index = context.settings.get_search_index(translation)
+        first_verse = next(iter(next(iter(next(iter(bible_data.values())).values())).values()))
+        first_words = [word.strip(".,;:") for word in first_verse.split()]
+        theme_query = " ".join(first_words[:4])
+
+        def theme_search(index=index, theme_query=theme_query):
+            index.theme_search(theme_query)
+
+        cases.append((f"{label}/theme_search", theme_search, verse_count, "verses"))
+
+        def index_folded_text(index=index):
+            # What the first accent-insensitive search of a session costs on the worker.
+            index._folded_data = index._folded_buffer = None
+            index.get_folded_buffer()
+
+        cases.append((f"{label}/index_folded_text", index_folded_text, verse_count, "verses"))
+
+        sample_words = [
+            word for verses in list(bible_data.values())[0].values()
+            for text in verses.values() for word in text.split()
+        ]
+        common_word = max(set(sample_words), key=sample_words.count).strip(".,;:")
+        rare_word = min(sorted(set(sample_words)), key=sample_words.count).strip(".,;:")
+        searches = [
+            ("search_substring", common_word, {}),
+            ("search_whole_word", common_word, {"whole_word": True}),
+            ("search_ranked", common_word, {"whole_word": True, "sort_by_relevance": True}),
+            ("search_case_sensitive", common_word, {"case_sensitive": True}),
+            ("search_substring_accents", common_word, {"ignore_accents": True}),
+            ("search_whole_word_accents", common_word, {"whole_word": True, "ignore_accents": True}),
+            ("search_word_forms", common_word, {"word_forms": True}),
+            ("search_regex", rf"{common_word}\s+\w+", {"use_regex": True}),
+            ("search_rare_substring", rare_word, {}),
+            ("search_rare_regex", rf"{rare_word}\s+\w+", {"use_regex": True}),
+            ("search_phrase", " ".join(first_words[:2]), {"whole_word": True}),
+            ("search_near", f"{first_words[0]} NEAR/5 {first_words[2]}", {"whole_word": True}),
+            (
+                "search_boolean",
+                f"{common_word} AND ({first_words[0]} OR {first_words[2]}) NOT {first_words[3]} book:1-40",
+                {"query_language": True},
+            ),
+        ]
+        for name, query, options in searches:
+            dialog = context.make_search_dialog(bible_data, query, index=index, **options)
+            cases.append((f"{label}/{name}", dialog.handle_find_button, verse_count, "verses"))
+
+        def search_rare_regex_per_verse(bible_data=bible_data, pattern=rf"{rare_word}\s+\w+"):
+            # The search before the scan buffer: the pattern with re.IGNORECASE on every lowered verse.
+            checks.scan_every_verse(context.search, bible_data, list(bible_data), pattern, False, False, True)
+
+        cases.append((f"{label}/search_rare_regex_per_verse", search_rare_regex_per_verse, verse_count, "verses"))
+
+        broad_dialog = context.make_search_dialog(bible_data, common_word, index=index, whole_word=True)
+        broad_dialog.handle_find_button()
+        broad_results = broad_dialog.results
+        refine_dialog = context.make_search_dialog(bible_data, first_words[2], index=index, whole_word=True)
+
+        def refine_within_results(dialog=refine_dialog, results=broad_results):
+            dialog.results = results
+            dialog.refine_search()
+
+        cases.append((f"{label}/refine_within_results", refine_within_results, len(broad_results), "verses"))
+
+        def concordance(index=index, word=common_word):
+            context.concordance.build_concordance(index, word)
+
+        cases.append((f"{label}/concordance", concordance, verse_count, "verses"))
+
+        prefixes = [common_word[:length] for length in range(2, len(common_word) + 1)]
+
+        def suggestions(index=index, prefixes=prefixes):
+            for prefix in prefixes:
+                index.suggest(prefix)
+
+        cases.append((f"{label}/suggestions", suggestions, len(prefixes), "prefixes"))
+
+        sources = [ref for ref in cross_references if frame.is_valid_reference(ref)][:500]
+        cross_dialog = context.make_cross_references_dialog(frame)
+        target_count = sum(len(cross_references[ref]) for ref in sources)
+
+        def cross_reference_format(dialog=cross_dialog, sources=sources, cross_references=cross_references):
+            for ref in sources:
+                dialog.references = cross_references[ref]
+                dialog.load_cross_references()
+
+        if sources:
+            cases.append((f"{label}/cross_reference_format", cross_reference_format, target_count, "refs"))
+
+        abbreviations = context.book_abbreviations
+        reference_texts = []
+        for abbreviation, book_index in abbreviations.items():
+            if book_index < len(bible_data):
+                chapters = list(bible_data.values())[book_index]
+                chapter = next(iter(chapters))
+                reference_texts.append(f"{abbreviation} {chapter}:1")
+                reference_texts.append(f"{abbreviation} {chapter}")
+
+        def reference_parse(reference_texts=reference_texts, bible_data=bible_data):
+            for reference_text in reference_texts:
+                context.references.parse_reference(reference_text, abbreviations, bible_data)
+
+        if reference_texts:
+            cases.append((f"{label}/reference_parse", reference_parse, len(reference_texts), "refs"))
+
+        if label == "synthetic":
+            plan_data = data.make_plan(bible_data)
+            panel = context.make_plan_panel(plan_data, data.make_plan_progress(plan_data))
+
+            def plan_day_status(panel=panel):
+                for day_info in panel.plan_data["days"]:
+                    panel.get_day_list_text(panel.day_index[day_info["day"]])
+
+            cases.append(("synthetic/plan_day_status", plan_day_status, len(plan_data["days"]), "days"))
+
+    if context.plans:
+        panels = [
+            context.make_plan_panel(plan_data, data.make_plan_progress(plan_data))
+            for plan_data in context.plans.values()
+        ]
+        day_total = sum(len(panel.plan_data["days"]) for panel in panels)
+
+        def real_plan_day_status(panels=panels):
+            for panel in panels:
+                for day_info in panel.plan_data["days"]:
+                    panel.get_day_list_text(panel.day_index[day_info["day"]])
+
+        cases.append(("real/plan_day_status", real_plan_day_status, day_total, "days"))
+
+    progress = {}
+    plan_sources = list(context.plans.values())[:10] or [data.make_plan(context.load_dataset(SYNTHETIC_TRANSLATION)[0])]
+    for index, plan_data in enumerate(plan_sources):
+        progress[f"plan {index}"] = data.make_plan_progress(plan_data)
+    context.settings.settings.update({
+        "reading_plan_progress": progress,
+        "search_history": [f"query {i}" for i in range(10)],
+        "reference_history": [f"Book {i} 1:1" for i in range(10)],
+        "tabs_states": [
+            {"translation": SYNTHETIC_TRANSLATION, "book_index": i, "chapter_index": 0, "verse_number": 1}
+            for i in range(10)
+        ],
+    })
+    cases.append(("settings_save", context.settings.save_settings, 1, "saves"))
+
+    return cases
+
+
+def measure(func, repeat, warmup):
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    gc.collect()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak
+
+
+def run(cases, repeat, warmup, name_filter=None):
+    results = {}
+    for name, func, items, unit in cases:
+        if name_filter and name_filter not in name:
+            continue
+        timings, peak = measure(func, repeat, warmup)
+        median = statistics.median(timings)
+        results[name] = {
+            "median_ms": median * 1000,
+            "min_ms": min(timings) * 1000,
+            "mean_ms": statistics.mean(timings) * 1000,
+            "throughput": items / median if median else 0.0,
+            "unit": unit,
+            "peak_kib": peak / 1024,
+        }
+    return results
+
+
+def load_baseline(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Could not read baseline {path}: {e}")
+        return None
+
+
+def print_report(results, baseline, tolerance):
+    baseline_cases = baseline.get("cases", {}) if baseline else {}
+    regressions = []
+
+    header = f"{'case':38} {'median ms':>11} {'min ms':>10} {'throughput':>20} {'peak KiB':>10} {'vs base':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        throughput = f"{result['throughput']:,.0f} {result['unit']}/s"
+        ratio_text = ""
+        base = baseline_cases.get(name)
+        if base and base.get("median_ms"):
+            ratio = result["median_ms"] / base["median_ms"]
+            ratio_text = f"{ratio:.2f}x"
+            if ratio > tolerance:
+                regressions.append((name, ratio))
+                ratio_text += " !"
+        print(
+            f"{name:38} {result['median_ms']:11.2f} {result['min_ms']:10.2f} "
+            f"{throughput:>20} {result['peak_kib']:10.0f} {ratio_text:>9}"
+        )
+
+    if baseline:
+        meta = baseline.get("meta", {})
+        print(f"\nBaseline: {meta.get('python', '?')} on {meta.get('machine', '?')}, scale {meta.get('scale', '?')}")
+        if regressions:
+            print(f"Slower than baseline by more than {tolerance:.2f}x:")
+            for name, ratio in regressions:
+                print(f"  {name}: {ratio:.2f}x")
+        else:
+            print("No case is slower than the baseline tolerance.")
+    return regressions
+
+
+def check_speedups(results):
+    slow = []
+    for name, reference, minimum in SPEEDUPS:
+        for label in ("synthetic", "real"):
+            result = results.get(f"{label}/{name}")
+            reference_result = results.get(f"{label}/{reference}")
+            if not result or not reference_result or not result["median_ms"]:
+                continue
+            speedup = reference_result["median_ms"] / result["median_ms"]
+            print(f"{label}/{name}: {speedup:.1f}x faster than {reference} (at least {minimum:.1f}x expected)")
+            if speedup < minimum:
+                slow.append((f"{label}/{name}", speedup))
+    return slow
+
+
+def save_baseline(path, results, args):
+    baseline = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "scale": args.scale,
+            "repeat": args.repeat,
+        },
+        "cases": {
+            name: {
+                "median_ms": round(result["median_ms"], 3),
+                "peak_kib": round(result["peak_kib"], 1),
+            }
+            for name, result in results.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=4)
+        f.write("\n")
+    print(f"\nBaseline saved to {path}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Bible add-on outside NVDA.")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per case")
+    parser.add_argument("--scale", type=float, default=1.0, help="size of the synthetic translation")
+    parser.add_argument("--translation", help="folder of a real translation containing bible.pkl")
+    parser.add_argument("--plans-dir", default=DEFAULT_PLANS_DIR, help="folder with reading plan JSON files")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--json", help="also write the raw results to this file")
+    parser.add_argument("--skip-checks", action="store_true", help="do not compare search results first")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    context = BenchmarkContext(args)
+    if not args.skip_checks:
+        try:
+            print(f"Correctness checks passed: {checks.run_checks() + ai_client_checks.run_checks()}\n")
+        except checks.CheckFailed as e:
+            print(f"Correctness check failed: {e}")
+            return 1
+    results = run(build_cases(context), args.repeat, args.warmup, args.filter)
+
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    regressions = print_report(results, baseline, args.tolerance)
+    slow = check_speedups(results)
+    if slow:
+        print("Slower than expected against the plain loop:")
+        for name, speedup in slow:
+            print(f"  {name}: only {speedup:.1f}x")
+        regressions = regressions + slow
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if args.save_baseline:
+        save_baseline(args.baseline, results, args)
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())